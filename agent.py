@@ -18,15 +18,11 @@ Usage:
 import sys
 import os
 from dotenv import load_dotenv
-from langchain_mcp_adapters.client import MultiServerMCPClient
-from langchain_anthropic import ChatAnthropic
-from langgraph.prebuilt import create_react_agent
-from langgraph.checkpoint.memory import MemorySaver
-from langchain_community.tools.tavily_search import TavilySearchResults
-from langchain_core.runnables import RunnableConfig
-from utils import astream_graph
+from mcp_servers import default_transport, server_connections, server_sources
 import asyncio
-import nest_asyncio
+
+# langchain / langgraph / anthropic are imported where they are first used, so
+# `import agent` (web_demo page load, CLI start) stays fast - see startup_profile.py
 
 
 # Set project root
@@ -38,17 +34,67 @@ if PROJECT_ROOT not in sys.path:
 os.chdir(PROJECT_ROOT)
 load_dotenv(override=True)
 
+# Tool schemas of each MCP server, cached so agents can skip list_tools at startup
+MCP_MANIFEST_PATH = os.path.join(PROJECT_ROOT, "output", ".mcp_manifest.json")
+
+# Conversation history (LangGraph checkpoints): SQLite file, or "memory" for MemorySaver.
+# Checkpoints kept per thread, days before an unused thread is deleted, and characters
+# kept of tool results from earlier turns (see checkpoint_store.py)
+CHECKPOINT_DB = os.getenv("AGENT_CHECKPOINT_DB", os.path.join(PROJECT_ROOT, "output", ".checkpoints.sqlite"))
+CHECKPOINT_MAX_PER_THREAD = int(os.getenv("AGENT_CHECKPOINT_MAX_PER_THREAD", "20"))
+CHECKPOINT_MAX_AGE_DAYS = float(os.getenv("AGENT_CHECKPOINT_MAX_AGE_DAYS", "30"))
+CHECKPOINT_TOOL_CHARS = int(os.getenv("AGENT_CHECKPOINT_TOOL_CHARS", "2000"))
+
 
-def create_mcp_agent(venv_path: str = None):
+def create_checkpointer():
+    """
+    Persistent SQLite checkpointer, or MemorySaver if AGENT_CHECKPOINT_DB is "memory",
+    langgraph-checkpoint-sqlite is not installed or the database cannot be opened.
+    """
+    from langgraph.checkpoint.memory import MemorySaver
+
+    if CHECKPOINT_DB.strip().lower() in ("", "memory", ":memory:"):
+        return MemorySaver()
+    try:
+        import sqlite3
+        from checkpoint_store import SQLiteCheckpointer
+
+        return SQLiteCheckpointer.open(
+            CHECKPOINT_DB,
+            max_checkpoints=CHECKPOINT_MAX_PER_THREAD,
+            max_age_days=CHECKPOINT_MAX_AGE_DAYS,
+            tool_chars=CHECKPOINT_TOOL_CHARS,
+        )
+    except (ImportError, sqlite3.Error, OSError) as e:
+        print(f"⚠️  Conversation history is kept in memory only ({e})")
+        return MemorySaver()
+
+
+def create_mcp_agent(venv_path: str = None, transport: str = None, lazy: bool = None,
+                     thread_id: str = None):
     """
     Create a MCP agent with all integrated tools.
 
     Args:
         venv_path: Path to virtual environment. Defaults to parent directory .venv
+        transport: "stdio" (start the servers), "sse" or "streamable-http"
+            (connect to running servers). Defaults to MCP_TRANSPORT or stdio
+        lazy: Start each server on the first call of one of its tools, using the
+            tool schemas cached at the previous start. Defaults to MCP_LAZY_START (on);
+            servers listed in MCP_EAGER_SERVERS are always started right away
+        thread_id: Conversation to resume (history is saved, see create_checkpointer).
+            Defaults to AGENT_THREAD_ID, else a new conversation
 
     Returns:
         tuple: (agent, config, all_tools)
     """
+    from langchain_anthropic import ChatAnthropic
+    from langgraph.prebuilt import create_react_agent
+    from langchain_community.tools.tavily_search import TavilySearchResults
+    from langchain_core.runnables import RunnableConfig
+    from mcp_sessions import MCPSessionManager
+    from utils import random_uuid
+
     # Default venv path
     if venv_path is None:
         venv_path = os.path.join(os.path.dirname(PROJECT_ROOT), '.venv', 'bin', 'python')
@@ -66,44 +112,30 @@ def create_mcp_agent(venv_path: str = None):
     print("✅ Model initialized: claude-3-7-sonnet-latest")
 
     # Configure MCP servers
-    client = MultiServerMCPClient({
-        "document-retriever": {
-            "command": venv_path,
-            "args": ["./mcp_server_rag.py"],
-            "transport": "stdio",
-        },
-        "calculator": {
-            "command": venv_path,
-            "args": ["./mcp_server_calculator.py"],
-            "transport": "stdio",
-        },
-        "code-executor": {
-            "command": venv_path,
-            "args": ["./mcp_server_code_executor.py"],
-            "transport": "stdio",
-        },
-    })
-
-    print("✅ MCP servers configured")
-
-    # Get MCP tools (synchronous wrapper for async function)
-    # Handle different event loop scenarios (CLI, Jupyter, Streamlit)
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_closed():
-            raise RuntimeError("Event loop is closed")
-    except RuntimeError:
-        # No event loop or closed loop - create new one
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-    # Apply nest_asyncio to allow nested event loops (for Jupyter/Streamlit)
-    nest_asyncio.apply()
-
-    # Get tools
-    mcp_tools = loop.run_until_complete(client.get_tools())
-
-    print(f"✅ MCP tools loaded: {len(mcp_tools)} tools")
+    # stdio: each agent starts its own servers; sse / streamable-http: connect to
+    # shared servers started with `python mcp_servers.py` (see mcp_servers.py).
+    # MCP_COMBINED=1 uses one server with all toolsets (mcp_server_all.py)
+    transport = transport or default_transport()
+    connections = server_connections(transport, python=venv_path)
+
+    # One session per server is held for the agent's lifetime (see mcp_sessions.py),
+    # so tool calls reuse the running server instead of starting a new one
+    sessions = MCPSessionManager(connections, manifest_path=MCP_MANIFEST_PATH, sources=server_sources())
+
+    print(f"✅ MCP servers configured ({transport})")
+
+    # Get the tools: schemas come from the manifest cache (see mcp_manifest.py) when the
+    # server code is unchanged; servers without cached schemas start now, concurrently
+    # (sessions run on a background event loop, so this works from CLI, Jupyter and Streamlit)
+    if lazy is None:
+        lazy = os.getenv("MCP_LAZY_START", "1").strip().lower() not in ("0", "false", "no")
+    eager = [name.strip() for name in os.getenv("MCP_EAGER_SERVERS", "").split(",") if name.strip()]
+    mcp_tools = sessions.get_tools(lazy=lazy, eager=eager)
+
+    started = sessions.started()
+    pending = [name for name in connections if name not in started]
+    print(f"✅ MCP tools loaded: {len(mcp_tools)} tools "
+          f"(running: {', '.join(started) or '-'}; not started yet: {', '.join(pending) or '-'})")
 
     # Add TavilySearch
     tavily = TavilySearchResults(max_results=2, topic="news", days=2)
@@ -120,9 +152,9 @@ def create_mcp_agent(venv_path: str = None):
         category = ""
         if tool.name == "retrieve":
             category = "📚 Document"
-        elif tool.name in ["calculate", "percentage_change", "statistics_summary", "currency_convert", "compare_values"]:
+        elif tool.name in ["calculate", "calculate_batch", "percentage_change", "statistics_summary", "currency_convert", "convert_many", "set_exchange_rate", "compare_values"]:
             category = "🧮 Calculator"
-        elif tool.name in ["execute_python", "create_visualization", "analyze_data", "read_csv", "save_to_csv"]:
+        elif tool.name in ["execute_python", "list_variables", "reset_session", "create_visualization", "create_dashboard", "analyze_data", "read_csv", "save_to_csv", "load_dataset", "list_datasets", "drop_dataset", "query_sql", "export_data"]:
             category = "💻 Code Executor"
         elif tool.name == "tavily_search_results_json":
             category = "🔍 Web Search"
@@ -140,13 +172,20 @@ def create_mcp_agent(venv_path: str = None):
     📚 Document Retrieval (retrieve):
        - Search information from iPhone technical documents
 
-    🧮 Calculator (calculate, percentage_change, statistics_summary, currency_convert, compare_values):
+    🧮 Calculator (calculate, calculate_batch, percentage_change, statistics_summary, currency_convert, convert_many, set_exchange_rate, compare_values):
        - Perform mathematical calculations and statistical analysis
+       - Use calculate_batch to apply one formula to many values in a single call
+       - Use convert_many to convert lists of amounts with the local exchange rate table
 
-    💻 Code Executor (execute_python, create_visualization, analyze_data, read_csv, save_to_csv):
+    💻 Code Executor (execute_python, list_variables, reset_session, create_visualization, create_dashboard, analyze_data, read_csv, save_to_csv, load_dataset, list_datasets, drop_dataset, query_sql, export_data):
        - Execute Python code for data analysis
+       - Pass the same session_id to execute_python to keep DataFrames between steps
        - Create visualizations (charts, graphs)
+       - Use create_dashboard to render several charts in a single call
        - Process and save data files
+       - Use load_dataset once for large data and pass the returned handle (ds_...) to other tools instead of JSON
+       - Use query_sql for joins and aggregations over CSV/Parquet files in the output directory
+       - Use export_data (Parquet) for large results, and mode='append' to add rows to an existing file
 
     🔍 Web Search (tavily_search_results_json):
        - Search latest news and web information
@@ -154,13 +193,15 @@ def create_mcp_agent(venv_path: str = None):
     Choose the most appropriate tools based on the user's request.
     You can use multiple tools in sequence for complex tasks.
     Always explain which tools you're using and why.""",
-        checkpointer=MemorySaver()
+        checkpointer=create_checkpointer()
     )
 
     print("✅ Agent created successfully!\n")
 
     # Configuration
-    config = RunnableConfig(recursion_limit=30, thread_id=1)
+    thread_id = thread_id or os.getenv("AGENT_THREAD_ID") or random_uuid()
+    config = RunnableConfig(recursion_limit=30, configurable={"thread_id": thread_id})
+    print(f"💬 Conversation: {thread_id} (resume it with AGENT_THREAD_ID={thread_id})\n")
 
     return agent, config, all_tools
 
@@ -174,6 +215,8 @@ async def chat_with_agent(agent, config, message: str):
         config: Agent configuration
         message: User message
     """
+    from utils import astream_graph
+
     await astream_graph(
         agent,
         {"messages": message},
@@ -0,0 +1,119 @@
+"""
+Artifact Registry - output 디렉토리에 생성된 파일 인덱스
+
+도구가 생성한 파일(차트, CSV 등)을 append-only 인덱스(output/.artifacts.jsonl)에 기록합니다.
+- 도구는 해당 호출에서 생성한 파일만 보고 (call_id)
+- UI는 디렉토리 전체를 스캔하지 않고 커서 이후에 추가된 기록만 읽음 (O(새 파일 수))
+
+사용 예:
+    registry = ArtifactRegistry(OUTPUT_DIR)
+    cursor = registry.cursor()
+    ...  # 에이전트 실행
+    new_artifacts, cursor = registry.since(cursor)
+"""
+
+import json
+import mimetypes
+import os
+import threading
+import time
+import uuid
+
+INDEX_FILENAME = ".artifacts.jsonl"
+
+# Bytes read from the end of the index when listing recent artifacts
+_RECENT_READ_BYTES = 64 * 1024
+
+
+class ArtifactRegistry:
+    """Append-only index of files written to the output directory."""
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.index_path = os.path.join(output_dir, INDEX_FILENAME)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_call_id() -> str:
+        """ID shared by all artifacts created by one tool call."""
+        return uuid.uuid4().hex[:12]
+
+    def register(self, path: str, call_id: str, tool: str) -> dict:
+        """
+        Records a file created by a tool call.
+
+        Args:
+            path: Path of the created file (inside the output directory)
+            call_id: ID of the tool call that created it
+            tool: Name of the tool
+
+        Returns:
+            dict: The stored record
+        """
+        stat = os.stat(path)
+        record = {
+            "id": uuid.uuid4().hex[:12],
+            "call_id": call_id,
+            "tool": tool,
+            "filename": os.path.relpath(os.path.abspath(path), self.output_dir),
+            "size": stat.st_size,
+            "mime": mimetypes.guess_type(path)[0] or "application/octet-stream",
+            "created": time.time(),
+        }
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock, open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(line)
+        return record
+
+    def cursor(self) -> int:
+        """Current end of the index; pass it to since() later."""
+        try:
+            return os.path.getsize(self.index_path)
+        except OSError:
+            return 0
+
+    def since(self, cursor: int):
+        """
+        Returns the records added after `cursor`.
+
+        Returns:
+            tuple: (list of records, new cursor)
+        """
+        try:
+            with open(self.index_path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if cursor > size:  # index was removed or rotated
+                    cursor = 0
+                f.seek(cursor)
+                data = f.read()
+        except OSError:
+            return [], 0
+
+        # Only complete lines - a writer may be in the middle of appending
+        end = data.rfind(b"\n") + 1
+        records = [json.loads(line) for line in data[:end].splitlines() if line.strip()]
+        return records, cursor + end
+
+    def recent(self, limit: int = 10) -> list:
+        """Most recent records (newest first), read from the end of the index."""
+        try:
+            with open(self.index_path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                f.seek(max(0, size - _RECENT_READ_BYTES))
+                data = f.read()
+        except OSError:
+            return []
+
+        lines = data.splitlines()
+        if size > _RECENT_READ_BYTES:
+            lines = lines[1:]  # first line may be cut in the middle
+        records = [json.loads(line) for line in lines if line.strip()]
+        return records[::-1][:limit]
+
+    def count(self) -> int:
+        """Number of artifacts recorded."""
+        try:
+            with open(self.index_path, "rb") as f:
+                return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b""))
+        except OSError:
+            return 0
@@ -0,0 +1,185 @@
+"""
+Checkpoint Store - 에이전트 대화 기록(LangGraph 체크포인트)을 SQLite에 저장
+
+MemorySaver는 모든 체크포인트(여러 KB의 retrieve / analyze_data 결과 포함)를 프로세스 메모리에
+계속 쌓고, 프로세스가 끝나면 기록이 사라집니다. SQLiteCheckpointer는:
+- 체크포인트를 로컬 SQLite 파일(WAL 모드)에 저장 → 메모리 사용량이 대화 길이와 무관, 재시작 후 이어서 대화 가능
+- 저장할 때 이전 턴의 긴 도구 결과(ToolMessage)를 앞부분만 남기고 생략 (현재 턴은 그대로)
+- 스레드별 최근 체크포인트 N개만 보관하고, 오래 사용하지 않은 스레드는 삭제
+- 비동기 메서드(astream 등)는 스레드에서 동기 메서드를 실행
+
+사용 예:
+    checkpointer = SQLiteCheckpointer.open("output/.checkpoints.sqlite")
+    agent = create_react_agent(model, tools, checkpointer=checkpointer)
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+logger = logging.getLogger(__name__)
+
+# Appended to a tool result that was shortened in the saved history
+ELISION_NOTE = "characters of this earlier tool result were elided from the saved history]"
+
+# Threads older than max_age_days are pruned every this many saves (and when opening)
+PRUNE_EVERY_PUTS = 100
+
+
+def compact_messages(messages: list, max_chars: int) -> list:
+    """
+    Shortens tool results of earlier turns (before the latest user message) to `max_chars`.
+
+    The messages of the current turn are kept as they are; tool_call_ids are kept so
+    tool calls and results still pair up. Returns a new list (messages are copied).
+    """
+    last_human = max((i for i, message in enumerate(messages) if getattr(message, "type", None) == "human"),
+                     default=-1)
+    compacted = []
+    for i, message in enumerate(messages):
+        content = getattr(message, "content", None)
+        if (
+            i < last_human
+            and getattr(message, "type", None) == "tool"
+            and isinstance(content, str)
+            and len(content) > max_chars
+            and not content.endswith(ELISION_NOTE)
+        ):
+            message = message.model_copy(update={
+                "content": f"{content[:max_chars]}\n[... {len(content) - max_chars:,} more {ELISION_NOTE}",
+                "artifact": None,
+            })
+        compacted.append(message)
+    return compacted
+
+
+class SQLiteCheckpointer(SqliteSaver):
+    """SqliteSaver with async support, WAL, tool-payload compaction and pruning."""
+
+    def __init__(self, conn: sqlite3.Connection, *, max_checkpoints: int = 20,
+                 max_age_days: float = 30, tool_chars: int = 2000, serde=None):
+        """
+        Args:
+            conn: SQLite connection (check_same_thread=False)
+            max_checkpoints: Checkpoints kept per thread (the latest one is what a resumed
+                conversation loads; older ones are only history)
+            max_age_days: Threads not used for this long are deleted (0 = never)
+            tool_chars: Tool results of earlier turns are cut to this many characters (0 = never)
+        """
+        super().__init__(conn, serde=serde)
+        self.max_checkpoints = max_checkpoints
+        self.max_age_days = max_age_days
+        self.tool_chars = tool_chars
+        self._puts = 0
+
+    @classmethod
+    def open(cls, path: str, **kwargs) -> "SQLiteCheckpointer":
+        """
+        Opens (or creates) the checkpoint database and prunes expired threads.
+
+        Raises:
+            sqlite3.Error, OSError: The database could not be opened
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False)
+        saver = cls(conn, **kwargs)
+        with saver.cursor() as cur:
+            cur.execute("SELECT 1")  # runs setup()
+        saver.prune_threads()
+        return saver
+
+    def setup(self) -> None:
+        """Creates the tables (SqliteSaver's plus thread activity) and enables WAL."""
+        if self.is_setup:
+            return
+        super().setup()
+        self.conn.executescript(
+            """
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS thread_activity (
+                thread_id TEXT PRIMARY KEY,
+                updated REAL NOT NULL
+            );
+            INSERT OR IGNORE INTO thread_activity (thread_id, updated)
+                SELECT DISTINCT thread_id, strftime('%s', 'now') FROM checkpoints;
+            """
+        )
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        """Saves a checkpoint with compacted history, then drops the thread's oldest checkpoints."""
+        messages = checkpoint.get("channel_values", {}).get("messages")
+        if self.tool_chars and isinstance(messages, list):
+            checkpoint = {
+                **checkpoint,
+                "channel_values": {
+                    **checkpoint["channel_values"],
+                    "messages": compact_messages(messages, self.tool_chars),
+                },
+            }
+
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        with self.cursor() as cur:
+            cur.execute(
+                "INSERT OR REPLACE INTO thread_activity (thread_id, updated) VALUES (?, ?)",
+                (thread_id, time.time()),
+            )
+            if self.max_checkpoints:
+                keep = (
+                    "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT ?"
+                )
+                for table in ("checkpoints", "writes"):
+                    cur.execute(
+                        f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? "
+                        f"AND checkpoint_id NOT IN ({keep})",
+                        (thread_id, checkpoint_ns, thread_id, checkpoint_ns, self.max_checkpoints),
+                    )
+
+        self._puts += 1
+        if self._puts % PRUNE_EVERY_PUTS == 0:
+            self.prune_threads()
+        return next_config
+
+    def prune_threads(self) -> int:
+        """Deletes threads not used for max_age_days. Returns the number of threads deleted."""
+        if not self.max_age_days:
+            return 0
+        cutoff = time.time() - self.max_age_days * 86400
+        with self.cursor() as cur:
+            expired = "SELECT thread_id FROM thread_activity WHERE updated < ?"
+            for table in ("checkpoints", "writes"):
+                cur.execute(f"DELETE FROM {table} WHERE thread_id IN ({expired})", (cutoff,))
+            cur.execute("DELETE FROM thread_activity WHERE updated < ?", (cutoff,))
+            deleted = cur.rowcount
+        if deleted:
+            # Give the space of the deleted rows back from the write-ahead log
+            with self.cursor(transaction=False) as cur:
+                cur.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            logger.info("Pruned %d inactive conversation threads", deleted)
+        return deleted
+
+    # SqliteSaver is synchronous; the agent streams asynchronously, so the async
+    # methods run the sync ones in a thread (the connection is guarded by self.lock)
+
+    async def aget_tuple(self, config):
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id):
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id)
@@ -0,0 +1,190 @@
+"""
+Dataset Store - 도구 간에 데이터를 핸들로 주고받기 위한 저장소
+
+데이터를 한 번 불러와 짧은 핸들(예: ds_1a2b3c4d)을 받고, 이후 도구 호출에서는
+JSON 문자열 대신 핸들만 전달합니다.
+- 데이터는 output/.datasets/<handle>.arrow (Arrow IPC, 비압축)로 저장
+- 읽을 때는 memory-map으로 열어 복사 없이 DataFrame으로 변환
+- 프로세스마다 최근 사용한 DataFrame을 캐시 (다른 프로세스에서 삭제된 데이터셋은 캐시에서도 제외)
+- 개수/크기 제한을 넘으면 가장 오래 사용하지 않은 데이터셋부터 삭제
+
+사용 예:
+    store = DatasetStore(os.path.join(OUTPUT_DIR, ".datasets"), max_count=100, max_mb=1024)
+    handle = store.save(df, name="sales")
+    df = store.load(handle)
+"""
+
+import json
+import os
+import re
+import time
+import uuid
+from collections import OrderedDict
+
+HANDLE_PATTERN = re.compile(r"^ds_[0-9a-f]{8}$")
+
+# DataFrames kept in memory per process (most recently used)
+CACHE_SIZE = 8
+
+
+def is_handle(text) -> bool:
+    """True if `text` looks like a dataset handle."""
+    return isinstance(text, str) and HANDLE_PATTERN.match(text.strip()) is not None
+
+
+class DatasetStore:
+    """
+    Arrow-backed datasets addressed by short handles.
+
+    Args:
+        root_dir: Directory of the .arrow / .json files
+        max_count: Keep at most this many datasets (None = no limit)
+        max_mb: Keep the .arrow files below this total size in MB (None = no limit)
+    """
+
+    def __init__(self, root_dir: str, max_count: int = None, max_mb: float = None):
+        self.root_dir = root_dir
+        self.max_count = max_count
+        self.max_mb = max_mb
+        os.makedirs(root_dir, exist_ok=True)
+        self._cache = OrderedDict()
+
+    def _data_path(self, handle: str) -> str:
+        return os.path.join(self.root_dir, f"{handle}.arrow")
+
+    def _meta_path(self, handle: str) -> str:
+        return os.path.join(self.root_dir, f"{handle}.json")
+
+    def save(self, df, name: str = "", source: str = "") -> str:
+        """
+        Stores a DataFrame and returns its handle.
+
+        Args:
+            df: pandas DataFrame
+            name: Optional human-readable name
+            source: Where the data came from (file name, "json", "execute_python", ...)
+
+        Returns:
+            str: Dataset handle
+        """
+        import pyarrow as pa
+        from pyarrow import feather
+
+        handle = f"ds_{uuid.uuid4().hex[:8]}"
+        table = pa.Table.from_pandas(df, preserve_index=False)
+
+        # Uncompressed so readers can memory-map the file without decoding
+        tmp_path = f"{self._data_path(handle)}.{os.getpid()}.tmp"
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, self._data_path(handle))
+
+        meta = {
+            "handle": handle,
+            "name": name,
+            "source": source,
+            "rows": table.num_rows,
+            "columns": {field.name: str(field.type) for field in table.schema},
+            "size": os.path.getsize(self._data_path(handle)),
+            "created": time.time(),
+        }
+        with open(self._meta_path(handle), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        self._prune(keep=handle)
+        return handle
+
+    def _prune(self, keep: str):
+        """Drops the least recently used datasets (except `keep`) beyond max_count / max_mb."""
+        if self.max_count is None and self.max_mb is None:
+            return
+        entries = []
+        with os.scandir(self.root_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".arrow") and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.name[:-len(".arrow")]))
+
+        count, total = len(entries), sum(size for _, size, _ in entries)
+        limit = self.max_mb * 2**20 if self.max_mb is not None else None
+        for _, size, handle in sorted(entries):
+            if (self.max_count is None or count <= self.max_count) and (limit is None or total <= limit):
+                break
+            if handle != keep and self.drop(handle):
+                count -= 1
+                total -= size
+
+    def arrow_table(self, handle: str):
+        """
+        Memory-mapped pyarrow Table for a handle (no data is copied).
+
+        Raises:
+            KeyError: Unknown handle
+        """
+        from pyarrow import feather
+
+        path = self._data_path(handle.strip())
+        if not os.path.exists(path):
+            raise KeyError(f"Dataset '{handle}' not found. Use list_datasets to see available datasets.")
+        return feather.read_table(path, memory_map=True)
+
+    def load(self, handle: str):
+        """
+        Returns the DataFrame for a handle.
+
+        Raises:
+            KeyError: Unknown handle
+        """
+        handle = handle.strip()
+        try:
+            # Marks the dataset as recently used, and notices a drop() by another process
+            os.utime(self._data_path(handle))
+        except FileNotFoundError:
+            self._cache.pop(handle, None)
+            raise KeyError(f"Dataset '{handle}' not found. Use list_datasets to see available datasets.")
+        if handle in self._cache:
+            self._cache.move_to_end(handle)
+            return self._cache[handle].copy(deep=False)
+
+        # split_blocks lets numeric columns point into the memory-mapped file
+        df = self.arrow_table(handle).to_pandas(split_blocks=True)
+
+        self._cache[handle] = df
+        while len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return df.copy(deep=False)
+
+    def info(self, handle: str) -> dict:
+        """
+        Metadata of a dataset (rows, column types, size, ...).
+
+        Raises:
+            KeyError: Unknown handle
+        """
+        try:
+            with open(self._meta_path(handle.strip()), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise KeyError(f"Dataset '{handle}' not found. Use list_datasets to see available datasets.")
+
+    def list(self) -> list:
+        """Metadata of all datasets, newest first."""
+        datasets = []
+        for entry in os.listdir(self.root_dir):
+            if entry.endswith(".json"):
+                try:
+                    datasets.append(self.info(entry[:-len(".json")]))
+                except (KeyError, ValueError):
+                    continue
+        return sorted(datasets, key=lambda meta: meta["created"], reverse=True)
+
+    def drop(self, handle: str) -> bool:
+        """Deletes a dataset. Returns False if it did not exist."""
+        handle = handle.strip()
+        self._cache.pop(handle, None)
+        existed = False
+        for path in (self._data_path(handle), self._meta_path(handle)):
+            try:
+                os.remove(path)
+                existed = True
+            except FileNotFoundError:
+                pass
+        return existed
@@ -0,0 +1,99 @@
+"""
+MCP Manifest - MCP 서버 도구 스키마 캐시
+
+도구 이름/설명/JSON 스키마는 서버 코드가 바뀔 때만 바뀌므로, 에이전트를 만들 때마다
+서버를 띄우고 list_tools로 다시 받아올 필요가 없습니다.
+- 서버별 도구 스키마를 output/.mcp_manifest.json에 저장
+- 캐시 키: 연결 설정 + 서버 소스 파일 내용의 SHA-256 (파일을 수정하면 캐시가 무효화됨)
+- 서버에 처음 연결될 때 실제 스키마와 비교해서, 다르면 manifest를 갱신 (lazy 검증)
+
+사용 예:
+    manifest = ToolManifest("output/.mcp_manifest.json")
+    key = manifest_key(connection, ["mcp_server_calculator.py"])
+    specs = manifest.get("calculator", key)       # 없거나 키가 다르면 None
+    manifest.put("calculator", key, [tool_spec(tool) for tool in tools])
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+# Bump when the stored spec format changes
+MANIFEST_VERSION = 1
+
+
+def source_hash(paths: list) -> str:
+    """SHA-256 over the contents of the given files (missing files count as empty)."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        try:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            pass
+    return digest.hexdigest()
+
+
+def manifest_key(connection: dict, sources: list = ()) -> dict:
+    """
+    Cache key of a server: its connection config and the hash of its source files.
+
+    Args:
+        connection: MultiServerMCPClient connection config
+        sources: Files that define the server's tools
+    """
+    return {
+        "version": MANIFEST_VERSION,
+        "connection": {k: connection.get(k) for k in ("transport", "command", "args", "url")},
+        "sources": source_hash(sources) if sources else None,
+    }
+
+
+def tool_spec(tool) -> dict:
+    """JSON-serializable description of a LangChain MCP tool (what the agent needs before the server runs)."""
+    schema = tool.args_schema
+    if not isinstance(schema, dict):
+        schema = schema.model_json_schema()
+    spec = {
+        "name": tool.name,
+        "description": tool.description,
+        "args_schema": schema,
+        "response_format": tool.response_format,
+    }
+    # Round trip so specs compare equal to the ones loaded from the file
+    return json.loads(json.dumps(spec))
+
+
+class ToolManifest:
+    """Tool specs per server, stored in one JSON file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, server: str, key: dict):
+        """Cached tool specs of a server, or None if missing or stored under a different key."""
+        entry = self._read().get(server)
+        if not entry or entry.get("key") != key:
+            return None
+        return entry["tools"]
+
+    def put(self, server: str, key: dict, specs: list):
+        """Stores the tool specs of a server (atomic rewrite of the file)."""
+        with self._lock:
+            manifest = self._read()
+            manifest[server] = {"key": key, "tools": specs}
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,102 @@
+"""
+Combined MCP Server - 3개 도구 모음(retriever, calculator, code executor)을 하나의 서버로 제공
+
+서버 3개를 따로 실행하면 Python 인터프리터 3개, dotenv/mcp 등의 import 3번,
+에이전트 시작 시 handshake 3번이 필요합니다. 메모리가 제한된 배포에서는 이 서버 하나로
+모든 도구를 제공할 수 있습니다.
+- 도구 모음 모듈을 import해서 그 도구들을 이 서버에 등록
+- 무거운 라이브러리는 도구 모음별로 처음 사용할 때 로드
+  (FAISS/PDF 로더: 첫 retrieve 호출, pandas/matplotlib: code executor 워커, 워커 풀: 첫 작업)
+- 도구 이름이 겹치면 `<도구 모음>_<도구 이름>`으로 등록
+  (MCP_COMBINED_NAMESPACE=always: 모든 도구에 접두사)
+- MCP_COMBINED_TOOLSETS: 제공할 도구 모음 (쉼표로 구분, 기본: 전체)
+
+사용 예:
+    python mcp_server_all.py                       # stdio
+    python mcp_server_all.py --transport sse       # http://0.0.0.0:8008/sse
+    MCP_COMBINED=1 python agent.py                 # 에이전트가 이 서버 하나만 사용
+"""
+
+import asyncio
+import importlib
+import logging
+import os
+
+from dotenv import load_dotenv
+from mcp.server.fastmcp import FastMCP
+
+from mcp_servers import COMBINED_SERVER, parse_server_args
+
+load_dotenv(override=True)
+
+logger = logging.getLogger(__name__)
+
+# Toolset name (used as the namespace prefix) -> server module
+TOOLSETS = {
+    "retriever": "mcp_server_rag",
+    "calculator": "mcp_server_calculator",
+    "code_executor": "mcp_server_code_executor",
+}
+
+NAMESPACE_MODES = ("auto", "always")
+
+mcp = FastMCP(
+    "MCPTools",
+    instructions="Document retrieval, calculator and Python code execution tools in one server.",
+    host="0.0.0.0",
+    port=COMBINED_SERVER["port"],
+    log_level=os.getenv("MCP_LOG_LEVEL", "INFO"),
+)
+
+
+def selected_toolsets() -> list:
+    """Toolsets from MCP_COMBINED_TOOLSETS (all if unset)."""
+    names = [name.strip() for name in os.getenv("MCP_COMBINED_TOOLSETS", "").split(",") if name.strip()]
+    unknown = [name for name in names if name not in TOOLSETS]
+    if unknown:
+        raise ValueError(f"Unknown toolset '{unknown[0]}'. Use: {', '.join(TOOLSETS)}")
+    return names or list(TOOLSETS)
+
+
+def mount_toolsets(server: FastMCP, toolsets: list, namespace: str = "auto") -> dict:
+    """
+    Registers the tools of each toolset's server module on `server`.
+
+    Args:
+        server: Combined FastMCP server
+        toolsets: Toolset names (keys of TOOLSETS)
+        namespace: "auto" prefixes only names used by more than one toolset,
+            "always" prefixes every tool with its toolset name
+
+    Returns:
+        dict: Registered tool name -> (toolset, original tool name)
+    """
+    if namespace not in NAMESPACE_MODES:
+        raise ValueError(f"Unknown namespace mode '{namespace}'. Use: {', '.join(NAMESPACE_MODES)}")
+
+    modules = {toolset: importlib.import_module(TOOLSETS[toolset]) for toolset in toolsets}
+    tools = {toolset: asyncio.run(module.mcp.list_tools()) for toolset, module in modules.items()}
+
+    seen = {}
+    for toolset, infos in tools.items():
+        for info in infos:
+            seen.setdefault(info.name, []).append(toolset)
+
+    mounted = {}
+    for toolset, infos in tools.items():
+        for info in infos:
+            name = info.name
+            if namespace == "always" or len(seen[name]) > 1:
+                name = f"{toolset}_{name}"
+            # @mcp.tool() returns the function unchanged, so the module attribute is the tool
+            server.add_tool(getattr(modules[toolset], info.name), name=name, description=info.description,
+                            annotations=info.annotations)
+            mounted[name] = (toolset, info.name)
+    return mounted
+
+
+if __name__ == "__main__":
+    mounted = mount_toolsets(mcp, selected_toolsets(), os.getenv("MCP_COMBINED_NAMESPACE", "auto"))
+    transport = parse_server_args(mcp)
+    logger.info("Mounted %d tools: %s", len(mounted), ", ".join(mounted))
+    mcp.run(transport=transport)
@@ -6,13 +6,26 @@ Calculator MCP Server - 수학 계산 및 통계 분석 도구
 2. 고급 수학 함수 (삼각함수, 로그, 지수)
 3. 통계 계산 (평균, 중앙값, 표준편차)
 4. 퍼센트 계산 (증가율, 감소율)
-5. 환율 계산
+5. 환율 계산 (로컬 환율 테이블 data/exchange_rates.csv 지원)
+6. 배치 계산 (NumPy 벡터화, 여러 입력값을 한 번에 계산)
+
+계산식 평가(calculate, calculate_batch, statistics_summary)는 이벤트 루프가 아닌
+워커 프로세스 풀에서 CPU 시간/메모리 제한과 함께 실행됩니다.
 """
 
 from mcp.server.fastmcp import FastMCP
+from mcp.types import ToolAnnotations
+from mcp_servers import parse_server_args
 from dotenv import load_dotenv
+import os
+import csv
+import json
 import math
-import statistics
+import bisect
+import warnings
+from datetime import date as Date
+from worker_pool import WorkerPool, WorkerTimeout, WorkerCrashed, TaskError
+import numpy as np
 
 load_dotenv(override=True)
 
@@ -22,10 +35,308 @@ mcp = FastMCP(
     instructions="A calculator that can perform mathematical calculations, statistics, and currency conversions.",
     host="0.0.0.0",
     port=8006,
+    log_level=os.getenv("MCP_LOG_LEVEL", "INFO"),
+)
+
+# Tool annotations: clients may retry these after a dropped connection (see mcp_sessions.py)
+READ_ONLY = ToolAnnotations(readOnlyHint=True)
+IDEMPOTENT = ToolAnnotations(readOnlyHint=False, destructiveHint=False, idempotentHint=True)
+
+# Safe math functions available inside expressions
+SAFE_FUNCTIONS = {
+    'abs': abs,
+    'round': round,
+    'sqrt': math.sqrt,
+    'sin': math.sin,
+    'cos': math.cos,
+    'tan': math.tan,
+    'log': math.log,
+    'log10': math.log10,
+    'exp': math.exp,
+    'pow': pow,
+    'pi': math.pi,
+    'e': math.e,
+}
+
+# NumPy equivalents of SAFE_FUNCTIONS for vectorized (batch) evaluation
+VECTOR_FUNCTIONS = {
+    'abs': np.abs,
+    'round': np.round,
+    'sqrt': np.sqrt,
+    'sin': np.sin,
+    'cos': np.cos,
+    'tan': np.tan,
+    'log': np.log,
+    'log10': np.log10,
+    'exp': np.exp,
+    'pow': np.power,
+    'pi': np.pi,
+    'e': np.e,
+}
+
+# Maximum number of rows shown in calculate_batch output
+MAX_BATCH_ROWS_SHOWN = 50
+
+# Directory shared with the code executor (CSV inputs for statistics_summary)
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "output")
+
+# Rows read per chunk when streaming a CSV column
+STATS_CHUNK_ROWS = 500_000
+
+# Values kept for percentiles: exact up to this many values, a uniform random sample beyond
+STATS_SAMPLE_SIZE = int(os.getenv("CALCULATOR_STATS_SAMPLE_SIZE", "100000"))
+
+# Local exchange rate table: one row per (date, base, quote), 1 base = rate quote
+RATES_FILE = os.path.join(os.path.dirname(__file__), "data", "exchange_rates.csv")
+
+# Currency used to derive cross rates (e.g., EUR -> KRW via USD)
+PIVOT_CURRENCY = "USD"
+
+# Parsed rate table cache, reloaded when the CSV file changes
+_rate_table = None
+_rate_table_mtime = None
+
+# Isolated evaluation: worker count, per-task CPU seconds, wall-clock seconds, per-worker memory
+CALC_WORKERS = int(os.getenv("CALCULATOR_WORKERS", "2"))
+CALC_CPU_TIME_LIMIT = float(os.getenv("CALCULATOR_CPU_TIME_LIMIT", "5"))
+CALC_TIMEOUT = float(os.getenv("CALCULATOR_TIMEOUT", "10"))
+CALC_MEMORY_LIMIT_MB = int(os.getenv("CALCULATOR_MEMORY_LIMIT_MB", "1024"))
+
+_pool = WorkerPool(
+    size=CALC_WORKERS,
+    max_tasks_per_worker=200,
+    max_rss_mb=CALC_MEMORY_LIMIT_MB // 2,
+    memory_limit_mb=CALC_MEMORY_LIMIT_MB,
+    preload=["__main__", "numpy"],
 )
 
 
-@mcp.tool()
+class RunningStats:
+    """
+    Single-pass count/mean/variance/min/max accumulator with a bounded quantile sample.
+
+    Chunks are merged with Welford's parallel update (Chan et al.), so values
+    can be streamed in any number of NumPy chunks without a second pass.
+    Percentiles come from a uniform random sample of at most `sample_size`
+    values (each value gets a random key, the smallest keys are kept), so
+    memory stays bounded; they are exact while count <= sample_size.
+    Non-finite values (NaN, inf) are skipped and counted in `dropped`.
+    """
+
+    def __init__(self, sample_size: int = STATS_SAMPLE_SIZE, seed=None):
+        self.count = 0
+        self.dropped = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sample_size = sample_size
+        self._sample = np.empty(0)
+        self._keys = np.empty(0)
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, chunk: np.ndarray):
+        chunk = np.asarray(chunk, dtype=float)
+        finite = np.isfinite(chunk)
+        if not finite.all():
+            self.dropped += int(len(chunk) - finite.sum())
+            chunk = chunk[finite]
+        n = len(chunk)
+        if n == 0:
+            return
+        chunk_mean = float(chunk.mean())
+        chunk_m2 = float(np.square(chunk - chunk_mean).sum())
+
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, float(chunk.min()))
+        self.max = max(self.max, float(chunk.max()))
+        self._add_to_sample(chunk)
+
+    def _add_to_sample(self, chunk: np.ndarray):
+        values = np.concatenate([self._sample, chunk])
+        keys = np.concatenate([self._keys, self._rng.random(len(chunk))])
+        if len(values) > self.sample_size:
+            keep = np.argpartition(keys, self.sample_size - 1)[:self.sample_size]
+            values, keys = values[keep], keys[keep]
+        self._sample, self._keys = values, keys
+
+    @property
+    def exact(self) -> bool:
+        """True if percentiles are computed from every value (no sampling)."""
+        return self.count <= self.sample_size
+
+    def percentiles(self, qs) -> list:
+        """Linear-interpolated percentiles of the sample (see `exact`)."""
+        return percentiles(self._sample.copy(), qs)
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation (same as statistics.stdev)."""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+def parse_numbers(numbers: str) -> np.ndarray:
+    """
+    Parses a comma-separated string into a float array in one bulk call.
+
+    Raises:
+        ValueError: The string is not entirely numbers (e.g. "10, abc")
+    """
+    with warnings.catch_warnings():
+        # Partial parses only warn on NumPy 1.x (newer versions raise ValueError)
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return np.fromstring(numbers, dtype=float, sep=',')
+        except DeprecationWarning as e:
+            raise ValueError(str(e)) from e
+
+
+def read_csv_column(filename: str, column: str):
+    """Yields a numeric CSV column from OUTPUT_DIR in bounded-size chunks."""
+    import pandas as pd
+
+    filepath = os.path.join(OUTPUT_DIR, filename)
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"File '{filename}' not found in {OUTPUT_DIR}")
+
+    header = pd.read_csv(filepath, nrows=0).columns
+    if column not in header:
+        raise KeyError(column)
+
+    for chunk in pd.read_csv(filepath, usecols=[column], chunksize=STATS_CHUNK_ROWS):
+        values = pd.to_numeric(chunk[column], errors='coerce').to_numpy(dtype=float)
+        yield values[~np.isnan(values)]
+
+
+def percentiles(values: np.ndarray, qs) -> list:
+    """
+    Linear-interpolated percentiles via selection (np.partition), not a full sort.
+    """
+    positions = [q / 100 * (len(values) - 1) for q in qs]
+    kth = sorted({int(math.floor(p)) for p in positions} | {int(math.ceil(p)) for p in positions})
+    selected = np.partition(values, kth)
+
+    results = []
+    for p in positions:
+        lo, hi = int(math.floor(p)), int(math.ceil(p))
+        results.append(float(selected[lo] + (selected[hi] - selected[lo]) * (p - lo)))
+    return results
+
+
+def load_rate_table() -> dict:
+    """
+    Loads the rate table indexed by currency pair.
+
+    Returns:
+        dict: {(base, quote): (sorted dates, rates)} - dates are ISO strings
+    """
+    global _rate_table, _rate_table_mtime
+
+    # (mtime, size): an append within the file system's mtime resolution still changes the size
+    stat = os.stat(RATES_FILE) if os.path.exists(RATES_FILE) else None
+    mtime = (stat.st_mtime_ns, stat.st_size) if stat else None
+    if _rate_table is not None and mtime == _rate_table_mtime:
+        return _rate_table
+
+    rows = {}
+    if mtime is not None:
+        with open(RATES_FILE, newline='') as f:
+            for row in csv.DictReader(f):
+                pair = (row['base'].upper(), row['quote'].upper())
+                # Later rows for the same date replace earlier ones
+                rows.setdefault(pair, {})[row['date']] = float(row['rate'])
+
+    _rate_table = {
+        pair: (sorted(by_date), [by_date[d] for d in sorted(by_date)])
+        for pair, by_date in rows.items()
+    }
+    _rate_table_mtime = mtime
+    return _rate_table
+
+
+def _pair_rate(table: dict, base: str, quote: str, as_of: str):
+    """Latest direct or inverse rate for a pair on or before as_of, or None."""
+    for pair, invert in (((base, quote), False), ((quote, base), True)):
+        if pair in table:
+            dates, rates = table[pair]
+            i = bisect.bisect_right(dates, as_of)
+            if i:
+                return (1 / rates[i - 1] if invert else rates[i - 1]), dates[i - 1]
+    return None
+
+
+def lookup_rate(from_currency: str, to_currency: str, as_of: str = ""):
+    """
+    Finds the exchange rate from the local rate table.
+
+    Uses the latest rate on or before `as_of` (default: today). Pairs that are
+    not stored directly are derived through PIVOT_CURRENCY.
+
+    Returns:
+        tuple: (rate, rate date, description of how the rate was derived)
+    """
+    base, quote = from_currency.upper(), to_currency.upper()
+    as_of = Date.fromisoformat(as_of).isoformat() if as_of else Date.today().isoformat()
+
+    if base == quote:
+        return 1.0, as_of, "same currency"
+
+    table = load_rate_table()
+    direct = _pair_rate(table, base, quote, as_of)
+    if direct:
+        return direct[0], direct[1], f"{base}/{quote}"
+
+    if PIVOT_CURRENCY not in (base, quote):
+        first = _pair_rate(table, base, PIVOT_CURRENCY, as_of)
+        second = _pair_rate(table, PIVOT_CURRENCY, quote, as_of)
+        if first and second:
+            return first[0] * second[0], min(first[1], second[1]), f"{base}/{PIVOT_CURRENCY}/{quote} cross rate"
+
+    raise LookupError(
+        f"No exchange rate for {base}/{quote} on or before {as_of}. "
+        f"Add one with set_exchange_rate or pass exchange_rate explicitly."
+    )
+
+
+async def run_isolated(func, *args) -> str:
+    """
+    Runs a calculator function in the worker pool with CPU-time and memory budgets.
+
+    A runaway expression only stops its own worker, so other calculator
+    requests keep being served.
+    """
+    try:
+        return await _pool.submit(func, *args, timeout=CALC_TIMEOUT, cpu_time=CALC_CPU_TIME_LIMIT)
+
+    except WorkerTimeout as e:
+        return f"""Error: Calculation timed out
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Reason:         {e.kind} limit exceeded
+Limit:          {e.limit:g} seconds
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+The calculation was stopped. Try a simpler expression or split it into smaller steps."""
+    except (WorkerCrashed, TaskError) as e:
+        return f"Error: {str(e)}"
+
+
+def _calculate(expression: str) -> str:
+    """Runs calculate inside a calculator worker process."""
+    try:
+        # Evaluate expression
+        result = eval(expression, {"__builtins__": {}}, dict(SAFE_FUNCTIONS))
+        return f"Result: {result}"
+
+    except MemoryError:
+        return f"Error: Calculation exceeded the memory limit ({CALC_MEMORY_LIMIT_MB} MB)."
+    except Exception as e:
+        return f"Error: {str(e)}\nPlease check your expression format."
+
+
+@mcp.tool(annotations=READ_ONLY)
 async def calculate(expression: str) -> str:
     """
     Evaluates a mathematical expression and returns the result.
@@ -51,32 +362,110 @@ async def calculate(expression: str) -> str:
         >>> calculate("(1199 - 999) / 999 * 100")
         "20.02002002002002"
     """
-    try:
-        # Safe math functions
-        safe_dict = {
-            'abs': abs,
-            'round': round,
-            'sqrt': math.sqrt,
-            'sin': math.sin,
-            'cos': math.cos,
-            'tan': math.tan,
-            'log': math.log,
-            'log10': math.log10,
-            'exp': math.exp,
-            'pow': pow,
-            'pi': math.pi,
-            'e': math.e,
-        }
+    return await run_isolated(_calculate, expression)
 
-        # Evaluate expression
-        result = eval(expression, {"__builtins__": {}}, safe_dict)
-        return f"Result: {result}"
 
+def _calculate_batch(expression: str, variables: str) -> str:
+    """Runs calculate_batch inside a calculator worker process."""
+    try:
+        columns = json.loads(variables)
+        if not isinstance(columns, dict) or not columns:
+            return "Error: variables must be a JSON object like '{\"x\": [1, 2, 3]}'"
+
+        # Convert every input column to a float array and check row counts
+        arrays = {}
+        for name, values in columns.items():
+            if not name.isidentifier() or name.startswith('_'):
+                return f"Error: Invalid variable name '{name}'"
+            arrays[name] = np.asarray(values, dtype=float)
+            if arrays[name].ndim > 1:
+                return f"Error: Variable '{name}' must be a number or a flat list of numbers"
+
+        lengths = {len(a) for a in arrays.values() if a.ndim == 1}
+        if len(lengths) > 1:
+            return f"Error: All list variables must have the same length (got {sorted(lengths)})"
+        n_rows = lengths.pop() if lengths else 1
+
+        # Compile once, evaluate once over all rows
+        code = compile(expression, "<expression>", "eval")
+        private = [name for name in code.co_names if name.startswith('_')]
+        if private:
+            return f"Error: Name '{private[0]}' is not allowed in expressions"
+        namespace = dict(VECTOR_FUNCTIONS)
+        namespace.update(arrays)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = np.broadcast_to(
+                np.asarray(eval(code, {"__builtins__": {}}, namespace), dtype=float),
+                (n_rows,)
+            )
+
+        names = list(arrays)
+        table = {name: np.broadcast_to(arrays[name], (n_rows,)) for name in names}
+        table['result'] = result
+
+        # Format as a compact fixed-width table
+        header = ['row'] + names + ['result']
+        shown = range(min(n_rows, MAX_BATCH_ROWS_SHOWN))
+        rows = [[str(i + 1)] + [f"{table[col][i]:.10g}" for col in names + ['result']] for i in shown]
+        widths = [max([len(header[j])] + [len(r[j]) for r in rows]) for j in range(len(header))]
+
+        lines = ["  ".join(h.ljust(w) for h, w in zip(header, widths)).rstrip()]
+        lines += ["  ".join(v.ljust(w) for v, w in zip(r, widths)).rstrip() for r in rows]
+        if n_rows > MAX_BATCH_ROWS_SHOWN:
+            lines.append(f"... {n_rows - MAX_BATCH_ROWS_SHOWN} more rows")
+
+        finite = result[np.isfinite(result)]
+        summary = f"Rows: {n_rows}"
+        if len(finite):
+            summary += f", Sum: {finite.sum():,.4f}, Mean: {finite.mean():,.4f}"
+        if len(finite) < n_rows:
+            summary += f", Non-finite results: {n_rows - len(finite)}"
+
+        return f"""Batch Calculation: {expression}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+""" + "\n".join(lines) + f"""
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{summary}"""
+
+    except MemoryError:
+        return f"Error: Calculation exceeded the memory limit ({CALC_MEMORY_LIMIT_MB} MB)."
+    except json.JSONDecodeError:
+        return "Error: Invalid JSON for variables. Example: '{\"price\": [999, 1199], \"rate\": 1300}'"
     except Exception as e:
-        return f"Error: {str(e)}\nPlease check your expression format."
+        return f"Error: {str(e)}\nPlease check your expression and variables."
+
+
+@mcp.tool(annotations=READ_ONLY)
+async def calculate_batch(expression: str, variables: str) -> str:
+    """
+    Evaluates one expression over many rows of input values in a single call.
+
+    Use this instead of calling `calculate` or `percentage_change` once per value
+    (e.g., converting a whole price list or computing growth for every quarter).
+    The expression is compiled once and evaluated with NumPy over all rows.
+
+    Supports the same operators, functions and constants as `calculate`.
+
+    Args:
+        expression (str): Expression using the variable names (e.g., "price * rate", "(new - old) / old * 100")
+        variables (str): JSON object mapping variable names to equal-length lists of numbers.
+            Single numbers are applied to every row (e.g., '{"price": [999, 1199], "rate": 1300}')
+
+    Returns:
+        str: Table with the input columns and the result for each row
 
+    Examples:
+        >>> calculate_batch("price * rate", '{"price": [799, 999, 1199], "rate": 1300}')
+        "row  price  rate  result
+         1    799    1300  1038700
+         ..."
+
+        >>> calculate_batch("(new - old) / old * 100", '{"old": [100, 120, 150], "new": [120, 150, 180]}')
+    """
+    return await run_isolated(_calculate_batch, expression, variables)
 
-@mcp.tool()
+
+@mcp.tool(annotations=READ_ONLY)
 async def percentage_change(old_value: float, new_value: float) -> str:
     """
     Calculates the percentage change between two values.
@@ -112,16 +501,68 @@ async def percentage_change(old_value: float, new_value: float) -> str:
         return f"Error: {str(e)}"
 
 
-@mcp.tool()
-async def statistics_summary(numbers: str) -> str:
+def _statistics_summary(numbers: str, csv_file: str, column: str) -> str:
+    """Runs statistics_summary inside a calculator worker process."""
+    try:
+        stats = RunningStats(STATS_SAMPLE_SIZE)
+
+        if csv_file:
+            if not column:
+                return "Error: Please provide the column name to summarize from the CSV file."
+            for chunk in read_csv_column(csv_file, column):
+                stats.update(chunk)
+            source = f"{csv_file} [{column}]"
+        else:
+            stats.update(parse_numbers(numbers))
+            source = ""
+
+        if stats.count < 2:
+            return "Error: Need at least 2 numbers for statistics."
+
+        q1, median, q3 = stats.percentiles((25, 50, 75))
+        approx = "" if stats.exact else " (approx.)"
+
+        result = f"""Statistical Summary:{f" {source}" if source else ""}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Count:      {stats.count}
+Mean:       {stats.mean:.2f}
+Median:     {median:.2f}{approx}
+Std Dev:    {stats.stdev:.2f}
+Min:        {stats.min:.2f}
+Max:        {stats.max:.2f}
+Range:      {stats.max - stats.min:.2f}
+Q1 / Q3:    {q1:.2f} / {q3:.2f}{approx}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
+        if not stats.exact:
+            result += f"\nMedian and quartiles are estimated from a random sample of {stats.sample_size:,} values."
+        if stats.dropped:
+            result += f"\nSkipped {stats.dropped:,} non-finite values (NaN / inf)."
+
+        return result
+
+    except KeyError:
+        return f"Error: Column '{column}' not found in {csv_file}"
+    except Exception as e:
+        return f"Error: {str(e)}\nPlease provide numbers in format: '10, 20, 30'"
+
+
+@mcp.tool(annotations=READ_ONLY)
+async def statistics_summary(numbers: str = "", csv_file: str = "", column: str = "") -> str:
     """
     Calculates statistical summary for a list of numbers.
 
+    Numbers can be passed directly, or read from a CSV column in the output
+    directory (recommended for large inputs - no need to send values as text).
+
     Args:
         numbers (str): Comma-separated numbers (e.g., "10, 20, 30, 40, 50")
+        csv_file (str): Optional CSV filename in the output directory (e.g., "sales.csv")
+        column (str): Column to summarize when csv_file is given (e.g., "revenue")
 
     Returns:
-        str: Statistical summary including mean, median, stdev, min, max
+        str: Statistical summary including mean, median, quartiles, stdev, min, max
+            (median and quartiles are approximate for more than 100,000 values;
+            NaN / inf values are skipped)
 
     Examples:
         >>> statistics_summary("10, 20, 30, 40, 50")
@@ -131,41 +572,23 @@ async def statistics_summary(numbers: str) -> str:
          Std Dev: 15.81
          Min: 10.0
          Max: 50.0"
-    """
-    try:
-        # Parse numbers from string
-        nums = [float(x.strip()) for x in numbers.split(',')]
-
-        if len(nums) < 2:
-            return "Error: Need at least 2 numbers for statistics."
-
-        result = f"""Statistical Summary:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Count:      {len(nums)}
-Mean:       {statistics.mean(nums):.2f}
-Median:     {statistics.median(nums):.2f}
-Std Dev:    {statistics.stdev(nums):.2f}
-Min:        {min(nums):.2f}
-Max:        {max(nums):.2f}
-Range:      {max(nums) - min(nums):.2f}
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
-        return result
-
-    except Exception as e:
-        return f"Error: {str(e)}\nPlease provide numbers in format: '10, 20, 30'"
+        >>> statistics_summary(csv_file="sales.csv", column="revenue")
+    """
+    return await run_isolated(_statistics_summary, numbers, csv_file, column)
 
 
-@mcp.tool()
-async def currency_convert(amount: float, from_currency: str, to_currency: str, exchange_rate: float) -> str:
+@mcp.tool(annotations=READ_ONLY)
+async def currency_convert(amount: float, from_currency: str, to_currency: str, exchange_rate: float = 0) -> str:
     """
-    Converts currency using the provided exchange rate.
+    Converts currency using the provided exchange rate or the local rate table.
 
     Args:
         amount (float): Amount to convert
         from_currency (str): Source currency code (e.g., "USD", "KRW")
         to_currency (str): Target currency code (e.g., "KRW", "USD")
-        exchange_rate (float): Exchange rate (how much 1 unit of from_currency equals in to_currency)
+        exchange_rate (float): Exchange rate (how much 1 unit of from_currency equals in to_currency).
+            If omitted, the latest rate from the local rate table is used.
 
     Returns:
         str: Conversion result with formatted output
@@ -173,14 +596,21 @@ async def currency_convert(amount: float, from_currency: str, to_currency: str,
     Examples:
         >>> currency_convert(1199, "USD", "KRW", 1300)
         "1,199.00 USD = 1,558,700.00 KRW (at rate: 1 USD = 1,300.00 KRW)"
+
+        >>> currency_convert(1199, "USD", "KRW")
     """
     try:
+        rate_source = "provided"
+        if exchange_rate <= 0:
+            exchange_rate, rate_date, derivation = lookup_rate(from_currency, to_currency)
+            rate_source = f"rate table, {derivation}, {rate_date}"
+
         result = amount * exchange_rate
 
         output = f"""Currency Conversion:
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 Amount:         {amount:,.2f} {from_currency.upper()}
-Exchange Rate:  1 {from_currency.upper()} = {exchange_rate:,.4f} {to_currency.upper()}
+Exchange Rate:  1 {from_currency.upper()} = {exchange_rate:,.4f} {to_currency.upper()} ({rate_source})
 Result:         {result:,.2f} {to_currency.upper()}
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
@@ -190,7 +620,99 @@ Result:         {result:,.2f} {to_currency.upper()}
         return f"Error: {str(e)}"
 
 
-@mcp.tool()
+@mcp.tool(annotations=READ_ONLY)
+async def convert_many(amounts: str, from_currency: str, to_currency: str, date: str = "") -> str:
+    """
+    Converts a whole list of amounts in one call using the local rate table.
+
+    Rates come from data/exchange_rates.csv (latest rate on or before `date`).
+    Pairs without a stored rate are derived through USD (e.g., EUR -> KRW).
+
+    Args:
+        amounts (str): Comma-separated amounts (e.g., "799, 999, 1199")
+        from_currency (str): Source currency code (e.g., "USD")
+        to_currency (str): Target currency code (e.g., "KRW")
+        date (str): Optional rate date in YYYY-MM-DD format (default: latest available)
+
+    Returns:
+        str: Table of converted amounts with the rate used
+
+    Examples:
+        >>> convert_many("799, 999, 1199", "USD", "KRW")
+
+        >>> convert_many("1299, 1499", "EUR", "JPY", "2025-09-30")
+    """
+    try:
+        values = parse_numbers(amounts)
+        if len(values) == 0:
+            return "Error: Please provide at least one amount (e.g., '799, 999, 1199')"
+
+        rate, rate_date, derivation = lookup_rate(from_currency, to_currency, date)
+        converted = values * rate
+
+        src, dst = from_currency.upper(), to_currency.upper()
+        lines = [
+            f"{amount:>18,.2f} {src}  ->  {result:>20,.2f} {dst}"
+            for amount, result in zip(values[:MAX_BATCH_ROWS_SHOWN], converted[:MAX_BATCH_ROWS_SHOWN])
+        ]
+        if len(values) > MAX_BATCH_ROWS_SHOWN:
+            lines.append(f"... {len(values) - MAX_BATCH_ROWS_SHOWN} more amounts")
+
+        return f"""Currency Conversion ({len(values)} amounts):
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Exchange Rate:  1 {src} = {rate:,.4f} {dst} ({derivation}, {rate_date})
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+""" + "\n".join(lines) + f"""
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Total:          {values.sum():,.2f} {src} = {converted.sum():,.2f} {dst}"""
+
+    except ValueError as e:
+        return f"Error: {str(e)}\nPlease provide amounts as '799, 999, 1199' and dates as YYYY-MM-DD."
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+@mcp.tool(annotations=IDEMPOTENT)
+async def set_exchange_rate(from_currency: str, to_currency: str, rate: float, date: str = "") -> str:
+    """
+    Records an exchange rate in the local rate table for later conversions.
+
+    Rates are versioned by date: older rates are kept so conversions for a past
+    date still use the rate that applied then.
+
+    Args:
+        from_currency (str): Base currency code (e.g., "USD")
+        to_currency (str): Quote currency code (e.g., "KRW")
+        rate (float): How much 1 unit of from_currency equals in to_currency
+        date (str): Rate date in YYYY-MM-DD format (default: today)
+
+    Returns:
+        str: Confirmation message
+
+    Examples:
+        >>> set_exchange_rate("USD", "KRW", 1385.5, "2025-10-15")
+    """
+    try:
+        if rate <= 0:
+            return "Error: Exchange rate must be positive."
+
+        rate_date = Date.fromisoformat(date).isoformat() if date else Date.today().isoformat()
+        base, quote = from_currency.upper(), to_currency.upper()
+
+        is_new_file = not os.path.exists(RATES_FILE)
+        with open(RATES_FILE, 'a', newline='') as f:
+            writer = csv.writer(f)
+            if is_new_file:
+                writer.writerow(['date', 'base', 'quote', 'rate'])
+            writer.writerow([rate_date, base, quote, rate])
+
+        return f"Exchange rate saved: 1 {base} = {rate:,.4f} {quote} (as of {rate_date})"
+
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+@mcp.tool(annotations=READ_ONLY)
 async def compare_values(value1: float, value2: float, unit: str = "") -> str:
     """
     Compares two values and shows difference in both absolute and percentage terms.
@@ -235,4 +757,6 @@ Percentage:     {abs(percent):.2f}% {direction}
 
 
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
+    transport = parse_server_args(mcp)
+    _pool.start()
+    mcp.run(transport=transport)
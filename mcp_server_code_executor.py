@@ -2,7 +2,7 @@
 Code Executor MCP Server - Python 코드 실행 및 데이터 분석 도구
 
 이 MCP 서버는 다음 기능을 제공합니다:
-1. Python 코드 실행 (pandas, numpy, matplotlib 지원)
+1. Python 코드 실행 (pandas, numpy, matplotlib 지원, 미리 준비된 샌드박스 워커 프로세스에서 실행)
 2. 데이터 시각화 (차트 생성 및 이미지 저장)
 3. 데이터 분석 (통계, 변환, 집계)
 4. CSV/JSON 파일 읽기/쓰기
@@ -14,15 +14,37 @@ Code Executor MCP Server - Python 코드 실행 및 데이터 분석 도구
 """
 
 from mcp.server.fastmcp import FastMCP
+from mcp.types import ToolAnnotations
+from mcp_servers import parse_server_args
 from dotenv import load_dotenv
 import os
-import sys
 import io
+import sys
+import ast
+import re
 import json
+import time
+import shutil
+import hashlib
+import asyncio
+import logging
 import traceback
+from collections import deque
+from contextlib import redirect_stdout, redirect_stderr
+from worker_pool import WorkerPool, WorkerTimeout, WorkerCrashed, TaskError, set_memory_limit
+from artifact_registry import ArtifactRegistry
+from dataset_store import DatasetStore, is_handle
+import table_io
+from result_shaping import shape_frame, full_frame
 
 load_dotenv(override=True)
 
+# Sandbox workers render without a display
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+# Diagnostics go to stderr via logging - stdout is the MCP stdio channel
+logger = logging.getLogger(__name__)
+
 # OPENAI_BASE_URL 제거 (환경 변수 충돌 방지)
 if 'OPENAI_BASE_URL' in os.environ:
     del os.environ['OPENAI_BASE_URL']
@@ -33,18 +55,415 @@ mcp = FastMCP(
     instructions="A code executor that can run Python code, create visualizations, and analyze data using pandas, numpy, and matplotlib.",
     host="0.0.0.0",
     port=8007,
+    log_level=os.getenv("MCP_LOG_LEVEL", "INFO"),
 )
 
+# Tool annotations: clients may retry these after a dropped connection (see mcp_sessions.py)
+READ_ONLY = ToolAnnotations(readOnlyHint=True)
+IDEMPOTENT = ToolAnnotations(readOnlyHint=False, destructiveHint=False, idempotentHint=True)
+
 # 작업 디렉토리 설정 (출력 파일 저장 위치)
-OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "output")
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Index of files created by tool calls (see artifact_registry.py)
+_artifacts = ArtifactRegistry(OUTPUT_DIR)
+
+# Datasets shared between tools by handle (see dataset_store.py); the least recently
+# used ones are deleted beyond this many datasets / total size (MB)
+DATASETS_MAX_COUNT = int(os.getenv("DATASETS_MAX_COUNT", "100"))
+DATASETS_MAX_MB = float(os.getenv("DATASETS_MAX_MB", "1024"))
+_datasets = DatasetStore(os.path.join(OUTPUT_DIR, ".datasets"), DATASETS_MAX_COUNT, DATASETS_MAX_MB)
+
+# Sandbox worker pool for execute_python: worker count, jobs per worker, memory threshold (MB)
+EXECUTOR_WORKERS = int(os.getenv("CODE_EXECUTOR_WORKERS", "2"))
+EXECUTOR_MAX_JOBS = int(os.getenv("CODE_EXECUTOR_MAX_JOBS", "50"))
+EXECUTOR_MAX_RSS_MB = int(os.getenv("CODE_EXECUTOR_MAX_RSS_MB", "1024"))
+
+# execute_python limits: default/max wall-clock seconds, CPU seconds, address space (MB), output characters
+EXECUTION_TIMEOUT = float(os.getenv("CODE_EXECUTOR_TIMEOUT", "60"))
+EXECUTION_MAX_TIMEOUT = float(os.getenv("CODE_EXECUTOR_MAX_TIMEOUT", "300"))
+EXECUTION_CPU_TIME_LIMIT = float(os.getenv("CODE_EXECUTOR_CPU_TIME_LIMIT", "60"))
+EXECUTION_MEMORY_LIMIT_MB = int(os.getenv("CODE_EXECUTOR_MEMORY_LIMIT_MB", "2048"))
+MAX_OUTPUT_CHARS = int(os.getenv("CODE_EXECUTOR_MAX_OUTPUT_CHARS", "20000"))
+
+# Persistent sessions: idle seconds before eviction, max live sessions, memory cap per session (MB)
+SESSION_IDLE_TIMEOUT = float(os.getenv("CODE_EXECUTOR_SESSION_IDLE_TIMEOUT", "1800"))
+SESSION_MAX_COUNT = int(os.getenv("CODE_EXECUTOR_SESSION_MAX_COUNT", "4"))
+SESSION_MEMORY_LIMIT_MB = int(os.getenv("CODE_EXECUTOR_SESSION_MEMORY_LIMIT_MB", "2048"))
+
+# create_visualization: default resolution, output formats, render time limit (s), render cache size (MB)
+VISUALIZATION_DPI = int(os.getenv("VISUALIZATION_DPI", "300"))
+VISUALIZATION_FORMATS = ("png", "svg", "webp")
+RENDER_TIMEOUT = float(os.getenv("VISUALIZATION_TIMEOUT", "60"))
+RENDER_CACHE_MAX_MB = float(os.getenv("VISUALIZATION_CACHE_MAX_MB", "200"))
+RENDER_CACHE_DIR = os.path.join(OUTPUT_DIR, ".render_cache")
+os.makedirs(RENDER_CACHE_DIR, exist_ok=True)
+
+# read_csv: rows shown / parsed for type inference, rows per chunk in summary modes,
+# files whose metadata is cached
+CSV_PREVIEW_ROWS = 10
+CSV_SNIFF_ROWS = 1000
+CSV_CHUNK_ROWS = int(os.getenv("READ_CSV_CHUNK_ROWS", "200000"))
+CSV_METADATA_CACHE_SIZE = 64
+
+# (path, mtime_ns, size) -> metadata dict (see _table_metadata)
+_table_metadata_cache = {}
+
+# Table results (analyze_data, read_csv, query_sql, ...): character budget, rows and
+# columns shown, float decimals, rendering (markdown/csv/text). Cut results are saved in full to RESULTS_DIR
+RESULT_MAX_CHARS = int(os.getenv("RESULT_MAX_CHARS", "4000"))
+RESULT_MAX_ROWS = int(os.getenv("RESULT_MAX_ROWS", "40"))
+RESULT_MAX_COLUMNS = int(os.getenv("RESULT_MAX_COLUMNS", "20"))
+RESULT_DECIMALS = int(os.getenv("RESULT_DECIMALS", "4"))
+RESULT_STYLE = os.getenv("RESULT_STYLE", "markdown")
+RESULT_BUDGETS = {
+    "analyze_data": RESULT_MAX_CHARS,
+    "query_sql": RESULT_MAX_CHARS * 3 // 2,
+    "read_csv": RESULT_MAX_CHARS * 3 // 4,
+    "load_dataset": RESULT_MAX_CHARS // 2,
+}
+RESULTS_DIR = os.path.join(OUTPUT_DIR, "results")
+# Saved full results kept: newest files, maximum age (hours)
+RESULTS_MAX_COUNT = int(os.getenv("RESULTS_MAX_COUNT", "100"))
+RESULTS_MAX_AGE_HOURS = float(os.getenv("RESULTS_MAX_AGE_HOURS", "72"))
+
+# query_sql: default and maximum number of result rows
+SQL_DEFAULT_ROWS = 100
+SQL_MAX_ROWS = int(os.getenv("QUERY_SQL_MAX_ROWS", "10000"))
+
+# Series longer than this are downsampled before plotting (LTTB / hexbin / pre-binned histogram)
+VISUALIZATION_MAX_POINTS = int(os.getenv("VISUALIZATION_MAX_POINTS", "4000"))
+HEXBIN_GRID_SIZE = 100
+MAX_TICK_LABELS = 30
+
+# session_id -> {"worker": Worker, "lock": asyncio.Lock, "last_used": float}
+_sessions = {}
+
+# Held while a session worker starts, so concurrent first calls share one session
+_session_create_lock = asyncio.Lock()
+
+# Namespace kept alive between calls inside a session worker
+_session_globals = None
+
+# Files opened for writing by the job running in this worker (None between jobs)
+_written_files = None
+
+
+def _audit_file_writes(event, args):
+    """Audit hook: remembers files the running job opens for writing."""
+    if event != "open" or _written_files is None:
+        return
+    try:
+        path, mode, flags = args
+        if isinstance(path, int):
+            return
+        if mode is not None:
+            writing = any(c in mode for c in "wax+")
+        else:
+            writing = bool(flags & (os.O_WRONLY | os.O_RDWR | os.O_CREAT))
+        if writing:
+            _written_files.add(os.path.abspath(os.fsdecode(os.fspath(path))))
+    except Exception:
+        # An audit hook must never make the open itself fail
+        pass
+
+
+def _init_worker():
+    """Worker initializer: load heavy libraries once so jobs start warm, track file writes."""
+    import numpy  # noqa: F401
+    import pandas  # noqa: F401
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot  # noqa: F401
+
+    sys.addaudithook(_audit_file_writes)
+
+
+_pool = WorkerPool(
+    size=EXECUTOR_WORKERS,
+    max_tasks_per_worker=EXECUTOR_MAX_JOBS,
+    max_rss_mb=EXECUTOR_MAX_RSS_MB,
+    memory_limit_mb=EXECUTION_MEMORY_LIMIT_MB,
+    initializer=_init_worker,
+    preload=["__main__", "numpy", "pandas", "matplotlib.pyplot"],
+)
+
+
+def _save_dataset(df, name: str = "") -> str:
+    """save_dataset() available to user code: stores a DataFrame and returns its handle."""
+    return _datasets.save(df, name=name, source="execute_python")
+
+
+def _safe_globals() -> dict:
+    """Fresh globals for user code - nothing leaks between executions."""
+    return {
+        # Dataset handles shared with the other tools
+        'load_dataset': _datasets.load,
+        'save_dataset': _save_dataset,
+        '__builtins__': {
+            '__import__': __import__,  # 모듈 import 허용
+            'open': open,  # 파일 작업 허용
+            'print': print,
+            'len': len,
+            'range': range,
+            'enumerate': enumerate,
+            'zip': zip,
+            'map': map,
+            'filter': filter,
+            'sum': sum,
+            'min': min,
+            'max': max,
+            'abs': abs,
+            'round': round,
+            'sorted': sorted,
+            'list': list,
+            'dict': dict,
+            'tuple': tuple,
+            'set': set,
+            'str': str,
+            'int': int,
+            'float': float,
+            'bool': bool,
+            'True': True,
+            'False': False,
+            'None': None,
+        }
+    }
+
+
+class BoundedOutput(io.TextIOBase):
+    """
+    Write-only text buffer that keeps the first and last characters written.
+
+    Memory stays bounded however much the code prints; the middle part is
+    dropped and replaced by a truncation marker.
+    """
+
+    def __init__(self, limit: int):
+        self.head_limit = limit // 4
+        self.tail_limit = limit - self.head_limit
+        self._head = []
+        self._head_size = 0
+        self._tail = deque()
+        self._tail_size = 0
+        self.dropped = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        written = len(text)
+
+        if self._head_size < self.head_limit:
+            taken = text[:self.head_limit - self._head_size]
+            self._head.append(taken)
+            self._head_size += len(taken)
+            text = text[len(taken):]
+
+        if text:
+            self._tail.append(text)
+            self._tail_size += len(text)
+            # Ring buffer: drop the oldest tail text beyond the limit
+            while self._tail_size > self.tail_limit:
+                excess = self._tail_size - self.tail_limit
+                oldest = self._tail[0]
+                if len(oldest) <= excess:
+                    self._tail.popleft()
+                    self._tail_size -= len(oldest)
+                    self.dropped += len(oldest)
+                else:
+                    self._tail[0] = oldest[excess:]
+                    self._tail_size -= excess
+                    self.dropped += excess
+
+        return written
+
+    def getvalue(self) -> str:
+        head, tail = "".join(self._head), "".join(self._tail)
+        if self.dropped:
+            return f"{head}\n... [output truncated: {self.dropped:,} characters omitted] ...\n{tail}"
+        return head + tail
+
+
+def _execute_code(code: str, persistent: bool = False):
+    """
+    Runs user code inside a sandbox worker process.
+
+    With persistent=True the worker belongs to one session and the namespace
+    is kept for the next call.
+
+    Returns:
+        tuple: (result text, paths of files written to OUTPUT_DIR by this call)
+    """
+    global _session_globals, _written_files
+    import matplotlib.pyplot as plt
+
+    if persistent:
+        if _session_globals is None:
+            _session_globals = _safe_globals()
+        namespace = _session_globals
+    else:
+        namespace = _safe_globals()
+
+    # Per-execution capture: each worker runs one job at a time, so redirecting
+    # the worker's own stdout/stderr never mixes output from other calls
+    captured = BoundedOutput(MAX_OUTPUT_CHARS)
+    _written_files = set()
+
+    try:
+        with redirect_stdout(captured), redirect_stderr(captured):
+            exec(code, namespace)
+
+        output = captured.getvalue()
+
+        result = "Code executed successfully!\n"
+        result += "=" * 50 + "\n"
+
+        if output:
+            result += "Output:\n"
+            result += output + "\n"
+
+    except Exception as e:
+        error_trace = traceback.format_exc()
+        output = captured.getvalue()
+        result = f"Error executing code:\n{error_trace}"
+        if output:
+            result += f"\nOutput before the error:\n{output}"
+
+    finally:
+        # Don't carry open figures over to the next job in this worker
+        if not persistent:
+            plt.close('all')
+        written, _written_files = _written_files, None
+
+    # Only report files in the output directory (no directory scan needed)
+    artifacts = sorted(
+        path for path in written
+        if os.path.isfile(path)
+        and os.path.commonpath([path, OUTPUT_DIR]) == OUTPUT_DIR
+        and path != _artifacts.index_path
+        # Internal stores (.datasets, .render_cache, ...) are not artifacts
+        and not any(part.startswith('.') for part in os.path.relpath(path, OUTPUT_DIR).split(os.sep))
+    )
+    return result, artifacts
+
+
+def _report_artifacts(paths, call_id: str, tool: str) -> str:
+    """Registers files created by a tool call and formats them for the result."""
+    if not paths:
+        return ""
+
+    lines = []
+    for path in paths:
+        record = _artifacts.register(path, call_id, tool)
+        lines.append(f"  - {record['filename']} ({record['mime']}, {record['size'] / 1024:,.1f} KB)")
+    return "\nGenerated files:\n" + "\n".join(lines) + f"\nLocation: {OUTPUT_DIR}\n"
+
+
+def _describe_session_variables() -> str:
+    """Lists the variables of the session namespace (runs in the session worker)."""
+    import types
+
+    injected = _safe_globals()
+    rows = []
+    for name, value in (_session_globals or {}).items():
+        if name.startswith('__') or isinstance(value, types.ModuleType):
+            continue
+        if name in injected and callable(value) and value == injected[name]:
+            continue  # load_dataset/save_dataset helpers, not user variables
+        kind = type(value).__name__
+        if hasattr(value, 'shape'):
+            detail = f"shape={tuple(value.shape)}"
+        elif isinstance(value, (list, tuple, dict, set, str)):
+            detail = f"len={len(value)}"
+        else:
+            detail = repr(value)[:60]
+        rows.append(f"{name:<20} {kind:<14} {detail}")
+    return "\n".join(rows)
+
+
+def _evict_idle_sessions():
+    """Stops sessions that were not used for SESSION_IDLE_TIMEOUT seconds."""
+    now = time.monotonic()
+    for session_id, session in list(_sessions.items()):
+        if now - session["last_used"] > SESSION_IDLE_TIMEOUT and not session["lock"].locked():
+            _close_session(session_id)
+
+
+def _close_session(session_id: str):
+    session = _sessions.pop(session_id, None)
+    if session is not None:
+        session["worker"].kill()
+
+
+async def _get_session(session_id: str) -> dict:
+    """Returns the session, starting a dedicated worker for a new session ID."""
+    _evict_idle_sessions()
+
+    async with _session_create_lock:
+        if session_id not in _sessions:
+            if len(_sessions) >= SESSION_MAX_COUNT:
+                # Make room by closing the least recently used idle session
+                idle = [sid for sid, s in _sessions.items() if not s["lock"].locked()]
+                if not idle:
+                    raise RuntimeError(f"Too many active sessions (max {SESSION_MAX_COUNT})")
+                _close_session(min(idle, key=lambda sid: _sessions[sid]["last_used"]))
+
+            worker = _pool.checkout()
+            try:
+                await worker.run(set_memory_limit, SESSION_MEMORY_LIMIT_MB)
+            except BaseException:
+                worker.kill()
+                raise
+            _sessions[session_id] = {"worker": worker, "lock": asyncio.Lock(), "last_used": time.monotonic()}
+
+    session = _sessions[session_id]
+    session["last_used"] = time.monotonic()
+    return session
+
+
+async def _run_in_session(session_id: str, func, *args, timeout=None, cpu_time=None) -> str:
+    session = await _get_session(session_id)
+    async with session["lock"]:
+        try:
+            return await session["worker"].run(func, *args, timeout=timeout, cpu_time=cpu_time)
+        except WorkerCrashed:
+            _close_session(session_id)
+            raise RuntimeError(
+                f"Session '{session_id}' was lost (worker process exited, "
+                f"possibly over the {SESSION_MEMORY_LIMIT_MB} MB memory limit). "
+                "Its variables were cleared; run the setup code again."
+            )
+        except WorkerTimeout:
+            if not session["worker"].alive:
+                # Wall-clock timeouts kill the worker, and the namespace with it
+                _close_session(session_id)
+            raise
+        finally:
+            session["last_used"] = time.monotonic()
+
+
+def _timeout_message(e: WorkerTimeout, session_id: str = "") -> str:
+    message = f"""Error: Code execution timed out
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Reason:         {e.kind} limit exceeded
+Limit:          {e.limit:g} seconds
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+The code was stopped. Process less data per call or pass a larger timeout (max {EXECUTION_MAX_TIMEOUT:g}s)."""
+    if session_id and session_id not in _sessions:
+        message += f"\nSession '{session_id}' was reset; run its setup code again."
+    return message
+
 
 @mcp.tool()
-async def execute_python(code: str) -> str:
+async def execute_python(code: str, session_id: str = "", timeout: float = EXECUTION_TIMEOUT) -> str:
     """
     Executes Python code in a safe environment with pandas, numpy, and matplotlib support.
 
+    Pass a session_id to keep variables between calls (e.g., load a CSV once and
+    keep using the DataFrame in later steps). Without it, every call starts empty.
+
     Supported libraries:
     - pandas (as pd)
     - numpy (as np)
@@ -53,6 +472,8 @@ async def execute_python(code: str) -> str:
 
     Args:
         code (str): Python code to execute
+        session_id (str): Optional session name whose variables persist between calls (e.g., "sales-analysis")
+        timeout (float): Wall-clock limit in seconds (default 60, max 300)
 
     Returns:
         str: Execution result with stdout, return value, and any generated plots
@@ -69,100 +490,339 @@ async def execute_python(code: str) -> str:
         plt.savefig("output/plot.png")
         ''')
 
+        >>> execute_python("import pandas as pd\\ndf = pd.read_csv('output/sales.csv')", session_id="sales")
+        >>> execute_python("print(df.groupby('region').sum())", session_id="sales")
+
     Security:
     - Restricted to safe modules only
+    - Runs in a separate sandbox worker process (fresh namespace per call unless session_id is set)
+    - Wall-clock timeout, CPU-time and memory limits; long jobs don't block other tools
+    - Output is capped (long prints are truncated)
     - No file system access outside output directory
     - No subprocess or system calls
     """
+    timeout = min(max(timeout, 1), EXECUTION_MAX_TIMEOUT)
+    cpu_time = min(timeout, EXECUTION_CPU_TIME_LIMIT)
+    call_id = _artifacts.new_call_id()
     try:
-        # Capture stdout
-        old_stdout = sys.stdout
-        sys.stdout = io.StringIO()
-
-        # Safe globals with allowed modules
-        safe_globals = {
-            '__builtins__': {
-                '__import__': __import__,  # 모듈 import 허용
-                'open': open,  # 파일 작업 허용
-                'print': print,
-                'len': len,
-                'range': range,
-                'enumerate': enumerate,
-                'zip': zip,
-                'map': map,
-                'filter': filter,
-                'sum': sum,
-                'min': min,
-                'max': max,
-                'abs': abs,
-                'round': round,
-                'sorted': sorted,
-                'list': list,
-                'dict': dict,
-                'tuple': tuple,
-                'set': set,
-                'str': str,
-                'int': int,
-                'float': float,
-                'bool': bool,
-                'True': True,
-                'False': False,
-                'None': None,
-            }
-        }
-
-        # Execute code
-        exec(code, safe_globals)
+        if session_id:
+            result, written = await _run_in_session(session_id, _execute_code, code, True, timeout=timeout, cpu_time=cpu_time)
+        else:
+            result, written = await _pool.submit(_execute_code, code, timeout=timeout, cpu_time=cpu_time)
+        return result + _report_artifacts(written, call_id, "execute_python")
+    except WorkerTimeout as e:
+        return _timeout_message(e, session_id)
+    except (RuntimeError, WorkerCrashed, TaskError) as e:
+        return f"Error executing code:\n{str(e)}"
 
-        # Get stdout
-        output = sys.stdout.getvalue()
-        sys.stdout = old_stdout
 
-        # Check for saved plots
-        plot_files = []
-        if os.path.exists(OUTPUT_DIR):
-            for file in os.listdir(OUTPUT_DIR):
-                if file.endswith(('.png', '.jpg', '.jpeg', '.svg')):
-                    plot_files.append(file)
+@mcp.tool(annotations=READ_ONLY)
+async def list_variables(session_id: str) -> str:
+    """
+    Lists the variables defined in an execute_python session.
 
-        result = "Code executed successfully!\n"
-        result += "=" * 50 + "\n"
+    Args:
+        session_id (str): Session name used with execute_python
 
-        if output:
-            result += "Output:\n"
-            result += output + "\n"
+    Returns:
+        str: Variable names, types and sizes (e.g., DataFrame shapes)
 
-        if plot_files:
-            result += f"\nGenerated plots: {', '.join(plot_files)}\n"
-            result += f"Location: {OUTPUT_DIR}\n"
+    Examples:
+        >>> list_variables("sales")
+    """
+    _evict_idle_sessions()
+    if session_id not in _sessions:
+        return f"Session '{session_id}' does not exist (it may have expired after {SESSION_IDLE_TIMEOUT:.0f}s idle)."
 
-        return result
+    try:
+        listing = await _run_in_session(session_id, _describe_session_variables, timeout=30)
+    except (RuntimeError, WorkerTimeout, WorkerCrashed, TaskError) as e:
+        return f"Error listing variables: {str(e)}"
 
-    except Exception as e:
-        sys.stdout = old_stdout
-        error_trace = traceback.format_exc()
-        return f"Error executing code:\n{error_trace}"
+    return f"""Session: {session_id}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{listing or "(no variables)"}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
 
 @mcp.tool()
+async def reset_session(session_id: str) -> str:
+    """
+    Clears an execute_python session and frees its memory.
+
+    Args:
+        session_id (str): Session name used with execute_python
+
+    Returns:
+        str: Confirmation message
+
+    Examples:
+        >>> reset_session("sales")
+    """
+    if session_id not in _sessions:
+        return f"Session '{session_id}' does not exist."
+    _close_session(session_id)
+    return f"Session '{session_id}' was reset. All its variables were cleared."
+
+
+def _categorical_positions(ax, labels):
+    """Places string labels on the x-axis and returns their numeric positions."""
+    import numpy as np
+    positions = np.arange(len(labels))
+    # Label at most MAX_TICK_LABELS evenly spaced categories
+    step = max(1, -(-len(labels) // MAX_TICK_LABELS))
+    ax.set_xticks(positions[::step])
+    ax.set_xticklabels(labels[::step], rotation=45, ha='right')
+    return positions
+
+
+def _lttb(x, y, n_out: int):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last point and, from each of n_out - 2 equal buckets,
+    the point forming the largest triangle with the previously kept point and
+    the mean of the next bucket. x must be sorted.
+
+    Returns:
+        numpy.ndarray: Indices of the kept points
+    """
+    import numpy as np
+
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+    counts = ends - starts
+    mean_x = np.add.reduceat(x[:n - 1], starts) / counts
+    mean_y = np.add.reduceat(y[:n - 1], starts) / counts
+
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = starts[i], ends[i]
+        if i + 1 < n_out - 2:
+            next_x, next_y = mean_x[i + 1], mean_y[i + 1]
+        else:
+            next_x, next_y = x[-1], y[-1]
+        # Twice the triangle area for every candidate in the bucket
+        area = np.abs((x[a] - next_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def _resolve_chart_data(chart_data: dict) -> dict:
+    """
+    Replaces column names with column values when chart data refers to a dataset.
+
+    {"dataset": "ds_1a2b3c4d", "x": "month", "y": "sales"} becomes
+    {"x": [...], "y": array([...])}; other keys (e.g. 'bins') are kept.
+    """
+    if not isinstance(chart_data, dict) or 'dataset' not in chart_data:
+        return chart_data
+
+    import numpy as np
+    import pandas as pd
+
+    try:
+        df = _datasets.load(chart_data['dataset'])
+    except KeyError as e:
+        raise ValueError(e.args[0])
+
+    resolved = {key: value for key, value in chart_data.items() if key != 'dataset'}
+    for key in ('x', 'y', 'labels', 'values'):
+        column = chart_data.get(key)
+        if not isinstance(column, str):
+            continue
+        if column not in df.columns:
+            raise ValueError(f"Column '{column}' not found in dataset. Available: {list(df.columns)}")
+        series = df[column]
+        if pd.api.types.is_numeric_dtype(series):
+            resolved[key] = series.to_numpy(dtype=float, na_value=np.nan)
+        else:
+            resolved[key] = series.astype(str).tolist()
+    return resolved
+
+
+def _draw_chart(ax, chart_type: str, chart_data: dict, title: str = "", x_label: str = "", y_label: str = "") -> str:
+    """
+    Draws one chart on a matplotlib Axes.
+
+    Line, scatter and histogram data longer than VISUALIZATION_MAX_POINTS is
+    reduced first, so drawing cost depends on the image size, not the data size.
+    chart_data may refer to a dataset handle (see _resolve_chart_data).
+
+    Returns:
+        str: Note about downsampling ("" if the data was drawn as is)
+
+    Raises:
+        ValueError: Unsupported chart type or inconsistent data
+    """
+    import numpy as np
+
+    note = ""
+    chart_data = _resolve_chart_data(chart_data)
+
+    if chart_type in ('line', 'bar', 'scatter'):
+        x_data = chart_data.get('x', [])
+        y_data = chart_data.get('y', [])
+
+        if chart_type == 'bar':
+            # Validate data
+            if len(x_data) == 0 or len(y_data) == 0:
+                raise ValueError(
+                    f"Empty data. x_data={x_data}, y_data={y_data}. Please provide data in format: "
+                    '{"x": ["label1", "label2"], "y": [value1, value2]}'
+                )
+            if len(x_data) != len(y_data):
+                raise ValueError(f"x_data length ({len(x_data)}) doesn't match y_data length ({len(y_data)})")
+
+        # Handle categorical (string) labels on x-axis
+        if len(x_data) > 0 and isinstance(x_data[0], str):
+            x_data = _categorical_positions(ax, x_data)
+
+        if chart_type == 'bar':
+            ax.bar(x_data, y_data)
+
+        elif len(y_data) <= VISUALIZATION_MAX_POINTS:
+            if chart_type == 'line':
+                ax.plot(x_data, y_data, marker='o' if len(y_data) <= 200 else None)
+            else:
+                ax.scatter(x_data, y_data)
+
+        else:
+            x = np.asarray(x_data, dtype=float)
+            y = np.asarray(y_data, dtype=float)
+            if x.shape != y.shape:
+                raise ValueError(f"x_data length ({len(x)}) doesn't match y_data length ({len(y)})")
+            finite = np.isfinite(x) & np.isfinite(y)
+            x, y = x[finite], y[finite]
+
+            if chart_type == 'line':
+                if np.any(np.diff(x) < 0):
+                    order = np.argsort(x, kind='stable')
+                    x, y = x[order], y[order]
+                keep = _lttb(x, y, VISUALIZATION_MAX_POINTS)
+                ax.plot(x[keep], y[keep])
+                note = f"{len(y_data):,} → {len(keep):,} points (LTTB)"
+            else:
+                hexbin = ax.hexbin(x, y, gridsize=HEXBIN_GRID_SIZE, mincnt=1, cmap='viridis')
+                ax.figure.colorbar(hexbin, ax=ax, label='count')
+                note = f"{len(y_data):,} points drawn as density (hexbin)"
+
+    elif chart_type == 'pie':
+        labels = chart_data.get('labels', [])
+        values = chart_data.get('values', [])
+        ax.pie(values, labels=labels, autopct='%1.1f%%')
+
+    elif chart_type == 'hist':
+        values = chart_data.get('values', [])
+        bins = chart_data.get('bins', 10)
+        if len(values) > VISUALIZATION_MAX_POINTS:
+            # Bin once with NumPy and draw only the bar heights
+            counts, edges = np.histogram(np.asarray(values, dtype=float), bins=bins)
+            ax.hist(edges[:-1], bins=edges, weights=counts)
+            note = f"{len(values):,} values pre-binned into {len(counts)} bins"
+        else:
+            ax.hist(values, bins=bins)
+
+    else:
+        raise ValueError(f"Unsupported chart type '{chart_type}'. Use: line, bar, scatter, pie, hist")
+
+    # Set labels and title
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    if x_label:
+        ax.set_xlabel(x_label)
+    if y_label:
+        ax.set_ylabel(y_label)
+    ax.grid(True, alpha=0.3)
+    return note
+
+
+def _render_chart(data: str, chart_type: str, title: str, x_label: str, y_label: str,
+                  width: float, height: float, dpi: int, fmt: str, path: str) -> str:
+    """Renders a chart to `path` (runs in a worker process) and returns the downsampling note."""
+    from matplotlib.figure import Figure
+
+    chart_data = json.loads(data)
+    logger.debug("Chart type: %s, parsed chart_data: %s", chart_type, chart_data)
+
+    # A standalone Figure keeps no pyplot state between jobs
+    fig = Figure(figsize=(width, height))
+    note = _draw_chart(fig.add_subplot(), chart_type, chart_data, title, x_label, y_label)
+    fig.tight_layout()
+
+    # Write under a temporary name so a concurrent reader never sees a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fig.savefig(tmp_path, dpi=dpi, format=fmt, bbox_inches='tight')
+    os.replace(tmp_path, path)
+    return note
+
+
+def _render_cache_key(*parts) -> str:
+    """Content hash of everything that affects the rendered image."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _prune_render_cache():
+    """Removes the least recently used renders once the cache exceeds RENDER_CACHE_MAX_MB."""
+    entries = []
+    with os.scandir(RENDER_CACHE_DIR) as it:
+        for entry in it:
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    limit = RENDER_CACHE_MAX_MB * 2**20
+    for _, size, path in sorted(entries):
+        if total <= limit:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+@mcp.tool(annotations=IDEMPOTENT)
 async def create_visualization(
     data: str,
     chart_type: str,
     title: str = "Chart",
     x_label: str = "",
     y_label: str = "",
-    filename: str = "chart.png"
+    filename: str = "chart.png",
+    format: str = "",
+    dpi: int = 0,
+    width: float = 10,
+    height: float = 6
 ) -> str:
     """
     Creates a data visualization and saves it as an image file.
 
+    Identical requests are served from a render cache instead of being drawn again.
+
     Args:
-        data (str): JSON string containing data (e.g., '{"x": [1,2,3], "y": [4,5,6]}')
+        data (str): JSON string containing data (e.g., '{"x": [1,2,3], "y": [4,5,6]}'),
+            or columns of a dataset (e.g., '{"dataset": "ds_1a2b3c4d", "x": "month", "y": "sales"}')
         chart_type (str): Type of chart ('line', 'bar', 'scatter', 'pie', 'hist')
         title (str): Chart title (default: "Chart")
         x_label (str): X-axis label (default: "")
         y_label (str): Y-axis label (default: "")
         filename (str): Output filename (default: "chart.png")
+        format (str): Image format 'png', 'svg' or 'webp' (default: from filename extension)
+        dpi (int): Resolution; use e.g. 100 for quick previews (default: 300)
+        width (float): Figure width in inches (default: 10)
+        height (float): Figure height in inches (default: 6)
 
     Returns:
         str: Success message with file location
@@ -179,117 +839,473 @@ async def create_visualization(
         >>> create_visualization(
                 '{"labels": ["iPhone 17", "iPhone 16", "iPhone 15"], "values": [45, 30, 25]}',
                 'pie',
-                'Market Share'
+                'Market Share',
+                filename='market_share.svg'
             )
     """
+    stem, ext = os.path.splitext(filename)
+    fmt = (format or ext.lstrip('.') or 'png').lower()
+    if fmt not in VISUALIZATION_FORMATS:
+        return f"Error: Unsupported format '{fmt}'. Use: {', '.join(VISUALIZATION_FORMATS)}"
+    if ext.lower() != f".{fmt}":
+        filename = f"{stem}.{fmt}"
+    dpi = dpi or VISUALIZATION_DPI
+
+    key = _render_cache_key(data, chart_type, title, x_label, y_label, width, height, dpi, fmt)
+    cache_path = os.path.join(RENDER_CACHE_DIR, f"{key}.{fmt}")
+    cached = os.path.exists(cache_path)
+    note = ""
+
     try:
-        import matplotlib
-        matplotlib.use('Agg')  # Non-interactive backend
-        import matplotlib.pyplot as plt
+        if cached:
+            os.utime(cache_path)  # mark as recently used
+        else:
+            note = await _pool.submit(
+                _render_chart, data, chart_type, title, x_label, y_label,
+                width, height, dpi, fmt, cache_path,
+                timeout=RENDER_TIMEOUT, cpu_time=RENDER_TIMEOUT,
+            )
+            await asyncio.to_thread(_prune_render_cache)
+
+        output_path = os.path.join(OUTPUT_DIR, filename)
+        await asyncio.to_thread(shutil.copyfile, cache_path, output_path)
+        record = _artifacts.register(output_path, _artifacts.new_call_id(), "create_visualization")
+
+    except TaskError as e:
+        if e.name == 'JSONDecodeError':
+            return "Error: Invalid JSON data format. Please provide valid JSON string."
+        if e.name == 'ValueError':
+            return f"Error: {e}"
+        return f"Error creating visualization: {e.name}: {e}\n{e.remote_traceback}"
+    except (WorkerTimeout, WorkerCrashed, OSError) as e:
+        return f"Error creating visualization: {e}"
+
+    downsampled = f"\nDownsampled:    {note}" if note else ""
+    return f"""Visualization created successfully!
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Chart Type:     {chart_type}
+Title:          {title}
+Filename:       {filename}
+Format:         {fmt} ({dpi} dpi)
+Size:           {record['size'] / 1024:,.1f} KB
+Render:         {'cached' if cached else 'new'}{downsampled}
+Location:       {output_path}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
-        # Parse data
-        chart_data = json.loads(data)
 
-        # DEBUG: Print received data
-        print(f"DEBUG: Received data: {data}")
-        print(f"DEBUG: Parsed chart_data: {chart_data}")
-        print(f"DEBUG: Chart type: {chart_type}")
+def _render_dashboard(charts: str, title: str, layout: str, columns: int,
+                      dpi: int, fmt: str, filename: str) -> list:
+    """
+    Renders several chart specs with one figure (runs in a worker process).
 
-        # Create figure
-        plt.figure(figsize=(10, 6))
+    Returns:
+        list: (path, chart_type, note) for every file written
+    """
+    from matplotlib.figure import Figure
+
+    specs = json.loads(charts)
+    if not isinstance(specs, list) or not specs:
+        raise ValueError("charts must be a non-empty JSON array of chart specs")
+    for i, spec in enumerate(specs, 1):
+        if not isinstance(spec, dict) or 'chart_type' not in spec:
+            raise ValueError(f"Chart {i} needs at least 'chart_type' and 'data'")
+        # data may be given as an object or as a JSON string like in create_visualization
+        if isinstance(spec.get('data'), str):
+            spec['data'] = json.loads(spec['data'])
+
+    def draw(ax, spec):
+        return _draw_chart(ax, spec['chart_type'], spec.get('data') or {}, spec.get('title', ''),
+                           spec.get('x_label', ''), spec.get('y_label', ''))
+
+    def save(fig, path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fig.savefig(tmp_path, dpi=dpi, format=fmt, bbox_inches='tight')
+        os.replace(tmp_path, path)
+
+    stem = os.path.splitext(filename)[0]
+
+    if layout == 'grid':
+        columns = max(1, min(columns, len(specs)))
+        rows = -(-len(specs) // columns)
+        fig = Figure(figsize=(6 * columns, 4.5 * rows), layout='constrained')
+        axes = fig.subplots(rows, columns, squeeze=False).ravel()
+        notes = [draw(ax, spec) for ax, spec in zip(axes, specs)]
+        for ax in axes[len(specs):]:
+            ax.set_visible(False)
+        if title:
+            fig.suptitle(title, fontsize=16, fontweight='bold')
+
+        path = os.path.join(OUTPUT_DIR, f"{stem}.{fmt}")
+        save(fig, path)
+        summary = ", ".join(f"{spec['chart_type']}" for spec in specs)
+        return [(path, summary, "; ".join(note for note in notes if note))]
+
+    # layout == 'files': one figure reused for every chart
+    fig = Figure(figsize=(10, 6), layout='constrained')
+    written = []
+    for i, spec in enumerate(specs, 1):
+        fig.clear()
+        note = draw(fig.add_subplot(), spec)
+        name = os.path.splitext(spec.get('filename') or f"{stem}_{i}")[0]
+        path = os.path.join(OUTPUT_DIR, f"{name}.{fmt}")
+        save(fig, path)
+        written.append((path, spec['chart_type'], note))
+    return written
+
+
+@mcp.tool(annotations=IDEMPOTENT)
+async def create_dashboard(
+    charts: str,
+    title: str = "Dashboard",
+    layout: str = "grid",
+    columns: int = 2,
+    filename: str = "dashboard.png",
+    format: str = "",
+    dpi: int = 0
+) -> str:
+    """
+    Creates several charts in one call.
 
-        # Create chart based on type
-        if chart_type == 'line':
-            x_data = chart_data.get('x', [])
-            y_data = chart_data.get('y', [])
+    Use this instead of calling create_visualization once per chart.
 
-            # Handle categorical (string) labels on x-axis
-            if x_data and isinstance(x_data[0], str):
-                import numpy as np
-                positions = np.arange(len(x_data))
-                plt.plot(positions, y_data, marker='o')
-                plt.xticks(positions, x_data, rotation=45, ha='right')
-            else:
-                plt.plot(x_data, y_data, marker='o')
+    Args:
+        charts (str): JSON array of chart specs. Each spec has 'chart_type', 'data'
+            (same format as create_visualization) and optional 'title', 'x_label',
+            'y_label' and 'filename' (layout 'files' only)
+        title (str): Dashboard title (layout 'grid' only, default: "Dashboard")
+        layout (str): 'grid' = all charts as subplots of one image,
+            'files' = one image per chart (default: 'grid')
+        columns (int): Number of grid columns (default: 2)
+        filename (str): Output filename; with layout 'files' it is the prefix for
+            charts without their own filename (default: "dashboard.png")
+        format (str): Image format 'png', 'svg' or 'webp' (default: from filename extension)
+        dpi (int): Resolution (default: 300)
 
-        elif chart_type == 'bar':
-            x_data = chart_data.get('x', [])
-            y_data = chart_data.get('y', [])
+    Returns:
+        str: Success message with file locations
 
-            # DEBUG: Print data
-            print(f"DEBUG bar: x_data = {x_data}, type = {type(x_data)}")
-            print(f"DEBUG bar: y_data = {y_data}, type = {type(y_data)}")
+    Examples:
+        >>> create_dashboard(
+                '[{"chart_type": "bar", "title": "Sales", "data": {"x": ["Q1", "Q2"], "y": [100, 120]}},'
+                ' {"chart_type": "pie", "title": "Share", "data": {"labels": ["A", "B"], "values": [60, 40]}}]',
+                'Quarterly Report'
+            )
+    """
+    if layout not in ('grid', 'files'):
+        return f"Error: Unknown layout '{layout}'. Use: grid, files"
+    fmt = (format or os.path.splitext(filename)[1].lstrip('.') or 'png').lower()
+    if fmt not in VISUALIZATION_FORMATS:
+        return f"Error: Unsupported format '{fmt}'. Use: {', '.join(VISUALIZATION_FORMATS)}"
+    dpi = dpi or VISUALIZATION_DPI
 
-            # Validate data
-            if not x_data or not y_data:
-                return f"Error: Empty data. x_data={x_data}, y_data={y_data}. Please provide data in format: " + \
-                       '{"x": ["label1", "label2"], "y": [value1, value2]}'
+    try:
+        written = await _pool.submit(
+            _render_dashboard, charts, title, layout, columns, dpi, fmt, filename,
+            timeout=RENDER_TIMEOUT, cpu_time=RENDER_TIMEOUT,
+        )
+    except TaskError as e:
+        if e.name == 'JSONDecodeError':
+            return "Error: Invalid JSON data format. Please provide valid JSON string."
+        if e.name == 'ValueError':
+            return f"Error: {e}"
+        return f"Error creating dashboard: {e.name}: {e}\n{e.remote_traceback}"
+    except (WorkerTimeout, WorkerCrashed) as e:
+        return f"Error creating dashboard: {e}"
+
+    call_id = _artifacts.new_call_id()
+    lines = []
+    for path, chart_type, note in written:
+        record = _artifacts.register(path, call_id, "create_dashboard")
+        line = f"  - {record['filename']} ({chart_type}, {record['size'] / 1024:,.1f} KB)"
+        lines.append(line + (f" - downsampled: {note}" if note else ""))
+
+    files = "\n".join(lines)
+    return f"""Dashboard created successfully!
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Layout:         {layout}
+Format:         {fmt} ({dpi} dpi)
+Files:
+{files}
+Location:       {OUTPUT_DIR}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
-            if len(x_data) != len(y_data):
-                return f"Error: x_data length ({len(x_data)}) doesn't match y_data length ({len(y_data)})"
-
-            # Handle categorical (string) labels on x-axis
-            if x_data and isinstance(x_data[0], str):
-                import numpy as np
-                positions = np.arange(len(x_data))
-                print(f"DEBUG bar: Using categorical positions: {positions}")
-                plt.bar(positions, y_data)
-                plt.xticks(positions, x_data, rotation=45, ha='right')
-            else:
-                plt.bar(x_data, y_data)
-
-        elif chart_type == 'scatter':
-            x_data = chart_data.get('x', [])
-            y_data = chart_data.get('y', [])
-
-            # Scatter plots work better with numeric data
-            # If strings are provided, convert to numeric positions
-            if x_data and isinstance(x_data[0], str):
-                import numpy as np
-                positions = np.arange(len(x_data))
-                plt.scatter(positions, y_data)
-                plt.xticks(positions, x_data, rotation=45, ha='right')
-            else:
-                plt.scatter(x_data, y_data)
 
-        elif chart_type == 'pie':
-            labels = chart_data.get('labels', [])
-            values = chart_data.get('values', [])
-            plt.pie(values, labels=labels, autopct='%1.1f%%')
+def _render_result(df, tool: str, save_full: bool = True) -> str:
+    """
+    Renders a result table within the tool's character budget.
+
+    When rows or columns had to be dropped and save_full is set, the whole
+    table is written to RESULTS_DIR as Parquet and registered as an artifact.
+    """
+    text, truncated = shape_frame(
+        df,
+        RESULT_BUDGETS.get(tool, RESULT_MAX_CHARS),
+        max_rows=RESULT_MAX_ROWS,
+        max_columns=RESULT_MAX_COLUMNS,
+        decimals=RESULT_DECIMALS,
+        style=RESULT_STYLE,
+    )
+    if not (truncated and save_full):
+        return text
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    call_id = _artifacts.new_call_id()
+    path = os.path.join(RESULTS_DIR, f"{tool}_{call_id}.parquet")
+    try:
+        table_io.write_table(full_frame(df), path, "parquet")
+    except Exception as e:  # e.g. mixed-type columns Parquet can't store
+        logger.warning("Could not save the full %s result: %s", tool, e)
+        return text
+    record = _artifacts.register(path, call_id, tool)
+    _prune_results()
+    return text + (
+        f"\nFull result ({len(df):,} rows) saved to {record['filename']} - "
+        "use read_csv, analyze_data or query_sql on it."
+    )
+
+
+def _prune_results():
+    """Removes saved full results beyond RESULTS_MAX_COUNT or older than RESULTS_MAX_AGE_HOURS."""
+    entries = []
+    with os.scandir(RESULTS_DIR) as it:
+        for entry in it:
+            if entry.is_file():
+                entries.append((entry.stat().st_mtime, entry.path))
+
+    cutoff = time.time() - RESULTS_MAX_AGE_HOURS * 3600
+    for i, (mtime, path) in enumerate(sorted(entries, reverse=True)):
+        if i >= RESULTS_MAX_COUNT or mtime < cutoff:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _load_frame(data: str):
+    """
+    DataFrame for a tool's `data` argument: a dataset handle, a table file in
+    the output directory (CSV, gzip CSV, Parquet, Feather) or a JSON array/object.
+
+    Raises:
+        KeyError: Unknown dataset handle
+        ValueError: Invalid JSON (json.JSONDecodeError) or unsupported JSON value
+    """
+    import pandas as pd
+
+    if is_handle(data):
+        return _datasets.load(data)
+
+    name = data.strip()
+    if table_io.table_format(name) and os.path.exists(os.path.join(OUTPUT_DIR, name)):
+        return table_io.read_table(os.path.join(OUTPUT_DIR, name))
+
+    data_dict = json.loads(data)
+    if not isinstance(data_dict, (list, dict)):
+        raise ValueError("Data must be a JSON array or object")
+    return pd.DataFrame(data_dict)
+
+
+# analyze_data operations; a pipeline stage starts with "name:" or a bare operation name
+_OPERATIONS = ('describe', 'correlation', 'filter', 'groupby', 'sort', 'top', 'select')
+_STAGE_START = re.compile(r"\s*(\w+)\s*(:|$)")
+
+# Syntax allowed in filter expressions: columns, constants, comparisons, boolean and
+# arithmetic operators. No attribute access, calls, subscripts or @variables - the
+# query runs in the server process, not in a sandbox worker
+_FILTER_NODES = (
+    ast.Expression, ast.Name, ast.Load, ast.Constant, ast.List, ast.Tuple,
+    ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.Invert, ast.USub, ast.UAdd,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.BitAnd, ast.BitOr, ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+    ast.In, ast.NotIn,
+)
+
+# groupby aggregations: pandas names plus quantiles written as p50, p90, p99, ...
+_GROUPBY_AGGREGATIONS = ('sum', 'mean', 'count', 'min', 'max', 'median', 'std', 'nunique')
+
+
+def _check_columns(df, columns):
+    missing = [column for column in columns if column not in df.columns]
+    if missing:
+        raise ValueError(f"Column '{missing[0]}' not found in data. Available: {list(df.columns)}")
+
+
+def _split_names(text: str) -> list:
+    return [name.strip() for name in text.split(',') if name.strip()]
 
-        elif chart_type == 'hist':
-            plt.hist(chart_data.get('values', []), bins=chart_data.get('bins', 10))
 
+def _groupby(df, spec: str):
+    """
+    groupby:keys[:values[:aggs]] - keys/values/aggs are comma-separated.
+
+    Without values every numeric column is summed.
+    """
+    parts = spec.split(':')
+    keys = _split_names(parts[0])
+    _check_columns(df, keys)
+    key_names = ", ".join(f"'{key}'" for key in keys)
+    if len(parts) == 1:
+        return df.groupby(keys).sum(numeric_only=True), f"Grouped by {key_names} (sum)"
+
+    values = _split_names(parts[1])
+    aggs = _split_names(parts[2]) if len(parts) > 2 else ['sum']
+    _check_columns(df, values)
+
+    grouped = df.groupby(keys)[values]
+    columns = {}
+    for agg in aggs:
+        if re.fullmatch(r"p\d{1,2}", agg):
+            table = grouped.quantile(int(agg[1:]) / 100)
+        elif agg in _GROUPBY_AGGREGATIONS:
+            table = grouped.agg(agg)
         else:
-            return f"Error: Unsupported chart type '{chart_type}'. Use: line, bar, scatter, pie, hist"
+            raise ValueError(f"Unknown aggregation '{agg}'. Use: {', '.join(_GROUPBY_AGGREGATIONS)}, p50, p90, ...")
+        for value in values:
+            columns[f"{value}_{agg}"] = table[value]
 
-        # Set labels and title
-        plt.title(title, fontsize=14, fontweight='bold')
-        if x_label:
-            plt.xlabel(x_label)
-        if y_label:
-            plt.ylabel(y_label)
+    import pandas as pd
+    return pd.DataFrame(columns), f"Grouped by {key_names} ({', '.join(columns)})"
 
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
 
-        # Save figure
-        output_path = os.path.join(OUTPUT_DIR, filename)
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
+def _check_filter(df, expression: str):
+    """
+    Rejects filter expressions that could do more than compare columns and constants.
 
-        return f"""Visualization created successfully!
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Chart Type:     {chart_type}
-Title:          {title}
-Filename:       {filename}
-Location:       {output_path}
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
+    Raises:
+        ValueError: Disallowed syntax or unknown column
+    """
+    # `quoted column names` are checked separately; parse them as plain names
+    quoted = re.findall(r"`([^`]*)`", expression)
+    try:
+        tree = ast.parse(re.sub(r"`[^`]*`", "_quoted_column", expression), mode="eval")
+    except SyntaxError:
+        raise ValueError(f"Invalid filter expression '{expression}' "
+                         "(use column names, constants, comparisons, and/or/not)")
+
+    names = set(quoted)
+    for node in ast.walk(tree):
+        if not isinstance(node, _FILTER_NODES):
+            raise ValueError(f"Filter expressions can only compare columns and constants "
+                             f"({type(node).__name__} is not allowed): '{expression}'")
+        if isinstance(node, ast.Name) and node.id != "_quoted_column":
+            names.add(node.id)
+
+    known = {str(column) for column in df.columns} | {name for name in df.index.names if name} | {"index"}
+    _check_columns(df, sorted(names - known))
+
+
+def _split_pipeline(operation: str) -> list:
+    """
+    Splits "op | op | ..." into stages.
+
+    Text after a '|' is a new stage only if its first token is followed by ':' or is a
+    whole operation name (e.g. "describe"); otherwise the '|' belongs to the current
+    stage - "or" in a filter expression, even on columns named like an operation.
+    """
+    stages = []
+    for part in operation.split('|'):
+        match = _STAGE_START.match(part)
+        if not stages or (match and (match.group(2) == ':' or match.group(1) in _OPERATIONS)):
+            stages.append(part)
+        else:
+            stages[-1] += '|' + part
+    return [stage for stage in stages if stage.strip()]
+
+
+def _apply_operation(df, operation: str):
+    """
+    Applies one analysis operation to a DataFrame.
+
+    Returns:
+        tuple: (resulting DataFrame, description for the output)
+
+    Raises:
+        ValueError: Unknown operation, missing column or invalid expression
+    """
+    name, _, arg = operation.partition(':')
+    name, arg = name.strip(), arg.strip()
+
+    if name == 'describe':
+        return df.describe(), "Statistical Summary"
+
+    if name == 'correlation':
+        numeric_cols = df.select_dtypes(include=['number']).columns
+        if len(numeric_cols) == 0:
+            raise ValueError("No numeric columns found for correlation")
+        return df[numeric_cols].corr(), "Correlation Matrix"
+
+    if name == 'filter':
+        _check_filter(df, arg)
+        # Vectorized with numexpr when it is installed; no access to Python variables
+        try:
+            filtered = df.query(arg, local_dict={}, global_dict={})
+        except Exception as e:
+            raise ValueError(f"Invalid filter expression '{arg}': {e}")
+        return filtered, f"Filtered by '{arg}'"
+
+    if name == 'groupby':
+        return _groupby(df, arg)
+
+    if name == 'sort':
+        column, _, order = arg.partition(':')
+        _check_columns(df, [column])
+        ascending = order.strip() == 'asc'
+        return df.sort_values(by=column, ascending=ascending), \
+            f"Sorted by '{column}' ({'ascending' if ascending else 'descending'})"
+
+    if name == 'top':
+        count, _, column = arg.partition(':')
+        if not count.isdigit():
+            raise ValueError(f"top needs a row count, e.g. 'top:10' or 'top:10:column' (got '{arg}')")
+        if column:
+            _check_columns(df, [column])
+            return df.nlargest(int(count), column), f"Top {count} by '{column}'"
+        return df.head(int(count)), f"First {count} rows"
+
+    if name == 'select':
+        columns = _split_names(arg)
+        _check_columns(df, columns)
+        return df[columns], f"Columns {columns}"
+
+    raise ValueError(f"Unknown operation '{operation.strip()}'")
+
+
+def _analyze_data(data: str, operation: str) -> str:
+    """Synchronous body of analyze_data, run in a thread to keep the event loop free."""
+    try:
+        # Dataset handle or JSON data
+        df = _load_frame(data)
+
+        operations = _split_pipeline(operation)
+        if not operations:
+            return "Error: No operation given"
+
+        # Run the whole pipeline on the one parsed DataFrame
+        steps = []
+        label = ""
+        for op in operations:
+            rows_before = len(df)
+            df, label = _apply_operation(df, op)
+            steps.append(f"  {len(steps) + 1}. {op.strip()}  ({rows_before:,} → {len(df):,} rows)")
+
+        result = "Data Analysis Results\n"
+        result += "=" * 50 + "\n\n"
+        if len(operations) > 1:
+            result += "Pipeline:\n" + "\n".join(steps) + "\n\n"
+        result += f"{label}:\n"
+        result += _render_result(df, "analyze_data") + "\n"
+
+        result += "\n" + "=" * 50
+        return result
 
     except json.JSONDecodeError:
-        return "Error: Invalid JSON data format. Please provide valid JSON string."
+        return "Error: Invalid JSON data format"
+    except KeyError as e:
+        return f"Error: {e.args[0]}"
+    except ValueError as e:
+        return f"Error: {e}"
     except Exception as e:
-        return f"Error creating visualization: {str(e)}\n{traceback.format_exc()}"
+        return f"Error analyzing data: {str(e)}\n{traceback.format_exc()}"
 
 
 @mcp.tool()
@@ -298,13 +1314,20 @@ async def analyze_data(data: str, operation: str) -> str:
     Analyzes data using pandas and returns statistical results.
 
     Args:
-        data (str): JSON string containing data (e.g., '[{"name": "A", "value": 10}, ...]')
-        operation (str): Analysis operation:
+        data (str): Dataset handle from load_dataset (e.g., "ds_1a2b3c4d"), a file in the
+            output directory (.csv, .csv.gz, .parquet, .feather) or JSON string
+            containing data (e.g., '[{"name": "A", "value": 10}, ...]')
+        operation (str): Analysis operation, or several chained with '|':
             - 'describe': Statistical summary
-            - 'groupby:column': Group by column and aggregate
-            - 'sort:column': Sort by column
-            - 'filter:condition': Filter rows (e.g., 'value > 10')
             - 'correlation': Correlation matrix
+            - 'filter:condition': Filter rows (e.g., 'value > 10 and region == "US"');
+              columns, constants, comparisons, and/or/not and arithmetic only
+            - 'groupby:column': Group by column and sum numeric columns
+            - 'groupby:keys:values:aggs': Aggregate value columns per key
+              (aggs: sum, mean, count, min, max, median, std, nunique, p50, p90, ...)
+            - 'sort:column' / 'sort:column:asc': Sort (descending by default)
+            - 'top:n' / 'top:n:column': First n rows / n largest by column
+            - 'select:col1,col2': Keep only these columns
 
     Returns:
         str: Analysis results
@@ -313,143 +1336,558 @@ async def analyze_data(data: str, operation: str) -> str:
         >>> analyze_data('[{"product": "iPhone 17", "sales": 1000}, {"product": "iPhone 16", "sales": 800}]', 'describe')
 
         >>> analyze_data('[{"region": "US", "sales": 500}, {"region": "EU", "sales": 300}]', 'groupby:region')
+
+        >>> analyze_data("ds_1a2b3c4d", "describe")
+
+        >>> analyze_data("ds_1a2b3c4d", "filter:price > 100 | groupby:region:sales:sum,mean,p90 | top:5:sales_sum")
     """
-    try:
-        import pandas as pd
+    return await asyncio.to_thread(_analyze_data, data, operation)
 
-        # Parse data
-        data_dict = json.loads(data)
 
-        # Create DataFrame
-        if isinstance(data_dict, list):
-            df = pd.DataFrame(data_dict)
-        elif isinstance(data_dict, dict):
-            df = pd.DataFrame(data_dict)
-        else:
-            return "Error: Data must be a JSON array or object"
+def _table_metadata(filepath: str) -> dict:
+    """
+    Shape, inferred column types and preview of a table file.
 
-        # Perform operation
-        result = "Data Analysis Results\n"
-        result += "=" * 50 + "\n\n"
+    Only the first CSV_SNIFF_ROWS rows are parsed; rows are counted with a
+    streaming scan (CSV) or from file metadata (Parquet/Feather). Results are
+    cached by (path, mtime, size).
+    """
+    mtime, size = table_io.signature(filepath)
+    key = (os.path.abspath(filepath), mtime, size)
+    if key in _table_metadata_cache:
+        return _table_metadata_cache[key]
+
+    sample = table_io.read_head(filepath, CSV_SNIFF_ROWS)
+    metadata = {
+        "format": table_io.table_format(filepath),
+        "rows": table_io.count_rows(filepath),
+        "size": size,
+        "dtypes": {column: str(dtype) for column, dtype in sample.dtypes.items()},
+        "numeric_columns": list(sample.select_dtypes(include=['number']).columns),
+        "preview": sample.head(CSV_PREVIEW_ROWS),
+    }
+
+    if len(_table_metadata_cache) >= CSV_METADATA_CACHE_SIZE:
+        _table_metadata_cache.pop(next(iter(_table_metadata_cache)))
+    _table_metadata_cache[key] = metadata
+    return metadata
+
+
+def _table_chunks(filepath: str, columns: list):
+    """Reads only `columns` of a table file, CSV_CHUNK_ROWS rows at a time."""
+    return table_io.iter_chunks(filepath, columns, CSV_CHUNK_ROWS)
+
+
+def _chunked_summary(filepath: str, columns: list) -> str:
+    """count/mean/std/min/max of numeric columns in bounded memory (Chan's parallel variance)."""
+    import numpy as np
+    import pandas as pd
+
+    n = np.zeros(len(columns))
+    mean = np.zeros(len(columns))
+    m2 = np.zeros(len(columns))
+    low = np.full(len(columns), np.nan)
+    high = np.full(len(columns), np.nan)
+
+    for chunk in _table_chunks(filepath, columns):
+        chunk = chunk[columns].apply(pd.to_numeric, errors='coerce')
+        n_b = chunk.count().to_numpy(dtype=float)
+        mean_b = np.divide(chunk.sum().to_numpy(dtype=float), n_b, out=np.zeros_like(n_b), where=n_b > 0)
+        m2_b = ((chunk - mean_b) ** 2).sum().to_numpy(dtype=float)
+
+        total = n + n_b
+        delta = mean_b - mean
+        ratio = np.divide(n_b, total, out=np.zeros_like(total), where=total > 0)
+        mean += delta * ratio
+        m2 += m2_b + delta ** 2 * n * ratio
+        n = total
+        low = np.fmin(low, chunk.min().to_numpy(dtype=float))
+        high = np.fmax(high, chunk.max().to_numpy(dtype=float))
+
+    std = np.sqrt(np.divide(m2, n - 1, out=np.full_like(m2, np.nan), where=n > 1))
+    summary = pd.DataFrame(
+        {"count": n.astype(int), "mean": mean, "std": std, "min": low, "max": high},
+        index=pd.Index(columns, name="column"),
+    )
+    return _render_result(summary, "read_csv")
+
+
+def _chunked_value_counts(filepath: str, column: str) -> str:
+    """Most frequent values of one column, counted chunk by chunk."""
+    import pandas as pd
+
+    counts = pd.Series(dtype=float)
+    for chunk in _table_chunks(filepath, [column]):
+        counts = counts.add(chunk[column].value_counts(dropna=False), fill_value=0)
+
+    counts = counts.sort_values(ascending=False).astype(int)
+    counts.index.name = column
+    result = f"Distinct values: {len(counts):,}\n\n"
+    result += f"Values of '{column}' (most frequent first):\n"
+    result += _render_result(counts.rename("count"), "read_csv")
+    return result
+
+
+def _chunked_groupby(filepath: str, key: str, value: str) -> str:
+    """sum/count/mean of `value` per `key`, aggregated chunk by chunk."""
+    import pandas as pd
+
+    totals = None
+    for chunk in _table_chunks(filepath, [key, value]):
+        values = pd.to_numeric(chunk[value], errors='coerce')
+        partial = values.groupby(chunk[key]).agg(['sum', 'count'])
+        totals = partial if totals is None else totals.add(partial, fill_value=0)
+
+    if totals is None:
+        return "No rows."
+    totals['count'] = totals['count'].astype(int)
+    totals['mean'] = totals['sum'] / totals['count']
+    totals = totals.sort_values('sum', ascending=False)
+
+    result = f"Groups: {len(totals):,}\n\n"
+    result += f"'{value}' by '{key}' (largest sum first):\n"
+    result += _render_result(totals, "read_csv")
+    return result
+
+
+def _read_csv(filename: str, mode: str = "preview") -> str:
+    """Synchronous body of read_csv, run in a thread to keep the event loop free."""
+    try:
+        filepath = os.path.join(OUTPUT_DIR, filename)
+        if not os.path.exists(filepath):
+            return f"Error: File '{filename}' not found in {OUTPUT_DIR}"
+        if table_io.table_format(filepath) is None:
+            return f"Error: Unsupported file type '{filename}'. Use: .csv, .csv.gz, .parquet, .feather, .arrow"
 
-        if operation == 'describe':
-            result += "Statistical Summary:\n"
-            result += str(df.describe()) + "\n"
+        metadata = _table_metadata(filepath)
+        columns = list(metadata["dtypes"])
 
-        elif operation.startswith('groupby:'):
-            column = operation.split(':')[1]
-            if column in df.columns:
-                grouped = df.groupby(column).sum()
-                result += f"Grouped by '{column}':\n"
-                result += str(grouped) + "\n"
-            else:
-                return f"Error: Column '{column}' not found in data"
-
-        elif operation.startswith('sort:'):
-            column = operation.split(':')[1]
-            if column in df.columns:
-                sorted_df = df.sort_values(by=column, ascending=False)
-                result += f"Sorted by '{column}' (descending):\n"
-                result += str(sorted_df) + "\n"
-            else:
-                return f"Error: Column '{column}' not found in data"
-
-        elif operation == 'correlation':
-            numeric_cols = df.select_dtypes(include=['number']).columns
-            if len(numeric_cols) > 0:
-                corr_matrix = df[numeric_cols].corr()
-                result += "Correlation Matrix:\n"
-                result += str(corr_matrix) + "\n"
-            else:
-                return "Error: No numeric columns found for correlation"
+        result = f"{metadata['format'].upper()} File: {filename}\n"
+        result += "=" * 50 + "\n"
+        result += f"Rows: {metadata['rows']:,}, Columns: {len(columns)}, Size: {metadata['size'] / 2**20:,.1f} MB\n\n"
+
+        if mode == 'preview':
+            result += f"Column types (inferred from the first {CSV_SNIFF_ROWS:,} rows):\n"
+            result += "\n".join(f"  {column}: {dtype}" for column, dtype in metadata["dtypes"].items()) + "\n\n"
+            result += f"First {CSV_PREVIEW_ROWS} rows:\n"
+            result += _render_result(metadata["preview"], "read_csv", save_full=False) + "\n"
+
+        elif mode == 'summary':
+            if not metadata["numeric_columns"]:
+                return f"Error: No numeric columns found in '{filename}'"
+            result += "Numeric column summary (full file):\n"
+            result += _chunked_summary(filepath, metadata["numeric_columns"]) + "\n"
+
+        elif mode.startswith('value_counts:'):
+            column = mode.split(':', 1)[1]
+            if column not in columns:
+                return f"Error: Column '{column}' not found. Available: {columns}"
+            result += _chunked_value_counts(filepath, column) + "\n"
+
+        elif mode.startswith('groupby:'):
+            parts = mode.split(':')
+            if len(parts) != 3:
+                return "Error: Use 'groupby:key_column:value_column'"
+            key, value = parts[1], parts[2]
+            for column in (key, value):
+                if column not in columns:
+                    return f"Error: Column '{column}' not found. Available: {columns}"
+            result += _chunked_groupby(filepath, key, value) + "\n"
 
         else:
-            return f"Error: Unknown operation '{operation}'"
+            return f"Error: Unknown mode '{mode}'. Use: preview, summary, value_counts:column, groupby:key:value"
 
-        result += "\n" + "=" * 50
+        result += "=" * 50
         return result
 
-    except json.JSONDecodeError:
-        return "Error: Invalid JSON data format"
     except Exception as e:
-        return f"Error analyzing data: {str(e)}\n{traceback.format_exc()}"
+        return f"Error reading CSV: {str(e)}"
 
 
-@mcp.tool()
-async def read_csv(filename: str) -> str:
+@mcp.tool(annotations=READ_ONLY)
+async def read_csv(filename: str, mode: str = "preview") -> str:
     """
     Reads a CSV file and returns its contents as formatted text.
 
+    Also reads gzip CSV (.csv.gz), Parquet and Feather files or dataset
+    directories written by export_data. Large files are never loaded whole:
+    the preview parses only the first rows, and the summary modes stream the
+    file in chunks.
+
     Args:
-        filename (str): Name of CSV file in output directory
+        filename (str): Name of CSV (or .csv.gz/.parquet/.feather) file in output directory
+        mode (str): What to return:
+            - 'preview': Row count, column types and first 10 rows (default)
+            - 'summary': count/mean/std/min/max of numeric columns over the whole file
+            - 'value_counts:column': Most frequent values of a column
+            - 'groupby:key:value': Sum/count/mean of a value column per key
 
     Returns:
         str: CSV file contents
 
     Examples:
         >>> read_csv("sales_data.csv")
+
+        >>> read_csv("sales_data.csv", "groupby:region:sales")
     """
-    try:
-        import pandas as pd
+    return await asyncio.to_thread(_read_csv, filename, mode)
 
-        filepath = os.path.join(OUTPUT_DIR, filename)
-        if not os.path.exists(filepath):
-            return f"Error: File '{filename}' not found in {OUTPUT_DIR}"
 
-        df = pd.read_csv(filepath)
+def _save_to_csv(data: str, filename: str, mode: str = "overwrite") -> str:
+    """Synchronous body of save_to_csv, run in a thread to keep the event loop free."""
+    try:
+        # Dataset handle or JSON data
+        df = _load_frame(data)
 
-        result = f"CSV File: {filename}\n"
-        result += "=" * 50 + "\n"
-        result += f"Rows: {len(df)}, Columns: {len(df.columns)}\n\n"
-        result += "Column names:\n"
-        result += str(list(df.columns)) + "\n\n"
-        result += "First 10 rows:\n"
-        result += str(df.head(10)) + "\n"
-        result += "=" * 50
+        # Save to CSV (append writes only the new rows)
+        filepath = os.path.join(OUTPUT_DIR, filename)
+        fmt = "csv.gz" if filename.lower().endswith(".gz") else "csv"
+        table_io.write_table(df, filepath, fmt, mode)
+        _artifacts.register(filepath, _artifacts.new_call_id(), "save_to_csv")
 
-        return result
+        return f"""Data saved to CSV successfully!
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Filename:       {filename}
+Rows:           {len(df)}{' (appended)' if mode == 'append' else ''}
+Columns:        {len(df.columns)}
+Location:       {filepath}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
+    except KeyError as e:
+        return f"Error: {e.args[0]}"
     except Exception as e:
-        return f"Error reading CSV: {str(e)}"
+        return f"Error saving CSV: {str(e)}"
 
 
 @mcp.tool()
-async def save_to_csv(data: str, filename: str) -> str:
+async def save_to_csv(data: str, filename: str, mode: str = "overwrite") -> str:
     """
     Saves data to a CSV file.
 
     Args:
-        data (str): JSON string containing data
-        filename (str): Output filename (e.g., "results.csv")
+        data (str): Dataset handle from load_dataset or JSON string containing data
+        filename (str): Output filename (e.g., "results.csv", "results.csv.gz" for gzip)
+        mode (str): 'overwrite' (default) or 'append' (adds rows without rewriting the file)
 
     Returns:
         str: Success message with file location
 
     Examples:
         >>> save_to_csv('[{"name": "iPhone 17", "price": 1199}]', 'products.csv')
+
+        >>> save_to_csv('[{"step": 2, "loss": 0.41}]', 'training_log.csv', 'append')
     """
+    return await asyncio.to_thread(_save_to_csv, data, filename, mode)
+
+
+def _export_data(data: str, filename: str, format: str, mode: str, partition_by: str) -> str:
+    """Synchronous body of export_data, run in a thread to keep the event loop free."""
     try:
-        import pandas as pd
+        df = _load_frame(data)
 
-        # Parse data
-        data_dict = json.loads(data)
-        df = pd.DataFrame(data_dict)
+        fmt = (format or table_io.table_format(filename) or "parquet").lower()
+        if fmt not in table_io.FORMAT_EXTENSIONS:
+            return f"Error: Unsupported format '{fmt}'. Use: {', '.join(table_io.FORMAT_EXTENSIONS)}"
+        if table_io.table_format(filename) != fmt:
+            filename = table_io.table_stem(filename) + table_io.FORMAT_EXTENSIONS[fmt]
 
-        # Save to CSV
         filepath = os.path.join(OUTPUT_DIR, filename)
-        df.to_csv(filepath, index=False)
+        written = table_io.write_table(df, filepath, fmt, mode, _split_names(partition_by))
 
-        return f"""Data saved to CSV successfully!
+        call_id = _artifacts.new_call_id()
+        records = [_artifacts.register(path, call_id, "export_data") for path in written]
+        size = sum(record["size"] for record in records)
+
+        return f"""Data exported successfully!
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 Filename:       {filename}
-Rows:           {len(df)}
-Columns:        {len(df.columns)}
+Format:         {fmt}{' (zstd)' if fmt == 'parquet' else ''}
+Mode:           {mode}{f' (partitioned by {partition_by})' if partition_by else ''}
+Rows written:   {len(df):,}
+Files written:  {len(written)} ({size / 1024:,.1f} KB)
 Location:       {filepath}
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
+    except json.JSONDecodeError:
+        return "Error: Invalid JSON data format"
+    except KeyError as e:
+        return f"Error: {e.args[0]}"
+    except ValueError as e:
+        return f"Error: {e}"
     except Exception as e:
-        return f"Error saving CSV: {str(e)}"
+        return f"Error exporting data: {str(e)}"
+
+
+@mcp.tool()
+async def export_data(
+    data: str,
+    filename: str,
+    format: str = "",
+    mode: str = "overwrite",
+    partition_by: str = ""
+) -> str:
+    """
+    Saves data as Parquet (zstd), Feather, gzip CSV or CSV.
+
+    Parquet and Feather files are much smaller and faster to read than CSV.
+    Appending or partitioning writes only the new rows: Parquet/Feather
+    output becomes a directory of part files that read_csv, analyze_data,
+    load_dataset and query_sql read as one table.
+
+    Args:
+        data (str): Dataset handle, file in the output directory or JSON string containing data
+        filename (str): Output filename (e.g., "results.parquet")
+        format (str): 'parquet', 'feather', 'csv.gz' or 'csv' (default: from filename, else parquet)
+        mode (str): 'overwrite' (default) or 'append'
+        partition_by (str): Comma-separated columns for hive-style partitions (parquet/feather only)
+
+    Returns:
+        str: Success message with file location
+
+    Examples:
+        >>> export_data("ds_1a2b3c4d", "sales.parquet")
+
+        >>> export_data('[{"step": 2, "loss": 0.41}]', "training_log.parquet", mode="append")
+
+        >>> export_data("ds_1a2b3c4d", "sales_by_region.parquet", partition_by="region")
+    """
+    return await asyncio.to_thread(_export_data, data, filename, format, mode, partition_by)
+
+
+def _load_dataset(source: str, name: str) -> str:
+    """Synchronous body of load_dataset, run in a thread to keep the event loop free."""
+    try:
+        stripped = source.strip()
+        if stripped.startswith(('[', '{')):
+            df = _load_frame(stripped)
+            origin = "json"
+        else:
+            filepath = os.path.join(OUTPUT_DIR, stripped)
+            if not os.path.exists(filepath):
+                return f"Error: File '{stripped}' not found in {OUTPUT_DIR}"
+            df = table_io.read_table(filepath)
+            origin = stripped
+
+        handle = _datasets.save(df, name=name or table_io.table_stem(origin), source=origin)
+        meta = _datasets.info(handle)
+
+        columns = "\n".join(f"  - {column} ({dtype})" for column, dtype in meta["columns"].items())
+        return f"""Dataset loaded successfully!
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Handle:         {handle}
+Name:           {meta['name']}
+Source:         {origin}
+Rows:           {meta['rows']:,}
+Columns:        {len(meta['columns'])}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Column types:
+{columns}
+
+First 5 rows:
+{_render_result(df.head(5), "load_dataset", save_full=False)}
+
+Pass the handle instead of JSON data, e.g. analyze_data("{handle}", "describe")"""
+
+    except json.JSONDecodeError:
+        return "Error: Invalid JSON data format"
+    except ValueError as e:
+        return f"Error: {e}"
+    except Exception as e:
+        return f"Error loading dataset: {str(e)}"
+
+
+@mcp.tool()
+async def load_dataset(source: str, name: str = "") -> str:
+    """
+    Loads data once and returns a short dataset handle for the other tools.
+
+    Pass the handle to analyze_data, save_to_csv and create_visualization
+    instead of sending the same JSON data again. In execute_python use
+    load_dataset("ds_...") to get the DataFrame and save_dataset(df) to create one.
+
+    Args:
+        source (str): File in the output directory (.csv, .csv.gz, .parquet, .feather, .arrow, .json)
+            or a JSON array/object with the data
+        name (str): Optional name shown by list_datasets
+
+    Returns:
+        str: Handle, schema and a preview of the data
+
+    Examples:
+        >>> load_dataset("sales_data.csv")
+
+        >>> load_dataset('[{"region": "US", "sales": 500}, {"region": "EU", "sales": 300}]', "regions")
+    """
+    return await asyncio.to_thread(_load_dataset, source, name)
+
+
+@mcp.tool(annotations=READ_ONLY)
+async def list_datasets() -> str:
+    """
+    Lists the loaded datasets with their handles.
+
+    Returns:
+        str: One line per dataset (handle, name, rows, columns)
+
+    Examples:
+        >>> list_datasets()
+    """
+    datasets = await asyncio.to_thread(_datasets.list)
+    if not datasets:
+        return "No datasets loaded. Use load_dataset to create one."
+
+    lines = [f"Datasets ({len(datasets)})", "=" * 50]
+    for meta in datasets:
+        columns = ", ".join(list(meta["columns"])[:8])
+        if len(meta["columns"]) > 8:
+            columns += ", ..."
+        lines.append(f"{meta['handle']}  {meta['name'] or '-'}  {meta['rows']:,} rows  [{columns}]")
+    return "\n".join(lines)
+
+
+@mcp.tool()
+async def drop_dataset(handle: str) -> str:
+    """
+    Deletes a dataset.
+
+    Args:
+        handle (str): Dataset handle (e.g., "ds_1a2b3c4d")
+
+    Returns:
+        str: Confirmation message
+
+    Examples:
+        >>> drop_dataset("ds_1a2b3c4d")
+    """
+    if not is_handle(handle) or not _datasets.drop(handle):
+        return f"Dataset '{handle}' does not exist."
+    return f"Dataset '{handle}' was deleted."
+
+
+def _sql_table_name(filename: str) -> str:
+    """Table name for a file: the file name without extension, as an SQL identifier."""
+    name = re.sub(r"\W", "_", table_io.table_stem(filename)).lower()
+    return f"t_{name}" if name[:1].isdigit() else name
+
+
+def _sql_tables() -> dict:
+    """table name -> path for the table files and dataset directories in OUTPUT_DIR."""
+    tables = {}
+    for entry in sorted(os.listdir(OUTPUT_DIR)):
+        if table_io.table_format(entry):
+            tables.setdefault(_sql_table_name(entry), os.path.join(OUTPUT_DIR, entry))
+    return tables
+
+
+def _sql_source(path: str) -> str:
+    """DuckDB table function reading a table file or dataset directory (None for Feather)."""
+    fmt = table_io.table_format(path)
+    escaped = path.replace("'", "''")
+    if fmt in ("csv", "csv.gz"):
+        return f"read_csv_auto('{escaped}')"
+    if fmt == "parquet" and os.path.isdir(path):
+        return f"read_parquet('{escaped}/**/*.parquet', hive_partitioning = true)"
+    if fmt == "parquet":
+        return f"read_parquet('{escaped}')"
+    return None
+
+
+def _query_sql(sql: str, max_rows: int) -> str:
+    """Synchronous body of query_sql, run in a thread (DuckDB releases the GIL)."""
+    try:
+        import duckdb
+    except ImportError:
+        return "Error: query_sql needs DuckDB. Install it with: pip install duckdb"
+
+    sql = sql.strip().rstrip(';')
+    if not sql:
+        return "Error: Empty query"
+
+    tables = _sql_tables()
+    con = duckdb.connect()
+    try:
+        # Exactly one SELECT: no COPY/ATTACH/INSTALL/SET, no second statement
+        statements = con.extract_statements(sql)
+        if len(statements) != 1 or statements[0].type != duckdb.StatementType.SELECT:
+            return "Error: query_sql only runs a single SELECT query"
+
+        # DuckDB runs in the server process, not a sandbox worker: it may only read files
+        # in OUTPUT_DIR, and the query cannot change that setting back
+        con.execute("SET allowed_directories = ?", [[os.path.abspath(OUTPUT_DIR) + os.sep]])
+        con.execute("SET enable_external_access = false")
+
+        # Views are lazy: DuckDB only reads the columns and row groups the query needs
+        for name, path in tables.items():
+            source = _sql_source(path)
+            if source:
+                con.execute(f'CREATE VIEW "{name}" AS SELECT * FROM {source}')
+            else:
+                # Feather: scanned through a pyarrow dataset, which also pushes filters down
+                con.register(name, table_io.arrow_dataset(path, "feather"))
+
+        # Dataset handles used in the query are mapped from their Arrow files
+        for handle in set(re.findall(r"\bds_[0-9a-f]{8}\b", sql)):
+            if handle in tables:
+                continue
+            try:
+                con.register(handle, _datasets.arrow_table(handle))
+            except KeyError as e:
+                return f"Error: {e.args[0]}"
+
+        con.execute("SET lock_configuration = true")
+
+        start = time.perf_counter()
+        df = con.sql(statements[0].query).limit(max_rows + 1).df()
+        elapsed = time.perf_counter() - start
+
+    except duckdb.Error as e:
+        available = ", ".join(tables) or "(none)"
+        return f"Error: {e}\n\nAvailable tables: {available}"
+    finally:
+        con.close()
+
+    truncated = len(df) > max_rows
+    df = df.head(max_rows)
+
+    result = "SQL Query Results\n"
+    result += "=" * 50 + "\n"
+    result += f"Rows: {len(df):,}{f' (limited to {max_rows:,})' if truncated else ''}, "
+    result += f"Columns: {len(df.columns)}, Time: {elapsed * 1000:,.0f} ms\n\n"
+    result += _render_result(df, "query_sql") + "\n"
+    result += "=" * 50
+    return result
+
+
+@mcp.tool(annotations=READ_ONLY)
+async def query_sql(sql: str, max_rows: int = SQL_DEFAULT_ROWS) -> str:
+    """
+    Runs a single SELECT query over the table files in the output directory.
+
+    Every CSV, gzip CSV, Parquet or Feather file (or dataset directory written
+    by export_data) is a table named after the file without its extension
+    (sales_2024.csv -> sales_2024); dataset handles (ds_...) can be queried
+    as tables too. Files are scanned by DuckDB without loading them whole,
+    so joins and aggregations over large files are fast. Other statements
+    (COPY, ATTACH, SET, ...) are rejected, and files outside the output
+    directory cannot be read or written.
+
+    Args:
+        sql (str): SELECT query (DuckDB SQL dialect)
+        max_rows (int): Maximum rows returned (default: 100)
+
+    Returns:
+        str: Query results
+
+    Examples:
+        >>> query_sql("SELECT region, SUM(sales) AS total FROM sales GROUP BY region ORDER BY total DESC")
+
+        >>> query_sql("SELECT o.id, c.name FROM orders o JOIN customers c ON o.customer_id = c.id WHERE o.amount > 100")
+    """
+    max_rows = max(1, min(int(max_rows), SQL_MAX_ROWS))
+    return await asyncio.to_thread(_query_sql, sql, max_rows)
 
 
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
+    transport = parse_server_args(mcp)
+    _pool.start()
+    mcp.run(transport=transport)
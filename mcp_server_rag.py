@@ -1,11 +1,11 @@
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import PyMuPDFLoader, DirectoryLoader
-from langchain_community.vectorstores import FAISS
-from langchain_openai import OpenAIEmbeddings
 from mcp.server.fastmcp import FastMCP
+from mcp.types import ToolAnnotations
+from mcp_servers import parse_server_args
 from dotenv import load_dotenv
 from typing import Any
 import os
+import asyncio
+import logging
 
 load_dotenv(override=True)
 
@@ -14,8 +14,12 @@ load_dotenv(override=True)
 if 'OPENAI_BASE_URL' in os.environ:
     del os.environ['OPENAI_BASE_URL']
 
+# 진단 메시지는 stderr로 출력 (stdout은 MCP stdio 통신 채널)
+logger = logging.getLogger(__name__)
+
 # 전역 변수로 retriever 저장 (한 번만 초기화)
 _retriever = None
+_retriever_lock = asyncio.Lock()
 
 def create_retriever() -> Any:
     """
@@ -31,7 +35,12 @@ def create_retriever() -> Any:
     Returns:
         Any: A retriever object that can be used to query the document database
     """
-    
+    # Imported here so the server starts (and lists its tools) without loading FAISS and the loaders
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    from langchain_community.document_loaders import PyMuPDFLoader, DirectoryLoader
+    from langchain_community.vectorstores import FAISS
+    from langchain_openai import OpenAIEmbeddings
+
     # Step 1: Load Documents
     # DirectoryLoader is used to load all PDF files from a directory
     data_dir = os.path.join(os.path.dirname(__file__), "data")
@@ -42,7 +51,7 @@ def create_retriever() -> Any:
         show_progress=False  # stdio 방식에서는 진행률 출력 비활성화
     )
     docs = loader.load()
-    print(f"Loaded {len(docs)} documents from {data_dir}")
+    logger.info("Loaded %d documents from %s", len(docs), data_dir)
     
     # Step 2: Split Documents
     # Recursive splitter divides documents into chunks with some overlap to maintain context
@@ -70,10 +79,11 @@ mcp = FastMCP(
     instructions="A Retriever that can retrieve information from the database.",
     host="0.0.0.0",
     port=8005,
+    log_level=os.getenv("MCP_LOG_LEVEL", "INFO"),
 )
     
     
-@mcp.tool()
+@mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
 async def retrieve(query: str) -> str:
     """
     Retrieves information from the document database based on the query.
@@ -90,16 +100,19 @@ async def retrieve(query: str) -> str:
     global _retriever
 
     # 한 번만 retriever 생성 (캐싱)
-    if _retriever is None:
-        print("Initializing retriever for the first time...")
-        _retriever = create_retriever()
-        print("Retriever initialized successfully!")
+    # 인덱스 생성과 검색은 스레드에서 실행 (다른 도구 호출이 기다리지 않도록)
+    async with _retriever_lock:
+        if _retriever is None:
+            logger.info("Initializing retriever for the first time...")
+            _retriever = await asyncio.to_thread(create_retriever)
+            logger.info("Retriever initialized successfully!")
 
     # Use invoke() method to get relevant documents based on the query
-    retrieved_docs = _retriever.invoke(query)
+    retrieved_docs = await asyncio.to_thread(_retriever.invoke, query)
 
     # Join all document contents with newlines and return as a single string
     return "\n".join([doc.page_content for doc in retrieved_docs])
 
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
\ No newline at end of file
+    transport = parse_server_args(mcp)
+    mcp.run(transport=transport)
\ No newline at end of file
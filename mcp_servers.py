@@ -0,0 +1,249 @@
+"""
+MCP Servers - 서버 목록, transport 설정, 네트워크 모드 실행기
+
+기본(stdio) 모드에서는 에이전트 프로세스마다 서버 프로세스를 직접 띄웁니다
+(FAISS 인덱스, pandas 인터프리터가 에이전트 수만큼 생김).
+네트워크 모드(sse / streamable-http)에서는 서버를 한 번만 띄워 두고
+여러 에이전트(CLI, Streamlit, 배치)가 HTTP로 접속해 같은 서버와 캐시를 공유합니다.
+
+설정:
+- MCP_TRANSPORT: stdio (기본), sse, streamable-http - 서버와 에이전트 모두 사용
+- MCP_SERVER_HOST: 에이전트가 접속할 서버 주소 (기본 127.0.0.1)
+- MCP_COMBINED: 1이면 서버 3개 대신 통합 서버(mcp_server_all.py) 하나를 사용
+
+사용 예:
+    python mcp_servers.py --transport sse          # 3개 서버를 SSE 서비스로 실행
+    MCP_TRANSPORT=sse python agent.py              # 실행 중인 서버에 접속
+
+    python mcp_server_calculator.py --transport streamable-http --port 9006
+    python mcp_servers.py --combined --transport sse   # 통합 서버 하나로 실행
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from dotenv import load_dotenv
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Server name -> script and the port it listens on in network mode
+SERVERS = {
+    "document-retriever": {"script": "mcp_server_rag.py", "port": 8005},
+    "calculator": {"script": "mcp_server_calculator.py", "port": 8006},
+    "code-executor": {"script": "mcp_server_code_executor.py", "port": 8007},
+}
+
+# All toolsets in one process (mcp_server_all.py), used when MCP_COMBINED=1
+COMBINED_SERVER = {
+    "name": "mcp-tools",
+    "script": "mcp_server_all.py",
+    "port": 8008,
+    # Files that define its tools (the mounted toolsets)
+    "sources": ["mcp_server_all.py"] + [server["script"] for server in SERVERS.values()],
+}
+
+TRANSPORTS = ("stdio", "sse", "streamable-http")
+
+# FastMCP transport name -> (langchain-mcp-adapters transport name, URL path)
+NETWORK_TRANSPORTS = {
+    "sse": ("sse", "/sse"),
+    "streamable-http": ("streamable_http", "/mcp"),
+}
+
+# Seconds the launcher waits for a server to accept connections
+STARTUP_TIMEOUT = 120
+
+
+def default_transport() -> str:
+    """Transport from MCP_TRANSPORT (stdio if unset)."""
+    transport = os.getenv("MCP_TRANSPORT", "stdio").strip().lower().replace("_", "-")
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Unknown MCP_TRANSPORT '{transport}'. Use: {', '.join(TRANSPORTS)}")
+    return transport
+
+
+def combined_mode() -> bool:
+    """True if MCP_COMBINED asks for the single combined server."""
+    return os.getenv("MCP_COMBINED", "").strip().lower() in ("1", "true", "yes")
+
+
+def _servers(combined: bool) -> dict:
+    if combined:
+        return {COMBINED_SERVER["name"]: COMBINED_SERVER}
+    return SERVERS
+
+
+def parse_server_args(mcp) -> str:
+    """
+    Parses --transport/--host/--port for a server script and applies host/port to `mcp`.
+
+    Returns:
+        str: Transport to pass to mcp.run()
+    """
+    parser = argparse.ArgumentParser(description=f"{mcp.name} MCP server")
+    parser.add_argument("--transport", choices=TRANSPORTS, default=default_transport(),
+                        help="stdio (default, or MCP_TRANSPORT) or a network transport")
+    parser.add_argument("--host", help=f"Network mode bind address (default {mcp.settings.host})")
+    parser.add_argument("--port", type=int, help=f"Network mode port (default {mcp.settings.port})")
+    parser.add_argument("--check", action="store_true",
+                        help="Health check: load the server, print its tools and exit")
+    args = parser.parse_args()
+
+    if args.check:
+        tools = asyncio.run(mcp.list_tools())
+        print(f"{mcp.name}: {len(tools)} tools ({', '.join(tool.name for tool in tools)})")
+        sys.exit(0)
+
+    if args.host:
+        mcp.settings.host = args.host
+    if args.port:
+        mcp.settings.port = args.port
+    return args.transport
+
+
+def server_connections(transport: str = None, python: str = None, host: str = None,
+                       combined: bool = None) -> dict:
+    """
+    MultiServerMCPClient connection configs for all servers.
+
+    Args:
+        transport: stdio, sse or streamable-http (default: MCP_TRANSPORT)
+        python: Interpreter that runs the servers in stdio mode
+        host: Server address in network mode (default: MCP_SERVER_HOST or 127.0.0.1)
+        combined: Use the single combined server (default: MCP_COMBINED)
+
+    Returns:
+        dict: Server name -> connection config
+    """
+    transport = (transport or default_transport()).replace("_", "-")
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Unknown transport '{transport}'. Use: {', '.join(TRANSPORTS)}")
+    servers = _servers(combined_mode() if combined is None else combined)
+
+    if transport == "stdio":
+        return {
+            name: {
+                "command": python or sys.executable,
+                "args": [f"./{server['script']}", "--transport", "stdio"],
+                "transport": "stdio",
+            }
+            for name, server in servers.items()
+        }
+
+    host = host or os.getenv("MCP_SERVER_HOST", "127.0.0.1")
+    client_transport, path = NETWORK_TRANSPORTS[transport]
+    return {
+        name: {"url": f"http://{host}:{server['port']}{path}", "transport": client_transport}
+        for name, server in servers.items()
+    }
+
+
+def server_sources(combined: bool = None) -> dict:
+    """
+    Files that define each server's tools (used to key the tool manifest cache).
+
+    Args:
+        combined: Use the single combined server (default: MCP_COMBINED)
+
+    Returns:
+        dict: Server name -> absolute file paths
+    """
+    servers = _servers(combined_mode() if combined is None else combined)
+    return {
+        name: [os.path.join(PROJECT_ROOT, path) for path in server.get("sources", [server["script"]])]
+        for name, server in servers.items()
+    }
+
+
+def _wait_for_port(port: int, process: subprocess.Popen) -> bool:
+    """True once the port accepts connections, False if the process exited or the timeout passed."""
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def _stop(processes: dict):
+    for process in processes.values():
+        if process.poll() is None:
+            process.terminate()
+    for process in processes.values():
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main():
+    """Runs the servers as long-lived network services until Ctrl+C."""
+    load_dotenv(os.path.join(PROJECT_ROOT, ".env"), override=True)
+
+    parser = argparse.ArgumentParser(description="Run the MCP servers as shared network services")
+    parser.add_argument("--transport", choices=NETWORK_TRANSPORTS, default=None,
+                        help="sse or streamable-http (default: MCP_TRANSPORT, else sse)")
+    parser.add_argument("--host", default="0.0.0.0", help="Bind address (default 0.0.0.0)")
+    parser.add_argument("--combined", action="store_true", default=None,
+                        help="Run all toolsets in one server (default: MCP_COMBINED)")
+    parser.add_argument("servers", nargs="*", help=f"Servers to run: {', '.join(SERVERS)} (default: all)")
+    args = parser.parse_args()
+
+    servers = _servers(combined_mode() if args.combined is None else args.combined)
+    unknown = [name for name in args.servers if name not in servers]
+    if unknown:
+        parser.error(f"unknown server '{unknown[0]}' (choose from {', '.join(servers)})")
+
+    transport = args.transport or default_transport()
+    if transport == "stdio":
+        transport = "sse"
+    names = args.servers or list(servers)
+
+    print(f"🚀 Starting MCP servers ({transport})...")
+    print("=" * 60)
+
+    processes = {}
+    try:
+        for name in names:
+            server = servers[name]
+            processes[name] = subprocess.Popen(
+                [sys.executable, server["script"], "--transport", transport,
+                 "--host", args.host, "--port", str(server["port"])],
+                cwd=PROJECT_ROOT,
+                start_new_session=True,  # Ctrl+C goes to the launcher, which stops the servers
+            )
+
+        path = NETWORK_TRANSPORTS[transport][1]
+        for name in names:
+            port = servers[name]["port"]
+            if not _wait_for_port(port, processes[name]):
+                print(f"❌ {name} failed to start on port {port}")
+                _stop(processes)
+                sys.exit(1)
+            print(f"✅ {name:20s} http://{args.host}:{port}{path}")
+
+        print("=" * 60)
+        print(f"💡 Connect agents with MCP_TRANSPORT={transport} (Ctrl+C to stop)\n")
+
+        while all(process.poll() is None for process in processes.values()):
+            time.sleep(1)
+        stopped = [name for name, process in processes.items() if process.poll() is not None]
+        print(f"❌ Server exited: {', '.join(stopped)}")
+        _stop(processes)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n👋 Stopping MCP servers...")
+        _stop(processes)
+
+
+if __name__ == "__main__":
+    main()
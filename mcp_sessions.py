@@ -0,0 +1,306 @@
+"""
+MCP Sessions - 에이전트 수명 동안 유지되는 MCP 서버 세션
+
+MultiServerMCPClient.get_tools()가 반환하는 도구는 세션 없이 만들어져서, 도구를
+호출할 때마다 서버 프로세스를 새로 띄우고 handshake를 다시 합니다
+(RAG 서버는 호출마다 create_retriever()로 FAISS 인덱스를 다시 만듦).
+MCPSessionManager는 서버마다 세션을 하나 열어 에이전트가 끝날 때까지 유지합니다.
+- 세션은 전용 백그라운드 스레드의 이벤트 루프에서 실행
+  (CLI, Jupyter, Streamlit처럼 호출하는 쪽의 이벤트 루프가 바뀌어도 세션은 유지)
+- 서버는 동시에 시작
+- 도구 스키마는 manifest(mcp_manifest.py)에 캐시: 캐시가 있는 서버는 list_tools 없이 도구를 등록
+- lazy 모드: 캐시가 있는 서버는 바로 시작하지 않고, 그 서버의 도구가 처음 호출될 때 시작
+- 도구 호출이 연결 오류로 실패하면 세션을 다시 열고 한 번 재시도
+  (요청을 보내기 전에 실패했거나, 서버가 readOnlyHint/idempotentHint로 표시한 도구만 -
+  부수 효과가 있는 도구가 두 번 실행되지 않도록)
+- close() 또는 프로세스 종료 시 세션과 서버 프로세스를 정리
+
+사용 예:
+    manager = MCPSessionManager(connections, manifest_path="output/.mcp_manifest.json",
+                                sources={"calculator": ["mcp_server_calculator.py"]})
+    tools = manager.get_tools(lazy=True)   # 세션에 연결된 LangChain 도구
+    ...
+    manager.close()
+"""
+
+import asyncio
+import atexit
+import logging
+import threading
+
+import anyio
+from langchain_core.tools import StructuredTool, ToolException
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+
+from mcp_manifest import ToolManifest, manifest_key, tool_spec
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a server to start and answer list_tools
+CONNECT_TIMEOUT = 120
+
+# Seconds to wait for a session to close on shutdown
+DISCONNECT_TIMEOUT = 10
+
+# Raised when writing the request to a closed transport - the server never saw the call
+_NOT_SENT_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError)
+
+
+def _retry_safe(tool) -> bool:
+    """True if the MCP tool is annotated read-only or idempotent (safe to call again)."""
+    annotations = tool.annotations
+    return bool(annotations and (annotations.readOnlyHint or annotations.idempotentHint))
+
+
+class _ServerSession:
+    """One long-lived session to an MCP server; all methods run on the manager's loop."""
+
+    def __init__(self, client: MultiServerMCPClient, name: str, on_connect=None):
+        self.client = client
+        self.name = name
+        self.on_connect = on_connect
+        self.session = None
+        self.tools = {}
+        self.retry_safe = set()
+        self._task = None
+        self._stop = None
+        self._lock = None
+
+    @property
+    def connected(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def _hold(self, ready: asyncio.Future):
+        """Keeps the session open until disconnect() (the session must close in the task that opened it)."""
+        try:
+            async with self.client.session(self.name) as session:
+                listed = (await session.list_tools()).tools
+                self.session = session
+                self.tools = {tool.name: convert_mcp_tool_to_langchain_tool(session, tool) for tool in listed}
+                self.retry_safe = {tool.name for tool in listed if _retry_safe(tool)}
+                ready.set_result(None)
+                await self._stop.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning("Session to MCP server '%s' closed: %s", self.name, e)
+        finally:
+            self.session = None
+
+    async def connect(self):
+        """Starts the server and opens the session (no-op if it is already open)."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self.connected:
+                return
+            await self._disconnect()
+
+            loop = asyncio.get_running_loop()
+            ready = loop.create_future()
+            self._stop = asyncio.Event()
+            self._task = loop.create_task(self._hold(ready))
+            try:
+                await asyncio.wait_for(ready, CONNECT_TIMEOUT)
+            except BaseException:
+                await self._disconnect()
+                raise
+            logger.info("Connected to MCP server '%s' (%d tools)", self.name, len(self.tools))
+            if self.on_connect:
+                self.on_connect(self)
+
+    async def _disconnect(self):
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        self._stop.set()
+        try:
+            await asyncio.wait_for(task, DISCONNECT_TIMEOUT)
+        except Exception as e:
+            logger.warning("MCP server '%s' did not shut down cleanly: %s", self.name, e)
+
+    async def reconnect(self, session):
+        """Reopens the session unless another call already replaced `session`."""
+        async with self._lock:
+            if self.session is session:
+                await self._disconnect()
+        await self.connect()
+
+    async def disconnect(self):
+        if self._lock is None:
+            return
+        async with self._lock:
+            await self._disconnect()
+
+    def _tool(self, tool_name: str):
+        if tool_name not in self.tools:
+            raise ToolException(f"Tool '{tool_name}' is not provided by MCP server '{self.name}' anymore")
+        return self.tools[tool_name]
+
+    async def call(self, tool_name: str, arguments: dict):
+        """
+        Calls a tool on the open session (starting the server on first use).
+
+        If the connection failed, reconnects and retries once - but only when the
+        request was never sent or the tool is annotated read-only/idempotent. Other
+        tools may already have run on the server, so their error is raised instead.
+        """
+        await self.connect()
+        session = self.session
+        try:
+            return await self._tool(tool_name).coroutine(**arguments)
+        except ToolException:
+            raise  # the server ran the tool and reported an error
+        except _NOT_SENT_ERRORS as e:
+            logger.warning("MCP server '%s' connection closed before calling '%s' (%r), reconnecting",
+                           self.name, tool_name, e)
+        except Exception as e:
+            if tool_name not in self.retry_safe:
+                raise
+            logger.warning("Call to '%s' on MCP server '%s' failed (%s), reconnecting", tool_name, self.name, e)
+
+        await self.reconnect(session)
+        return await self._tool(tool_name).coroutine(**arguments)
+
+
+class MCPSessionManager:
+    """Holds one MCP session per server for the lifetime of an agent."""
+
+    def __init__(self, connections: dict, manifest_path: str = None, sources: dict = None):
+        """
+        Args:
+            connections: Server name -> connection config (same format as MultiServerMCPClient)
+            manifest_path: JSON file caching each server's tool specs (see mcp_manifest.py)
+            sources: Server name -> files defining its tools (part of the cache key)
+        """
+        self.connections = connections
+        self.sources = sources or {}
+        self._manifest = ToolManifest(manifest_path) if manifest_path else None
+        self.client = MultiServerMCPClient(connections)
+        self._servers = {
+            name: _ServerSession(self.client, name, on_connect=self._on_connect) for name in connections
+        }
+        self._closed = False
+
+        # Sessions live on their own loop so they outlive the caller's event loops
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="mcp-sessions", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self, coro, timeout: float = None):
+        """Runs a coroutine on the session loop and waits for its result (from any thread)."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    async def _connect_all(self, servers: list):
+        results = await asyncio.gather(*(server.connect() for server in servers), return_exceptions=True)
+        for server, result in zip(servers, results):
+            if isinstance(result, BaseException):
+                raise RuntimeError(f"Failed to start MCP server '{server.name}': {result}") from result
+
+    async def _disconnect_all(self):
+        await asyncio.gather(*(server.disconnect() for server in self._servers.values()))
+
+    def _wrap(self, server: str, spec: dict) -> StructuredTool:
+        """LangChain tool with the MCP tool's schema that calls it through the held session."""
+        name = spec["name"]
+
+        async def acall(**arguments):
+            future = asyncio.run_coroutine_threadsafe(self._servers[server].call(name, arguments), self._loop)
+            return await asyncio.wrap_future(future)
+
+        def call(**arguments):
+            return self._run(self._servers[server].call(name, arguments))
+
+        return StructuredTool(
+            name=name,
+            description=spec["description"],
+            args_schema=spec["args_schema"],
+            func=call,
+            coroutine=acall,
+            response_format=spec["response_format"],
+            metadata={"mcp_server": server},
+        )
+
+    def _key(self, name: str) -> dict:
+        return manifest_key(self.connections[name], self.sources.get(name, ()))
+
+    def _on_connect(self, server: _ServerSession):
+        """Checks the cached tool specs against the live server and refreshes the manifest if they differ."""
+        if self._manifest is None:
+            return
+        specs = [tool_spec(tool) for tool in server.tools.values()]
+        key = self._key(server.name)
+        cached = self._manifest.get(server.name, key)
+        if cached == specs:
+            return
+        if cached is not None:
+            logger.warning(
+                "Tools of MCP server '%s' differ from the cached manifest; manifest updated "
+                "(new schemas are used from the next agent start)", server.name
+            )
+        try:
+            self._manifest.put(server.name, key, specs)
+        except OSError as e:
+            logger.warning("Could not save MCP tool manifest: %s", e)
+
+    async def _start_in_background(self, servers: list):
+        try:
+            await self._connect_all(servers)
+        except RuntimeError as e:
+            logger.warning("%s (it will be retried on its first tool call)", e)
+
+    def get_tools(self, lazy: bool = False, eager=()) -> list:
+        """
+        Returns the tools of all servers.
+
+        Servers without cached tool specs are started now (concurrently) to list their
+        tools. Servers with cached specs get their tools from the manifest without a
+        list_tools round trip; the specs are checked when the server connects.
+
+        Args:
+            lazy: Servers with cached specs start on their first tool call
+            eager: Server names to start anyway (in the background if their specs are cached)
+
+        Raises:
+            RuntimeError: A server without cached specs failed to start
+        """
+        cached = {}
+        if self._manifest is not None:
+            for name in self._servers:
+                specs = self._manifest.get(name, self._key(name))
+                if specs is not None:
+                    cached[name] = specs
+
+        blocking = [server for name, server in self._servers.items() if name not in cached]
+        background = [
+            server for name, server in self._servers.items()
+            if name in cached and (name in eager or not lazy)
+        ]
+        self._run(self._connect_all(blocking))
+        if background:
+            asyncio.run_coroutine_threadsafe(self._start_in_background(background), self._loop)
+
+        tools = []
+        for name, server in self._servers.items():
+            specs = cached[name] if name in cached else [tool_spec(tool) for tool in server.tools.values()]
+            tools.extend(self._wrap(name, spec) for spec in specs)
+        return tools
+
+    def started(self) -> list:
+        """Names of the servers that are running."""
+        return [name for name, server in self._servers.items() if server.connected]
+
+    def close(self):
+        """Closes all sessions (stopping the stdio server processes) and the session loop."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._run(self._disconnect_all(), timeout=DISCONNECT_TIMEOUT * 2)
+        except Exception as e:
+            logger.warning("Error while closing MCP sessions: %s", e)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
@@ -0,0 +1,132 @@
+"""
+Result Shaping - 도구 결과 표를 크기 제한 안에서 간결하게 렌더링
+
+DataFrame 결과를 그대로 str()로 반환하면 큰 표가 모두 LLM 컨텍스트로 들어갑니다.
+shape_frame()은 다음 순서로 결과를 줄입니다:
+1. 컬럼 수 제한 (앞쪽 컬럼만 표시)
+2. 숫자 반올림
+3. 행 수 제한 (앞/뒤 행만 표시, 가운데 생략)
+4. 문자 수 예산을 넘으면 표시 행 수를 절반씩 줄임
+
+렌더링 형식: markdown (기본), csv, text
+
+사용 예:
+    text, truncated = shape_frame(df, max_chars=4000)
+"""
+
+STYLES = ("markdown", "csv", "text")
+
+# Cell shown in place of the omitted middle rows
+ELLIPSIS = "…"
+
+
+def _prepare(df):
+    """Index becomes regular columns (unless it is an unnamed row number), column names become strings."""
+    import pandas as pd
+
+    if isinstance(df, pd.Series):
+        df = df.to_frame()
+    row_numbers = not any(df.index.names) and pd.api.types.is_integer_dtype(df.index)
+    df = df.reset_index(drop=row_numbers)
+    df.columns = [
+        " / ".join(str(part) for part in column) if isinstance(column, tuple) else str(column)
+        for column in df.columns
+    ]
+    return df
+
+
+def full_frame(df):
+    """The table as shape_frame sees it (index as columns), e.g. for saving the full result."""
+    return _prepare(df)
+
+
+def _round(df, decimals: int):
+    floats = df.select_dtypes(include=["float"]).columns
+    if len(floats):
+        df[floats] = df[floats].round(decimals)
+    return df
+
+
+def _elide(df, rows: int):
+    """First and last rows with a row of ELLIPSIS cells in between."""
+    import pandas as pd
+
+    if len(df) <= rows:
+        return df
+    head = df.head(rows - rows // 2).astype(object)
+    tail = df.tail(rows // 2).astype(object)
+    gap = pd.DataFrame([[ELLIPSIS] * len(df.columns)], columns=df.columns)
+    return pd.concat([head, gap, tail], ignore_index=True)
+
+
+def _cell(value) -> str:
+    import pandas as pd
+
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    return str(value).replace("|", "\\|").replace("\n", " ")
+
+
+def render(df, style: str = "markdown") -> str:
+    """Renders a DataFrame without its index as markdown, CSV or plain text."""
+    if style == "csv":
+        return df.to_csv(index=False).rstrip("\n")
+    if style == "text":
+        return df.to_string(index=False)
+
+    lines = [
+        "| " + " | ".join(_cell(column) for column in df.columns) + " |",
+        "|" + "|".join("---" for _ in df.columns) + "|",
+    ]
+    for row in df.itertuples(index=False, name=None):
+        lines.append("| " + " | ".join(_cell(value) for value in row) + " |")
+    return "\n".join(lines)
+
+
+def shape_frame(df, max_chars: int, max_rows: int = 40, max_columns: int = 20,
+                decimals: int = 4, style: str = "markdown"):
+    """
+    Renders a result table within a character budget.
+
+    Args:
+        df: DataFrame or Series
+        max_chars: Character budget for the rendered table (notes included)
+        max_rows: Rows shown at most (first and last rows, middle elided)
+        max_columns: Columns shown at most
+        decimals: Floats are rounded to this many decimals
+        style: "markdown", "csv" or "text"
+
+    Returns:
+        tuple: (text, truncated) - truncated is True if rows, columns or
+        characters were dropped
+    """
+    df = _prepare(df)
+    total_rows, total_columns = df.shape
+
+    notes = []
+    if total_columns > max_columns:
+        df = df.iloc[:, :max_columns]
+        notes.append(f"{total_columns - max_columns} more columns not shown")
+    df = _round(df, decimals)
+
+    def with_notes(text, rows, cut=False):
+        row_notes = [f"showing {rows} of {total_rows:,} rows"] if rows < total_rows else []
+        all_notes = row_notes + notes + (["output cut at the character limit"] if cut else [])
+        return text + (f"\n({'; '.join(all_notes)})" if all_notes else "")
+
+    rows = min(total_rows, max_rows)
+    while True:
+        text = render(_elide(df, rows), style)
+        shaped = with_notes(text, rows)
+        if len(shaped) <= max_chars or rows <= 2:
+            break
+        rows //= 2
+
+    truncated = bool(notes) or rows < total_rows
+    if len(shaped) > max_chars:
+        # Cut at a line break, leaving room for the notes
+        room = max_chars - (len(with_notes("", rows, cut=True)))
+        text = text[:max(room, 0)].rsplit("\n", 1)[0]
+        shaped = with_notes(text, rows, cut=True)
+        truncated = True
+    return shaped, truncated
@@ -0,0 +1,258 @@
+"""
+Table I/O - 표 형식 파일 읽기/쓰기 (CSV, gzip CSV, Parquet, Feather)
+
+파일 확장자로 형식을 판별하고, 형식에 관계없이 같은 방식으로 읽고 씁니다.
+- CSV / gzip CSV: pandas
+- Parquet / Feather: pyarrow.dataset (단일 파일 또는 part 파일이 담긴 디렉토리)
+- append / partition_by 쓰기는 Parquet·Feather에서 디렉토리 데이터셋으로 저장
+  (예: results.parquet/part-....parquet, results.parquet/region=US/part-....parquet)
+
+사용 예:
+    fmt = table_format("results.parquet")        # "parquet"
+    written = write_table(df, path, fmt, mode="append")
+    df = read_table(path)
+"""
+
+import csv
+import gzip
+import io
+import os
+import shutil
+import uuid
+
+# Extensions checked in order, so ".csv.gz" is matched before ".csv"
+TABLE_EXTENSIONS = (
+    (".csv.gz", "csv.gz"),
+    (".csv", "csv"),
+    (".parquet", "parquet"),
+    (".feather", "feather"),
+    (".arrow", "feather"),
+)
+
+# Extension used for new files of each format
+FORMAT_EXTENSIONS = {"csv": ".csv", "csv.gz": ".csv.gz", "parquet": ".parquet", "feather": ".feather"}
+
+WRITE_MODES = ("overwrite", "append")
+
+
+def table_format(path: str):
+    """Format of a table file or dataset directory from its name ("csv", "csv.gz", "parquet", "feather"), or None."""
+    name = path.rstrip("/\\").lower()
+    for ext, fmt in TABLE_EXTENSIONS:
+        if name.endswith(ext):
+            return fmt
+    return None
+
+
+def table_stem(filename: str) -> str:
+    """File name without its table extension ("sales.csv.gz" -> "sales")."""
+    name = filename.rstrip("/\\")
+    for ext, _ in TABLE_EXTENSIONS:
+        if name.lower().endswith(ext):
+            return name[:-len(ext)]
+    return os.path.splitext(name)[0]
+
+
+def arrow_dataset(path: str, fmt: str):
+    """pyarrow Dataset over a Parquet/Feather file or a (hive-partitioned) directory of parts."""
+    import pyarrow.dataset as ds
+    return ds.dataset(path, format=fmt, partitioning="hive" if os.path.isdir(path) else None)
+
+
+def read_table(path: str):
+    """
+    Reads a whole table file into a DataFrame.
+
+    Raises:
+        ValueError: Unsupported file type
+    """
+    import pandas as pd
+
+    fmt = table_format(path)
+    if fmt in ("csv", "csv.gz"):
+        return pd.read_csv(path)
+    if fmt in ("parquet", "feather"):
+        return arrow_dataset(path, fmt).to_table().to_pandas()
+    if path.lower().endswith(".json"):
+        return pd.read_json(path)
+    raise ValueError(
+        f"Unsupported file type '{os.path.basename(path)}'. Use: .csv, .csv.gz, .parquet, .feather, .arrow, .json"
+    )
+
+
+def read_head(path: str, rows: int):
+    """First `rows` rows of a table (only those rows are parsed)."""
+    import pandas as pd
+
+    fmt = table_format(path)
+    if fmt in ("csv", "csv.gz"):
+        return pd.read_csv(path, nrows=rows)
+    return arrow_dataset(path, fmt).head(rows).to_pandas()
+
+
+def _open_binary(path: str, fmt: str):
+    return gzip.open(path, "rb") if fmt == "csv.gz" else open(path, "rb")
+
+
+def count_rows(path: str) -> int:
+    """
+    Number of data rows.
+
+    CSV files are scanned for newlines in 1 MB blocks (header excluded); if the
+    file contains quotes, a quoted field may span lines, so the rows are counted
+    with the csv module instead. Parquet row counts come from the file metadata.
+    """
+    fmt = table_format(path)
+    if fmt in ("parquet", "feather"):
+        return arrow_dataset(path, fmt).count_rows()
+
+    lines = 0
+    last = b"\n"
+    with _open_binary(path, fmt) as f:
+        while block := f.read(1 << 20):
+            if b'"' in block:
+                return _count_csv_records(path, fmt)
+            lines += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":  # no newline after the last row
+        lines += 1
+    return max(lines - 1, 0)
+
+
+def _count_csv_records(path: str, fmt: str) -> int:
+    """Data rows counted by the CSV parser (blank lines skipped, like pandas)."""
+    with _open_binary(path, fmt) as f:
+        text = io.TextIOWrapper(f, encoding="utf-8", errors="replace", newline="")
+        records = sum(1 for row in csv.reader(text) if row)
+    return max(records - 1, 0)
+
+
+def iter_chunks(path: str, columns: list, chunk_rows: int):
+    """Yields DataFrames with only `columns`, at most `chunk_rows` rows each."""
+    import pandas as pd
+
+    fmt = table_format(path)
+    if fmt in ("csv", "csv.gz"):
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunk_rows)
+        return
+    for batch in arrow_dataset(path, fmt).to_batches(columns=columns, batch_size=chunk_rows):
+        yield batch.to_pandas()
+
+
+def signature(path: str) -> tuple:
+    """(mtime_ns, size) of a file, or the latest mtime and total size of a dataset directory."""
+    if not os.path.isdir(path):
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    mtime, size = os.stat(path).st_mtime_ns, 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            stat = os.stat(os.path.join(root, name))
+            mtime, size = max(mtime, stat.st_mtime_ns), size + stat.st_size
+    return mtime, size
+
+
+def _write_csv(df, path: str, fmt: str, mode: str) -> list:
+    import pandas as pd
+
+    compression = "gzip" if fmt == "csv.gz" else None
+    if mode == "append" and os.path.exists(path):
+        existing = list(pd.read_csv(path, nrows=0).columns)
+        if existing != [str(column) for column in df.columns]:
+            raise ValueError(f"Columns {list(df.columns)} don't match the existing file's columns {existing}")
+        # Appends rows only (a gzip file gets a new gzip member)
+        df.to_csv(path, mode="a", header=False, index=False, compression=compression)
+    else:
+        df.to_csv(path, index=False, compression=compression)
+    return [path]
+
+
+def _write_arrow(df, path: str, fmt: str, mode: str, partition_by: list) -> list:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    if mode == "overwrite" and not partition_by:
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+            pq.write_table(table, path, compression="zstd")
+        else:
+            from pyarrow import feather
+            feather.write_feather(table, path)
+        return [path]
+
+    # append / partitioned writes go to a directory of part files
+    if mode == "overwrite" and os.path.isdir(path):
+        shutil.rmtree(path)
+    elif mode == "overwrite" and os.path.isfile(path):
+        os.remove(path)
+    elif os.path.isfile(path):
+        # Turn an existing single file into the first part of the dataset
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        os.replace(path, tmp_path)
+        os.makedirs(path)
+        os.replace(tmp_path, os.path.join(path, f"part-0{FORMAT_EXTENSIONS[fmt]}"))
+
+    if os.path.isdir(path) and os.listdir(path):
+        existing = arrow_dataset(path, fmt).schema.names
+        if sorted(existing) != sorted(table.schema.names):
+            raise ValueError(f"Columns {table.schema.names} don't match the existing dataset's columns {existing}")
+
+    if fmt == "parquet":
+        file_format = ds.ParquetFileFormat()
+        file_options = file_format.make_write_options(compression="zstd")
+    else:
+        file_format = ds.IpcFileFormat()
+        file_options = file_format.make_write_options()
+
+    written = []
+    ds.write_dataset(
+        table,
+        path,
+        format=file_format,
+        file_options=file_options,
+        partitioning=partition_by or None,
+        partitioning_flavor="hive" if partition_by else None,
+        basename_template=f"part-{uuid.uuid4().hex[:8]}-{{i}}{FORMAT_EXTENSIONS[fmt]}",
+        existing_data_behavior="overwrite_or_ignore",
+        file_visitor=lambda written_file: written.append(written_file.path),
+    )
+    return written
+
+
+def write_table(df, path: str, fmt: str, mode: str = "overwrite", partition_by=()) -> list:
+    """
+    Writes a DataFrame as CSV, gzip CSV, Parquet (zstd) or Feather.
+
+    Args:
+        df: pandas DataFrame
+        path: Target file (or dataset directory for append / partitioned Parquet and Feather)
+        fmt: "csv", "csv.gz", "parquet" or "feather"
+        mode: "overwrite" or "append" (append only writes the new rows)
+        partition_by: Columns to partition by (hive-style directories; Parquet/Feather only)
+
+    Returns:
+        list: Paths of the files written
+
+    Raises:
+        ValueError: Unsupported format/mode, or columns that don't match the existing data
+    """
+    if fmt not in FORMAT_EXTENSIONS:
+        raise ValueError(f"Unsupported format '{fmt}'. Use: {', '.join(FORMAT_EXTENSIONS)}")
+    if mode not in WRITE_MODES:
+        raise ValueError(f"Unknown mode '{mode}'. Use: {', '.join(WRITE_MODES)}")
+
+    partition_by = list(partition_by)
+    missing = [column for column in partition_by if column not in df.columns]
+    if missing:
+        raise ValueError(f"Partition column '{missing[0]}' not found in data. Available: {list(df.columns)}")
+
+    if fmt in ("csv", "csv.gz"):
+        if partition_by:
+            raise ValueError("partition_by needs the parquet or feather format")
+        return _write_csv(df, path, fmt, mode)
+    return _write_arrow(df, path, fmt, mode, partition_by)
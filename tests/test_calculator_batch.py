@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""
+Unit tests for calculate_batch (evaluated in-process, no agent or API key needed)
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add project to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from mcp_server_calculator import _calculate_batch
+
+
+def _rows(output: str) -> list:
+    """Data rows of the result table (between the two separator lines)."""
+    table = output.split("━━━━━━━━━━━━━━━━━━━━━━━━━━━━")[1].strip().splitlines()
+    return [line.split() for line in table[1:]]
+
+
+def test_batch_broadcasts_scalars():
+    output = _calculate_batch("price * rate", json.dumps({"price": [799, 999, 1199], "rate": 1300}))
+    assert [row[-1] for row in _rows(output)] == ["1038700", "1298700", "1558700"]
+    assert "Rows: 3" in output
+
+
+def test_batch_mixed_valid_and_invalid_rows():
+    """Rows that divide by zero become non-finite; the other rows are still computed"""
+    output = _calculate_batch("(new - old) / old * 100", json.dumps({"old": [100, 0, 150], "new": [120, 50, 180]}))
+    assert [row[-1] for row in _rows(output)] == ["20", "inf", "20"]
+    assert "Non-finite results: 1" in output
+    assert "Mean: 20.0000" in output
+
+
+@pytest.mark.parametrize("expression, variables, message", [
+    ("x +", {"x": [1]}, "invalid syntax"),
+    ("x + y", {"x": [1, 2], "y": [1, 2, 3]}, "same length"),
+    ("x", {"x": [[1, 2]]}, "flat list"),
+    ("x * 2", "not json", "Invalid JSON"),
+])
+def test_batch_invalid_input(expression, variables, message):
+    output = _calculate_batch(expression, variables if isinstance(variables, str) else json.dumps(variables))
+    assert output.startswith("Error:") and message in output
+
+
+@pytest.mark.parametrize("expression, variables", [
+    ("().__class__", {"x": [1]}),
+    ("__import__('os').getcwd()", {"x": [1]}),
+    ("x.__class__.__bases__", {"x": [1]}),
+    ("open('x.txt')", {"x": [1]}),
+    ("x", {"__class__": [1]}),
+])
+def test_batch_rejects_unsafe_names(expression, variables):
+    output = _calculate_batch(expression, json.dumps(variables))
+    assert output.startswith("Error:")
+    assert not os.path.exists("x.txt")
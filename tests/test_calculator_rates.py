@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Unit tests for the local exchange rate table and convert_many (no agent or API key needed)
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add project to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import mcp_server_calculator as calculator
+
+RATES = """date,base,quote,rate
+2025-09-01,USD,KRW,1380.0
+2025-09-30,USD,KRW,1400.0
+2025-09-30,USD,KRW,1402.0
+2025-09-30,USD,EUR,0.8
+2025-09-15,JPY,USD,0.0068
+"""
+
+
+@pytest.fixture
+def rates_file(tmp_path, monkeypatch):
+    path = tmp_path / "exchange_rates.csv"
+    path.write_text(RATES)
+    monkeypatch.setattr(calculator, "RATES_FILE", str(path))
+    monkeypatch.setattr(calculator, "_rate_table", None)
+    return path
+
+
+def test_load_rate_table(rates_file):
+    table = calculator.load_rate_table()
+    # Sorted by date; a later row for the same date replaces the earlier one
+    assert table[("USD", "KRW")] == (["2025-09-01", "2025-09-30"], [1380.0, 1402.0])
+    assert set(table) == {("USD", "KRW"), ("USD", "EUR"), ("JPY", "USD")}
+    assert calculator.load_rate_table() is table  # cached until the file changes
+
+
+def test_pair_rate_direct_inverse_and_dates(rates_file):
+    table = calculator.load_rate_table()
+    assert calculator._pair_rate(table, "USD", "KRW", "2025-09-15") == (1380.0, "2025-09-01")
+    assert calculator._pair_rate(table, "USD", "KRW", "2025-12-31") == (1402.0, "2025-09-30")
+    rate, date = calculator._pair_rate(table, "KRW", "USD", "2025-12-31")
+    assert rate == pytest.approx(1 / 1402.0) and date == "2025-09-30"
+    assert calculator._pair_rate(table, "USD", "KRW", "2025-08-31") is None
+    assert calculator._pair_rate(table, "USD", "GBP", "2025-12-31") is None
+
+
+def test_lookup_rate_cross_rate_through_usd(rates_file):
+    rate, date, derivation = calculator.lookup_rate("eur", "krw", "2025-10-01")
+    assert rate == pytest.approx(1402.0 / 0.8)
+    assert date == "2025-09-30" and derivation == "EUR/USD/KRW cross rate"
+
+    rate, date, _ = calculator.lookup_rate("JPY", "KRW", "2025-10-01")
+    assert rate == pytest.approx(0.0068 * 1402.0)
+    assert date == "2025-09-15"  # the older of the two legs
+
+    assert calculator.lookup_rate("KRW", "krw", "2025-10-01")[0] == 1.0
+
+
+def test_lookup_rate_missing_rate_or_date(rates_file):
+    with pytest.raises(LookupError, match="USD/GBP"):
+        calculator.lookup_rate("USD", "GBP", "2025-10-01")
+    with pytest.raises(LookupError, match="on or before 2025-08-01"):
+        calculator.lookup_rate("USD", "KRW", "2025-08-01")
+    with pytest.raises(ValueError):
+        calculator.lookup_rate("USD", "KRW", "30/09/2025")
+
+
+def test_convert_many(rates_file):
+    output = asyncio.run(calculator.convert_many("100, 200.5", "USD", "KRW", "2025-10-01"))
+    assert "1 USD = 1,402.0000 KRW (USD/KRW, 2025-09-30)" in output
+    assert "140,200.00 KRW" in output and "281,101.00 KRW" in output
+    assert "Total:          300.50 USD = 421,301.00 KRW" in output
+
+    assert asyncio.run(calculator.convert_many("100", "USD", "GBP")).startswith("Error: No exchange rate")
+    assert asyncio.run(calculator.convert_many("", "USD", "KRW")).startswith("Error:")
+
+
+def test_set_exchange_rate_is_used_by_later_conversions(rates_file):
+    asyncio.run(calculator.set_exchange_rate("usd", "gbp", 0.75, "2025-10-01"))
+    assert calculator.lookup_rate("USD", "GBP", "2025-10-02")[:2] == (0.75, "2025-10-01")
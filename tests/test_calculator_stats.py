@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Unit tests for the calculator's streaming statistics helpers (no agent or API key needed)
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add project to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from mcp_server_calculator import RunningStats, parse_numbers, percentiles
+
+
+def test_running_stats_matches_numpy_across_chunks():
+    """Merging chunks of different sizes gives the same result as one pass over all values"""
+    rng = np.random.default_rng(0)
+    values = rng.normal(1000, 25, size=10_007)
+
+    stats = RunningStats()
+    for chunk in np.array_split(values, [1, 10, 500, 4000]):
+        stats.update(chunk)
+    stats.update(np.array([]))
+
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(values.mean())
+    assert stats.stdev == pytest.approx(values.std(ddof=1))
+    assert stats.m2 / stats.count == pytest.approx(np.var(values))
+    assert (stats.min, stats.max) == (values.min(), values.max())
+
+
+def test_running_stats_single_value():
+    stats = RunningStats()
+    stats.update(np.array([5.0]))
+    assert (stats.count, stats.mean, stats.stdev) == (1, 5.0, 0.0)
+
+
+def test_percentiles_match_numpy():
+    values = np.random.default_rng(1).random(1001)
+    qs = [0, 25, 50, 90, 99.5, 100]
+    assert percentiles(values.copy(), qs) == pytest.approx(np.percentile(values, qs).tolist())
+
+
+def test_parse_numbers_rejects_partial_input():
+    assert parse_numbers("1, 2.5,3").tolist() == [1.0, 2.5, 3.0]
+    with pytest.raises(ValueError):
+        parse_numbers("10, abc")
+
+
+def test_running_stats_skips_non_finite_values():
+    stats = RunningStats()
+    stats.update(np.array([1.0, np.nan, 2.0, np.inf]))
+    stats.update(np.array([-np.inf, 6.0]))
+
+    assert (stats.count, stats.dropped) == (3, 3)
+    assert (stats.min, stats.max, stats.mean) == (1.0, 6.0, 3.0)
+    assert stats.percentiles([50]) == [2.0]
+
+
+def test_running_stats_percentiles_use_bounded_sample():
+    values = np.random.default_rng(2).normal(50, 10, size=200_000)
+
+    small = RunningStats(sample_size=300_000)
+    small.update(values)
+    assert small.exact
+    assert small.percentiles([25, 50, 75]) == pytest.approx(np.percentile(values, [25, 50, 75]).tolist())
+
+    sampled = RunningStats(sample_size=5_000, seed=0)
+    for chunk in np.array_split(values, 40):
+        sampled.update(chunk)
+    assert not sampled.exact
+    assert len(sampled._sample) == 5_000
+    assert sampled.mean == pytest.approx(values.mean())
+    assert sampled.percentiles([25, 50, 75]) == pytest.approx(np.percentile(values, [25, 50, 75]).tolist(), abs=1.0)
+
+
+def test_statistics_summary_labels_approximate_quantiles(tmp_path, monkeypatch):
+    import mcp_server_calculator as calculator
+
+    (tmp_path / "big.csv").write_text("value\n" + "\n".join(str(i) for i in range(1000)) + "\nnot a number\n")
+    monkeypatch.setattr(calculator, "OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(calculator, "STATS_SAMPLE_SIZE", 100)
+
+    output = calculator._statistics_summary("", "big.csv", "value")
+    assert "Count:      1000" in output
+    assert "(approx.)" in output and "random sample of 100 values" in output
+
+    exact = calculator._statistics_summary("1, 2, 3, nan", "", "")
+    assert "(approx.)" not in exact and "Skipped 1 non-finite" in exact
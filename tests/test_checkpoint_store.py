@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""
+Unit tests for the SQLite conversation history (no agent or API key needed)
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add project to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+pytest.importorskip("langgraph.checkpoint.sqlite")
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.base import empty_checkpoint
+
+from checkpoint_store import ELISION_NOTE, SQLiteCheckpointer, compact_messages
+
+
+def _turn(question: str, call_id: str, result: str) -> list:
+    return [
+        HumanMessage(question),
+        AIMessage("", tool_calls=[{"name": "retrieve", "args": {"query": question}, "id": call_id}]),
+        ToolMessage(result, tool_call_id=call_id, artifact={"rows": 1000}),
+        AIMessage("done"),
+    ]
+
+
+def test_compact_messages_elides_earlier_tool_results_only():
+    messages = _turn("first", "call_1", "x" * 5000) + _turn("second", "call_2", "y" * 5000)
+
+    compacted = compact_messages(messages, max_chars=100)
+
+    earlier, current = compacted[2], compacted[6]
+    assert earlier.tool_call_id == "call_1"
+    assert earlier.content.startswith("x" * 100) and earlier.content.endswith(ELISION_NOTE)
+    assert "4,900 more" in earlier.content
+    assert earlier.artifact is None
+    assert current is messages[6]
+    # Input messages are not modified, and compacting again changes nothing
+    assert messages[2].content == "x" * 5000
+    assert compact_messages(compacted, max_chars=100)[2].content == earlier.content
+
+
+def test_compact_messages_keeps_short_results():
+    messages = _turn("first", "call_1", "short") + [HumanMessage("second")]
+    assert compact_messages(messages, max_chars=100) == messages
+
+
+def test_checkpointer_keeps_latest_checkpoints(tmp_path):
+    saver = SQLiteCheckpointer.open(str(tmp_path / "checkpoints.sqlite"), max_checkpoints=3, tool_chars=50)
+    config = {"configurable": {"thread_id": "t1", "checkpoint_ns": ""}}
+
+    messages = []
+    for i in range(6):
+        messages += _turn(f"question {i}", f"call_{i}", "z" * 1000)
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = {"messages": list(messages)}
+        config = saver.put(config, checkpoint, {"step": i}, {})
+
+    saved = list(saver.list({"configurable": {"thread_id": "t1"}}))
+    assert len(saved) == 3
+    latest = saver.get_tuple({"configurable": {"thread_id": "t1"}}).checkpoint["channel_values"]["messages"]
+    assert [m.tool_call_id for m in latest if m.type == "tool"] == [f"call_{i}" for i in range(6)]
+    assert [len(m.content) < 1000 for m in latest if m.type == "tool"] == [True] * 5 + [False]
+    saver.conn.close()
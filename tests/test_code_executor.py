@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+"""
+Unit tests for the code executor tools (called directly, no agent or API key needed)
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+# Add project to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import mcp_server_code_executor as executor
+
+
+def _close_sessions():
+    for session_id in list(executor._sessions):
+        executor._close_session(session_id)
+
+
+def test_concurrent_first_calls_share_one_session():
+    """Two first calls with the same session_id end up in one worker with both variables"""
+    async def scenario():
+        await asyncio.gather(
+            executor.execute_python("a = 1", session_id="race"),
+            executor.execute_python("b = 2", session_id="race"),
+        )
+        return await executor.list_variables("race")
+
+    try:
+        listing = asyncio.run(scenario())
+        assert list(executor._sessions) == ["race"]
+    finally:
+        _close_sessions()
+
+    assert "a " in listing and "b " in listing
+    # Helpers injected by _safe_globals are not user variables
+    assert "load_dataset" not in listing and "save_dataset" not in listing
+
+
+def test_lttb_keeps_endpoints_and_count():
+    x = np.arange(10_000, dtype=float)
+    y = np.sin(x / 100) + np.random.default_rng(0).normal(0, 0.1, len(x))
+
+    keep = executor._lttb(x, y, 500)
+
+    assert len(keep) == 500
+    assert keep[0] == 0 and keep[-1] == len(x) - 1
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_lttb_keeps_spikes_and_short_series():
+    x = np.arange(1_000, dtype=float)
+    y = np.zeros_like(x)
+    y[437] = 50.0
+    assert 437 in executor._lttb(x, y, 20)
+
+    assert executor._lttb(x[:10], y[:10], 20).tolist() == list(range(10))
+
+
+def test_filter_allows_comparisons_only():
+    import pandas as pd
+
+    df = pd.DataFrame({"value": [1, 20, 30], "region": ["US", "EU", "US"], "unit price": [1, 2, 3]})
+    filtered, _ = executor._apply_operation(df, 'filter:value > 10 and region == "US"')
+    assert filtered["value"].tolist() == [30]
+    filtered, _ = executor._apply_operation(df, "filter:`unit price` >= 2 and region in ['EU']")
+    assert filtered["value"].tolist() == [20]
+
+    for expression in ['@df.to_csv("x.csv") is None', 'value.to_csv("x.csv") is None',
+                       'region.str.len() > 1', 'value[0] > 1', 'missing > 1']:
+        with pytest.raises(ValueError):
+            executor._apply_operation(df, f"filter:{expression}")
+
+
+def test_query_sql_runs_single_select_inside_output_dir(tmp_path, monkeypatch):
+    (tmp_path / "sales.csv").write_text("region,amount\nUS,5\nEU,3\nUS,2\n")
+    monkeypatch.setattr(executor, "OUTPUT_DIR", str(tmp_path))
+    outside = tmp_path.parent / f"{tmp_path.name}_outside.csv"
+
+    result = executor._query_sql("SELECT region, SUM(amount) AS total FROM sales GROUP BY region ORDER BY total DESC", 10)
+    assert "Rows: 2" in result and "| US | 7" in result
+
+    for sql in [
+        f"SELECT 1 AS a) AS q; COPY (SELECT 42 AS x) TO '{outside}'; SELECT * FROM (SELECT 1",
+        f"COPY (SELECT 42 AS x) TO '{tmp_path / 'copy.csv'}'",
+        "SELECT 1; SELECT 2",
+        "SET enable_external_access = true",
+        "SELECT * FROM read_csv_auto('/etc/passwd')",
+    ]:
+        assert executor._query_sql(sql, 10).startswith("Error:"), sql
+    assert not outside.exists()
+    assert sorted(os.listdir(tmp_path)) == ["sales.csv"]
+
+
+def test_bounded_output_keeps_short_output():
+    out = executor.BoundedOutput(100)
+    print("hello", file=out)
+    print("world", file=out)
+    assert out.getvalue() == "hello\nworld\n"
+    assert out.dropped == 0
+
+
+def test_bounded_output_keeps_head_and_tail():
+    out = executor.BoundedOutput(100)
+    for i in range(1000):
+        print(f"line {i:04d}", file=out)
+
+    value = out.getvalue()
+    head, marker, tail = value.partition("\n... [output truncated: ")
+    assert head == "".join(f"line {i:04d}\n" for i in range(3))[:25]
+    assert tail.split("\n", 1)[1] == "".join(f"line {i:04d}\n" for i in range(1000))[-75:]
+    assert marker and f"{10_000 - 100:,} characters omitted" in value
+    assert out.dropped == 10_000 - 100
+
+
+def test_bounded_output_single_write_larger_than_limit():
+    out = executor.BoundedOutput(40)
+    text = "a" * 10 + "b" * 1000 + "c" * 30
+    assert out.write(text) == len(text)
+
+    assert out._head_size == 10 and out._tail_size == 30
+    assert out.getvalue() == "a" * 10 + "\n... [output truncated: 1,000 characters omitted] ...\n" + "c" * 30
+
+
+@pytest.fixture
+def render_dirs(tmp_path, monkeypatch):
+    """Output directory, render cache and artifact index inside tmp_path"""
+    cache_dir = tmp_path / ".render_cache"
+    cache_dir.mkdir()
+    monkeypatch.setattr(executor, "OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(executor, "RENDER_CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(executor, "_artifacts", executor.ArtifactRegistry(str(tmp_path)))
+    return tmp_path
+
+
+def test_render_cache_hit_reuses_stored_file(render_dirs, monkeypatch):
+    data = '{"x": [1, 2, 3], "y": [4, 6, 5]}'
+    first = asyncio.run(executor.create_visualization(data, "line", "Trend", filename="a.png", dpi=50))
+    assert "Render:         new" in first
+    cached = list((render_dirs / ".render_cache").iterdir())
+    assert len(cached) == 1
+
+    async def no_render(*args, **kwargs):
+        raise AssertionError("cache hit must not render again")
+
+    monkeypatch.setattr(executor._pool, "submit", no_render)
+    second = asyncio.run(executor.create_visualization(data, "line", "Trend", filename="b.png", dpi=50))
+    assert "Render:         cached" in second
+    assert (render_dirs / "b.png").read_bytes() == cached[0].read_bytes() == (render_dirs / "a.png").read_bytes()
+
+
+def test_render_cache_key_changes_with_data_and_style():
+    base = ('{"x": [1, 2]}', "line", "Chart", "", "", 10, 6, 300, "png")
+    key = executor._render_cache_key(*base)
+    assert executor._render_cache_key(*base) == key
+    changed = [
+        ('{"x": [1, 3]}',) + base[1:],  # data
+        base[:1] + ("bar",) + base[2:],  # chart type
+        base[:2] + ("Other",) + base[3:],  # title
+        base[:7] + (100, "png"),  # dpi
+        base[:8] + ("svg",),  # format
+    ]
+    keys = {executor._render_cache_key(*parts) for parts in changed}
+    assert key not in keys and len(keys) == len(changed)
+    # Parts are separated, so shifting text between them changes the key
+    assert executor._render_cache_key("ab", "c") != executor._render_cache_key("a", "bc")
+
+
+def test_prune_render_cache_removes_least_recently_used(render_dirs, monkeypatch):
+    cache_dir = render_dirs / ".render_cache"
+    now = time.time()
+    for i in range(10):
+        path = cache_dir / f"{i}.png"
+        path.write_bytes(b"x" * 100_000)
+        os.utime(path, (now - 100 + i, now - 100 + i))
+    monkeypatch.setattr(executor, "RENDER_CACHE_MAX_MB", 350_000 / 2**20)
+
+    executor._prune_render_cache()
+    remaining = sorted(p.name for p in cache_dir.iterdir())
+    assert remaining == ["7.png", "8.png", "9.png"]
+    assert sum(p.stat().st_size for p in cache_dir.iterdir()) <= 350_000
+
+
+DASHBOARD_CHARTS = """[
+    {"chart_type": "bar", "title": "Sales", "data": {"x": ["Q1", "Q2"], "y": [100, 120]}},
+    {"chart_type": "pie", "title": "Share", "data": "{\\"labels\\": [\\"A\\", \\"B\\"], \\"values\\": [60, 40]}"},
+    {"chart_type": "line", "data": {"x": [1, 2, 3], "y": [3, 1, 2]}, "filename": "trend.png"}
+]"""
+
+
+@pytest.fixture
+def inline_pool(render_dirs, monkeypatch):
+    """Runs pool tasks in this process, so they see the patched OUTPUT_DIR"""
+    async def submit(func, *args, timeout=None, cpu_time=None, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:  # reported like a worker would
+            raise executor.TaskError(type(e).__name__, str(e)) from e
+
+    monkeypatch.setattr(executor._pool, "submit", submit)
+    return render_dirs
+
+
+def test_dashboard_grid_layout_writes_one_image(inline_pool):
+    from matplotlib.image import imread
+
+    result = asyncio.run(executor.create_dashboard(DASHBOARD_CHARTS, "Report", columns=2, filename="report.png", dpi=40))
+    assert "Layout:         grid" in result and "report.png (bar, pie, line" in result
+    assert sorted(p.name for p in inline_pool.iterdir() if p.is_file()) == [".artifacts.jsonl", "report.png"]
+
+    # 3 charts in 2 columns -> 2 rows of 6 x 4.5 inch cells
+    height, width = imread(inline_pool / "report.png").shape[:2]
+    assert width / height == pytest.approx(12 / 9, rel=0.15)
+
+    records, _ = executor._artifacts.since(0)
+    assert [(r["filename"], r["tool"]) for r in records] == [("report.png", "create_dashboard")]
+
+
+def test_dashboard_files_layout_writes_one_image_per_chart(inline_pool):
+    result = asyncio.run(executor.create_dashboard(DASHBOARD_CHARTS, layout="files", filename="q.svg", dpi=40))
+    assert "Format:         svg" in result
+    images = sorted(p.name for p in inline_pool.iterdir() if p.suffix == ".svg")
+    assert images == ["q_1.svg", "q_2.svg", "trend.svg"]
+
+    records, _ = executor._artifacts.since(0)
+    assert len({r["call_id"] for r in records}) == 1
+    assert sorted(r["filename"] for r in records) == images
+
+
+def test_dashboard_rejects_bad_input(inline_pool):
+    assert asyncio.run(executor.create_dashboard(DASHBOARD_CHARTS, layout="tabs")).startswith("Error: Unknown layout")
+    assert asyncio.run(executor.create_dashboard("[]")) == "Error: charts must be a non-empty JSON array of chart specs"
+    assert asyncio.run(executor.create_dashboard('[{"data": {}}]')).startswith("Error: Chart 1 needs")
+    assert asyncio.run(executor.create_dashboard("[not json")).startswith("Error: Invalid JSON")
+
+
+def test_pipeline_splits_on_stage_names_not_column_names():
+    import pandas as pd
+
+    assert executor._split_pipeline("filter:price > 100 | groupby:region:sales | top:5") == \
+        ["filter:price > 100 ", " groupby:region:sales ", " top:5"]
+    assert executor._split_pipeline("describe|correlation") == ["describe", "correlation"]
+    # Columns named like operations inside a filter stay in the filter
+    assert executor._split_pipeline("filter:top > 3 | filter == 1 | sort > 1 | top:1") == \
+        ["filter:top > 3 | filter == 1 | sort > 1 ", " top:1"]
+    assert executor._split_pipeline("filter:a > 1 | `describe` | top:2") == ["filter:a > 1 | `describe` ", " top:2"]
+
+    df = pd.DataFrame({"top": [1, 5, 2], "filter": [0, 0, 1], "describe": [True, False, False]})
+    filtered, _ = executor._apply_operation(df, executor._split_pipeline("filter:top > 3 | filter == 1")[0])
+    assert filtered["top"].tolist() == [5, 2]
+
+    result = executor._analyze_data(df.to_json(orient="records"), "filter:top > 3 | `describe` | select:top")
+    assert "(3 → 2 rows)" in result and "2. select:top  (2 → 2 rows)" in result
+    assert executor._split_pipeline("filter:a > 1 | bogus:1") == ["filter:a > 1 ", " bogus:1"]
+
+
+def test_saved_results_are_pruned_by_count_and_age(render_dirs, monkeypatch):
+    import pandas as pd
+
+    results_dir = render_dirs / "results"
+    results_dir.mkdir()
+    monkeypatch.setattr(executor, "RESULTS_DIR", str(results_dir))
+    monkeypatch.setattr(executor, "RESULTS_MAX_COUNT", 2)
+    monkeypatch.setattr(executor, "RESULTS_MAX_AGE_HOURS", 1)
+    now = time.time()
+    for name, age in [("stale.parquet", 7200), ("old.parquet", 300), ("older.parquet", 600)]:
+        path = results_dir / name
+        path.write_bytes(b"x")
+        os.utime(path, (now - age, now - age))
+
+    text = executor._render_result(pd.DataFrame({"v": range(5000)}), "analyze_data")
+    assert "Full result (5,000 rows) saved to results/analyze_data_" in text
+
+    # "older" is over the count, "stale" over the age limit
+    saved = sorted(p.name for p in results_dir.iterdir())
+    assert len(saved) == 2 and saved[0].startswith("analyze_data_") and saved[1] == "old.parquet"
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+Unit tests for the dataset store (no agent or API key needed)
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Add project to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+pytest.importorskip("pyarrow")
+
+from dataset_store import DatasetStore
+
+
+def _frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"x": range(rows), "y": [float(i) / 2 for i in range(rows)]})
+
+
+def _age(store: DatasetStore, handle: str, seconds: float):
+    path = store._data_path(handle)
+    mtime = os.path.getmtime(path) - seconds
+    os.utime(path, (mtime, mtime))
+
+
+def test_save_load_roundtrip(tmp_path):
+    store = DatasetStore(str(tmp_path))
+    handle = store.save(_frame(5), name="small", source="test")
+    pd.testing.assert_frame_equal(store.load(handle), _frame(5))
+    assert store.info(handle)["rows"] == 5
+    assert [meta["handle"] for meta in store.list()] == [handle]
+
+
+def test_drop_by_another_process_invalidates_cache(tmp_path):
+    """A dataset dropped through another store instance is not served from this one's cache"""
+    worker = DatasetStore(str(tmp_path))
+    server = DatasetStore(str(tmp_path))
+    handle = worker.save(_frame(3))
+    worker.load(handle)
+    assert handle in worker._cache
+
+    assert server.drop(handle)
+    with pytest.raises(KeyError):
+        worker.load(handle)
+    assert handle not in worker._cache
+
+
+def test_eviction_by_count_drops_least_recently_used(tmp_path):
+    store = DatasetStore(str(tmp_path), max_count=3)
+    handles = []
+    for i in range(3):
+        handles.append(store.save(_frame(10), name=f"d{i}"))
+        for older in handles:
+            _age(store, older, 10)
+    store.load(handles[0])  # most recently used now
+
+    newest = store.save(_frame(10), name="d3")
+    kept = {meta["handle"] for meta in store.list()}
+    assert kept == {handles[0], handles[2], newest}
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{h}.{ext}" for h in kept for ext in ("arrow", "json"))
+
+
+def test_eviction_by_size_keeps_new_dataset(tmp_path):
+    probe = DatasetStore(str(tmp_path / "probe"))
+    size = probe.info(probe.save(_frame(10_000)))["size"]
+
+    store = DatasetStore(str(tmp_path / "store"), max_mb=2.5 * size / 2**20)
+    first = store.save(_frame(10_000))
+    _age(store, first, 10)
+    second = store.save(_frame(10_000))
+    _age(store, second, 5)
+    third = store.save(_frame(10_000))
+    assert {meta["handle"] for meta in store.list()} == {second, third}
+
+    # A single dataset over the limit is still kept
+    tiny = DatasetStore(str(tmp_path / "tiny"), max_mb=size / 2**30)
+    only = tiny.save(_frame(10_000))
+    assert [meta["handle"] for meta in tiny.list()] == [only]
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Unit tests for the MCP tool manifest cache (no server processes or API key needed)
+"""
+
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+# Add project to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import mcp_manifest
+from mcp_manifest import ToolManifest, manifest_key, source_hash, tool_spec
+
+CONNECTION = {"command": "python", "args": ["./server.py", "--transport", "stdio"], "transport": "stdio"}
+
+
+def _specs():
+    tool = SimpleNamespace(
+        name="calculate",
+        description="Evaluates an expression",
+        args_schema={"type": "object", "properties": {"expression": {"type": "string"}}},
+        response_format="content_and_artifact",
+    )
+    return [tool_spec(tool)]
+
+
+def test_manifest_roundtrip(tmp_path):
+    server = tmp_path / "server.py"
+    server.write_text("print('v1')\n")
+    manifest = ToolManifest(str(tmp_path / "cache" / "manifest.json"))
+    key = manifest_key(CONNECTION, [str(server)])
+
+    assert manifest.get("calculator", key) is None
+    manifest.put("calculator", key, _specs())
+    assert manifest.get("calculator", manifest_key(CONNECTION, [str(server)])) == _specs()
+    assert manifest.get("retriever", key) is None
+
+
+def test_source_change_invalidates_entry(tmp_path):
+    server = tmp_path / "server.py"
+    server.write_text("print('v1')\n")
+    manifest = ToolManifest(str(tmp_path / "manifest.json"))
+    old_hash = source_hash([str(server)])
+    manifest.put("calculator", manifest_key(CONNECTION, [str(server)]), _specs())
+
+    server.write_text("print('v2')\n")
+    assert source_hash([str(server)]) != old_hash
+    assert manifest.get("calculator", manifest_key(CONNECTION, [str(server)])) is None
+
+    # Back to the old source: the entry is valid again
+    server.write_text("print('v1')\n")
+    assert manifest.get("calculator", manifest_key(CONNECTION, [str(server)])) == _specs()
+
+
+def test_source_hash_covers_names_and_missing_files(tmp_path):
+    a, b = tmp_path / "a.py", tmp_path / "b.py"
+    a.write_text("x = 1\n")
+    b.write_text("x = 1\n")
+    assert source_hash([str(a)]) != source_hash([str(b)])
+    assert source_hash([str(a), str(b)]) != source_hash([str(b), str(a)])
+    missing = str(tmp_path / "missing.py")
+    assert source_hash([missing]) == source_hash([missing])
+    assert source_hash([str(a), missing]) != source_hash([str(a)])
+
+
+def test_connection_or_format_change_invalidates_entry(tmp_path, monkeypatch):
+    manifest = ToolManifest(str(tmp_path / "manifest.json"))
+    manifest.put("calculator", manifest_key(CONNECTION), _specs())
+
+    assert manifest.get("calculator", manifest_key({**CONNECTION, "command": "python3.12"})) is None
+    monkeypatch.setattr(mcp_manifest, "MANIFEST_VERSION", mcp_manifest.MANIFEST_VERSION + 1)
+    assert manifest.get("calculator", manifest_key(CONNECTION)) is None
+
+
+def test_corrupt_manifest_is_ignored_and_rewritten(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text("{not json")
+    manifest = ToolManifest(str(path))
+    key = manifest_key(CONNECTION)
+
+    assert manifest.get("calculator", key) is None
+    manifest.put("calculator", key, _specs())
+    assert json.loads(path.read_text())["calculator"]["tools"] == _specs()
+    assert [p.name for p in tmp_path.iterdir()] == ["manifest.json"]
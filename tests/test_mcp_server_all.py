@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+Unit tests for mounting toolsets on the combined MCP server (no server processes needed)
+"""
+
+import asyncio
+import os
+import sys
+import types
+
+import pytest
+
+# Add project to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+pytest.importorskip("mcp.server.fastmcp")
+
+from mcp.server.fastmcp import FastMCP
+
+import mcp_server_all
+
+
+def _fake_tool(result: str):
+    def tool(query: str = "") -> str:
+        """Fake tool"""
+        return result
+    return tool
+
+
+def _toolset(module_name: str, *tool_names):
+    """Fake server module whose tools return '<module>.<tool>'"""
+    module = types.ModuleType(module_name)
+    module.mcp = FastMCP(module_name)
+    for tool_name in tool_names:
+        tool = _fake_tool(f"{module_name}.{tool_name}")
+        tool.__name__ = tool_name
+        module.mcp.add_tool(tool, name=tool_name)
+        setattr(module, tool_name, tool)
+    return module
+
+
+@pytest.fixture
+def toolsets(monkeypatch):
+    modules = {
+        "alpha": _toolset("fake_alpha", "search", "status"),
+        "beta": _toolset("fake_beta", "status", "compute"),
+    }
+    for module in modules.values():
+        monkeypatch.setitem(sys.modules, module.__name__, module)
+    monkeypatch.setattr(mcp_server_all, "TOOLSETS", {name: module.__name__ for name, module in modules.items()})
+    return list(modules)
+
+
+def _call(server, name):
+    content = asyncio.run(server.call_tool(name, {}))
+    if isinstance(content, tuple):  # newer mcp versions also return the structured result
+        content = content[0]
+    return content[0].text
+
+
+def test_auto_namespace_prefixes_only_colliding_names(toolsets):
+    server = FastMCP("combined")
+    mounted = mcp_server_all.mount_toolsets(server, toolsets, "auto")
+
+    assert mounted == {
+        "search": ("alpha", "search"),
+        "alpha_status": ("alpha", "status"),
+        "beta_status": ("beta", "status"),
+        "compute": ("beta", "compute"),
+    }
+    names = [tool.name for tool in asyncio.run(server.list_tools())]
+    assert sorted(names) == sorted(mounted) and len(set(names)) == len(names)
+    assert _call(server, "alpha_status") == "fake_alpha.status"
+    assert _call(server, "beta_status") == "fake_beta.status"
+
+
+def test_always_namespace_prefixes_every_tool(toolsets):
+    server = FastMCP("combined")
+    mounted = mcp_server_all.mount_toolsets(server, toolsets, "always")
+
+    assert sorted(mounted) == ["alpha_search", "alpha_status", "beta_compute", "beta_status"]
+    names = [tool.name for tool in asyncio.run(server.list_tools())]
+    assert sorted(names) == sorted(mounted)
+    assert _call(server, "beta_compute") == "fake_beta.compute"
+
+
+def test_unknown_namespace_mode(toolsets):
+    with pytest.raises(ValueError):
+        mcp_server_all.mount_toolsets(FastMCP("combined"), toolsets, "never")
+
+
+@pytest.mark.parametrize("namespace", mcp_server_all.NAMESPACE_MODES)
+def test_real_toolsets_mount_without_collisions(namespace):
+    pytest.importorskip("pandas")
+    toolsets = ["calculator", "code_executor"]
+    server = FastMCP("combined")
+    mounted = mcp_server_all.mount_toolsets(server, toolsets, namespace)
+
+    expected = sum(len(asyncio.run(sys.modules[mcp_server_all.TOOLSETS[t]].mcp.list_tools())) for t in toolsets)
+    names = [tool.name for tool in asyncio.run(server.list_tools())]
+    assert len(names) == len(set(names)) == len(mounted) == expected
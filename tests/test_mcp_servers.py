@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Unit tests for the MCP server launcher helpers (no server processes, no API key needed)
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add project to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+pytest.importorskip("mcp.server.fastmcp")
+
+from mcp.server.fastmcp import FastMCP
+
+from mcp_servers import parse_server_args, server_connections
+
+
+@pytest.fixture
+def server():
+    mcp = FastMCP("Test", host="0.0.0.0", port=8100)
+
+    @mcp.tool()
+    def ping() -> str:
+        return "pong"
+
+    return mcp
+
+
+def _parse(mcp, monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["server.py", *argv])
+    return parse_server_args(mcp)
+
+
+def test_defaults_keep_server_settings(server, monkeypatch):
+    monkeypatch.delenv("MCP_TRANSPORT", raising=False)
+    assert _parse(server, monkeypatch) == "stdio"
+    assert (server.settings.host, server.settings.port) == ("0.0.0.0", 8100)
+
+
+def test_transport_from_environment(server, monkeypatch):
+    monkeypatch.setenv("MCP_TRANSPORT", "streamable_http")
+    assert _parse(server, monkeypatch) == "streamable-http"
+    assert _parse(server, monkeypatch, "--transport", "sse") == "sse"
+
+
+def test_host_and_port_override(server, monkeypatch):
+    monkeypatch.delenv("MCP_TRANSPORT", raising=False)
+    assert _parse(server, monkeypatch, "--transport", "sse", "--host", "127.0.0.1", "--port", "9100") == "sse"
+    assert (server.settings.host, server.settings.port) == ("127.0.0.1", 9100)
+
+
+def test_invalid_arguments_exit(server, monkeypatch):
+    monkeypatch.delenv("MCP_TRANSPORT", raising=False)
+    for argv in (["--transport", "websocket"], ["--port", "http"]):
+        with pytest.raises(SystemExit) as excinfo:
+            _parse(server, monkeypatch, *argv)
+        assert excinfo.value.code == 2
+
+    monkeypatch.setenv("MCP_TRANSPORT", "grpc")
+    with pytest.raises(ValueError):
+        _parse(server, monkeypatch)
+
+
+def test_check_lists_tools_and_exits(server, monkeypatch, capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        _parse(server, monkeypatch, "--check")
+    assert excinfo.value.code == 0
+    assert capsys.readouterr().out.strip() == "Test: 1 tools (ping)"
+
+
+def test_server_connections_match_parsed_transport(monkeypatch):
+    monkeypatch.setenv("MCP_SERVER_HOST", "10.0.0.5")
+    connections = server_connections("streamable-http", combined=False)
+    assert connections["calculator"] == {"url": "http://10.0.0.5:8006/mcp", "transport": "streamable_http"}
+
+    stdio = server_connections("stdio", python="/usr/bin/python3", combined=True)
+    assert stdio == {"mcp-tools": {"command": "/usr/bin/python3", "args": ["./mcp_server_all.py", "--transport", "stdio"],
+                                   "transport": "stdio"}}
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+"""
+Unit tests for MCP sessions: retry rules (fake session) and lazy start with the
+tool manifest (small stdio server in a temporary directory, no API key needed)
+"""
+
+import asyncio
+import os
+import sys
+import textwrap
+
+import pytest
+
+# Add project to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+pytest.importorskip("langchain_mcp_adapters")
+
+import anyio
+from langchain_core.tools import ToolException
+
+from mcp_sessions import MCPSessionManager, _ServerSession
+
+
+class FakeTool:
+    """Tool whose calls fail with the given errors, in order, then succeed"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def coroutine(self, **arguments):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok", None
+
+
+def _server(tools: dict, retry_safe=()) -> _ServerSession:
+    server = _ServerSession(client=None, name="fake")
+    server.tools = tools
+    server.retry_safe = set(retry_safe)
+    server.reconnects = 0
+
+    async def connect():
+        pass
+
+    async def reconnect(session):
+        server.reconnects += 1
+
+    server.connect = connect
+    server.reconnect = reconnect
+    return server
+
+
+def test_side_effecting_tool_is_not_run_twice():
+    tool = FakeTool(RuntimeError("Connection closed"))
+    server = _server({"save_to_csv": tool})
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(server.call("save_to_csv", {}))
+    assert tool.calls == 1 and server.reconnects == 0
+
+
+def test_idempotent_tool_is_retried_after_connection_error():
+    tool = FakeTool(RuntimeError("Connection closed"))
+    server = _server({"retrieve": tool}, retry_safe=["retrieve"])
+
+    assert asyncio.run(server.call("retrieve", {"query": "x"})) == ("ok", None)
+    assert tool.calls == 2 and server.reconnects == 1
+
+
+def test_request_not_sent_is_retried_for_any_tool():
+    tool = FakeTool(anyio.ClosedResourceError())
+    server = _server({"save_to_csv": tool})
+
+    assert asyncio.run(server.call("save_to_csv", {})) == ("ok", None)
+    assert tool.calls == 2 and server.reconnects == 1
+
+
+def test_tool_errors_are_not_retried():
+    tool = FakeTool(ToolException("bad input"))
+    server = _server({"retrieve": tool}, retry_safe=["retrieve"])
+
+    with pytest.raises(ToolException):
+        asyncio.run(server.call("retrieve", {}))
+    assert tool.calls == 1 and server.reconnects == 0
+
+
+SERVER_TEMPLATE = textwrap.dedent("""
+    from mcp.server.fastmcp import FastMCP
+
+    mcp = FastMCP("Echo")
+
+    @mcp.tool()
+    def echo(text: str) -> str:
+        \"\"\"{description}\"\"\"
+        return "{prefix}" + text
+
+    if __name__ == "__main__":
+        mcp.run(transport="stdio")
+""")
+
+
+def _write_server(path, description: str, prefix: str):
+    path.write_text(SERVER_TEMPLATE.format(description=description, prefix=prefix))
+
+
+def _manager(script, manifest) -> MCPSessionManager:
+    connections = {"echo": {"command": sys.executable, "args": [str(script)], "transport": "stdio"}}
+    return MCPSessionManager(connections, manifest_path=str(manifest), sources={"echo": [str(script)]})
+
+
+def test_lazy_start_uses_manifest_then_live_session_when_stale(tmp_path):
+    script, manifest = tmp_path / "echo_server.py", tmp_path / "manifest.json"
+    _write_server(script, "Echo v1", "v1:")
+
+    # No manifest yet: the server starts to list its tools, and the manifest is written
+    manager = _manager(script, manifest)
+    try:
+        tools = manager.get_tools(lazy=True)
+        assert manager.started() == ["echo"] and manifest.exists()
+    finally:
+        manager.close()
+
+    # Valid manifest: nothing starts until the first call
+    manager = _manager(script, manifest)
+    try:
+        tools = {tool.name: tool for tool in manager.get_tools(lazy=True)}
+        assert manager.started() == []
+        assert tools["echo"].description == "Echo v1"
+        assert tools["echo"].invoke({"text": "a"}) == "v1:a"
+        assert manager.started() == ["echo"]
+    finally:
+        manager.close()
+
+    # Server source changed: the stale manifest is ignored and the live server is used
+    _write_server(script, "Echo v2", "v2:")
+    manager = _manager(script, manifest)
+    try:
+        tools = {tool.name: tool for tool in manager.get_tools(lazy=True)}
+        assert manager.started() == ["echo"]
+        assert tools["echo"].description == "Echo v2"
+        assert tools["echo"].invoke({"text": "b"}) == "v2:b"
+    finally:
+        manager.close()
+    assert "Echo v2" in manifest.read_text()
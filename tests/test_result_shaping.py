@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""
+Unit tests for result table shaping (no agent or API key needed)
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from result_shaping import ELLIPSIS, shape_frame
+
+
+@pytest.mark.parametrize("style", ["markdown", "csv", "text"])
+@pytest.mark.parametrize("max_chars", [150, 500, 2000, 8000])
+def test_shape_frame_respects_budget(style, max_chars):
+    df = pd.DataFrame(np.random.default_rng(0).random((1000, 30)))
+    text, truncated = shape_frame(df, max_chars=max_chars, style=style)
+    assert len(text) <= max_chars
+    assert truncated
+
+
+def test_shape_frame_small_table_unchanged():
+    df = pd.DataFrame({"region": ["US", "EU"], "sales": [500.123456, 300.0]})
+    text, truncated = shape_frame(df, max_chars=1000)
+    assert not truncated
+    assert text.splitlines() == ["| region | sales |", "|---|---|", "| US | 500.1235 |", "| EU | 300.0 |"]
+
+
+def test_shape_frame_elides_middle_rows_and_columns():
+    df = pd.DataFrame({f"c{i}": range(100) for i in range(5)})
+    text, truncated = shape_frame(df, max_chars=10_000, max_rows=4, max_columns=3)
+    lines = text.splitlines()
+    assert truncated
+    assert lines[0] == "| c0 | c1 | c2 |"
+    assert lines[2] == "| 0 | 0 | 0 |" and lines[6] == "| 99 | 99 | 99 |"
+    assert ELLIPSIS in lines[4]
+    assert lines[-1] == "(showing 4 of 100 rows; 2 more columns not shown)"
+
+
+def test_shape_frame_keeps_named_index():
+    series = pd.Series([3, 4], index=pd.Index(["a", "b"], name="key"), name="count")
+    text, _ = shape_frame(series, max_chars=1000)
+    assert text.splitlines()[0] == "| key | count |"
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Unit tests for table file reading/writing (no agent or API key needed)
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Add project to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import table_io
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "region": ["US", "EU", "US", "APAC"],
+        "sales": [500.5, 300.25, 120.0, 80.75],
+        "units": [5, 3, 1, 2],
+    })
+
+
+@pytest.mark.parametrize("fmt", ["csv", "csv.gz", "parquet", "feather"])
+def test_round_trip(tmp_path, df, fmt):
+    path = str(tmp_path / f"sales{table_io.FORMAT_EXTENSIONS[fmt]}")
+    assert table_io.write_table(df, path, fmt) == [path]
+
+    assert table_io.table_format(path) == fmt
+    assert table_io.table_stem(os.path.basename(path)) == "sales"
+    pd.testing.assert_frame_equal(table_io.read_table(path), df)
+    pd.testing.assert_frame_equal(table_io.read_head(path, 2), df.head(2))
+    assert table_io.count_rows(path) == len(df)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "feather"])
+def test_append(tmp_path, df, fmt):
+    path = str(tmp_path / f"sales{table_io.FORMAT_EXTENSIONS[fmt]}")
+    table_io.write_table(df, path, fmt)
+    table_io.write_table(df, path, fmt, mode="append")
+
+    combined = table_io.read_table(path)
+    assert len(combined) == 2 * len(df) == table_io.count_rows(path)
+    assert sorted(combined["sales"]) == sorted(list(df["sales"]) * 2)
+
+    with pytest.raises(ValueError):
+        table_io.write_table(df[["region"]], path, fmt, mode="append")
+
+
+def test_partitioned_parquet(tmp_path, df):
+    path = str(tmp_path / "sales.parquet")
+    written = table_io.write_table(df, path, "parquet", partition_by=["region"])
+
+    assert sorted(os.listdir(path)) == ["region=APAC", "region=EU", "region=US"]
+    assert len(written) == 3
+    result = table_io.read_table(path)
+    assert sorted(result["units"]) == sorted(df["units"])
+    assert set(result["region"].astype(str)) == set(df["region"])
+
+
+def test_count_rows_with_multiline_fields(tmp_path):
+    df = pd.DataFrame({"id": [1, 2, 3], "note": ["plain", "two\nlines", 'quoted "word"\nand more']})
+    for fmt in ("csv", "csv.gz"):
+        path = str(tmp_path / f"notes{table_io.FORMAT_EXTENSIONS[fmt]}")
+        table_io.write_table(df, path, fmt)
+        assert table_io.count_rows(path) == 3
+
+    path = tmp_path / "no_trailing_newline.csv"
+    path.write_text("a,b\n1,2\n3,4")
+    assert table_io.count_rows(str(path)) == 2
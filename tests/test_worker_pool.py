@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+Unit tests for the worker pool (starts real worker processes, no agent or API key needed)
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+# Add project to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from worker_pool import TaskError, WorkerPool, WorkerTimeout, resource
+
+
+def test_checkout_keeps_pool_at_size():
+    """Checked-out workers are replaced, but the pool never holds more than `size` idle workers"""
+    pool = WorkerPool(size=2)
+    workers = []
+    try:
+        for _ in range(4):
+            workers.append(pool.checkout())
+            assert len(pool._idle) <= pool.size
+        assert len(pool._idle) == pool.size
+        assert asyncio.run(workers[0].run(pow, 2, 10, timeout=30)) == 1024
+    finally:
+        for worker in workers:
+            worker.kill()
+        pool.shutdown()
+
+
+def test_checkout_while_all_workers_are_busy():
+    """Workers returning from submit() don't push the pool over `size` after a checkout"""
+    pool = WorkerPool(size=2)
+    checked_out = []
+
+    async def scenario():
+        busy = [asyncio.create_task(pool.submit(time.sleep, 0.5, timeout=30)) for _ in range(2)]
+        await asyncio.sleep(0.1)
+        assert not pool._idle
+        checked_out.append(pool.checkout())
+        await asyncio.gather(*busy)
+
+    try:
+        asyncio.run(scenario())
+        assert len(pool._idle) == pool.size
+    finally:
+        for worker in checked_out:
+            worker.kill()
+        pool.shutdown()
+
+
+def test_blas_thread_limits_are_set_in_workers_only(monkeypatch):
+    """Workers run single-threaded BLAS, but creating a pool leaves the parent's environment alone"""
+    monkeypatch.delenv("OMP_NUM_THREADS", raising=False)
+    pool = WorkerPool(size=1)
+    try:
+        assert asyncio.run(pool.submit(os.getenv, "OMP_NUM_THREADS", timeout=30)) == "1"
+        assert "OMP_NUM_THREADS" not in os.environ
+    finally:
+        pool.shutdown()
+
+
+def test_preload_combines_pools_created_before_start():
+    """Every pool created before the first worker starts gets its modules preloaded"""
+    script = (
+        "import asyncio\n"
+        "from worker_pool import WorkerPool\n"
+        "first = WorkerPool(size=1, preload=['colorsys'])\n"
+        "second = WorkerPool(size=1, preload=['wave'])\n"
+        "check = \"'colorsys' in sys.modules and 'wave' in sys.modules\"\n"
+        "print(asyncio.run(first.submit(eval, check, timeout=30)))\n"
+        "first.shutdown(); second.shutdown()\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=120)
+    assert result.stdout.strip() == "True", result.stderr
+
+
+needs_rlimits = pytest.mark.skipif(resource is None, reason="CPU/memory rlimits need the resource module")
+
+
+@needs_rlimits
+def test_cpu_time_limit_stops_task_but_keeps_worker():
+    pool = WorkerPool(size=1)
+
+    async def scenario():
+        pid = await pool.submit(os.getpid, timeout=30)
+        with pytest.raises(WorkerTimeout) as excinfo:
+            await pool.submit(eval, "sum(i for i in range(10**12))", timeout=60, cpu_time=1)
+        assert excinfo.value.kind == "CPU time"
+        # The next task runs normally, in the same worker
+        assert await pool.submit(os.getpid, timeout=30) == pid
+        assert await pool.submit(eval, "sum(range(1000))", timeout=30) == 499500
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+
+@needs_rlimits
+def test_memory_limit_raises_memory_error():
+    pool = WorkerPool(size=1, memory_limit_mb=512)
+
+    async def scenario():
+        with pytest.raises(TaskError) as excinfo:
+            await pool.submit(bytearray, 2 * 2**30, timeout=30)
+        assert excinfo.value.name == "MemoryError"
+        assert len(await pool.submit(bytearray, 2**20, timeout=30)) == 2**20
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+
+def test_wall_clock_timeout_replaces_worker():
+    pool = WorkerPool(size=1)
+
+    async def scenario():
+        pid = await pool.submit(os.getpid, timeout=30)
+        started = time.monotonic()
+        with pytest.raises(WorkerTimeout) as excinfo:
+            await pool.submit(time.sleep, 30, timeout=0.5)
+        assert excinfo.value.kind == "Wall-clock time"
+        assert time.monotonic() - started < 10
+        # The killed worker was replaced with a fresh one, keeping the pool at size
+        assert len(pool._idle) == pool.size and pool._idle[0].alive
+        assert await pool.submit(os.getpid, timeout=30) != pid
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()
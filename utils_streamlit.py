@@ -196,9 +196,15 @@ def get_tool_icon(tool_name):
         'compare_values': '⚖️',
         'execute_python': '🐍',
         'create_visualization': '📊',
+        'create_dashboard': '🗂️',
         'analyze_data': '🔬',
         'read_csv': '📄',
         'save_to_csv': '💾',
+        'load_dataset': '🗃️',
+        'list_datasets': '🗃️',
+        'drop_dataset': '🗑️',
+        'query_sql': '🦆',
+        'export_data': '📦',
         'tavily_search_results_json': '🔍'
     }
     return icons.get(tool_name, '🔧')
@@ -14,9 +14,9 @@ import os
 from pathlib import Path
 import asyncio
 import time
+import uuid
 from io import StringIO
 from contextlib import redirect_stdout
-from PIL import Image
 
 # Add project to path
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
@@ -24,7 +24,10 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 from agent import create_mcp_agent, chat_with_agent
-from utils_streamlit import display_agent_response_streamlit
+from artifact_registry import ArtifactRegistry
+
+# Index of files generated by the tools (written by the MCP servers)
+artifacts = ArtifactRegistry(os.path.join(PROJECT_ROOT, "output"))
 
 
 # Page configuration
@@ -83,12 +86,29 @@ st.markdown("""
 
 @st.cache_resource
 def initialize_agent():
-    """Initialize agent (cached to avoid re-initialization)"""
+    """Initialize agent (cached to avoid re-initialization, shared by all browser sessions)"""
     with st.spinner("🚀 Initializing MCP Multi-Agent System..."):
         agent, config, tools = create_mcp_agent()
     return agent, config, tools
 
 
+def session_config(config):
+    """Agent config with this browser session's own conversation (thread_id)."""
+    if "thread_id" not in st.session_state:
+        st.session_state.thread_id = str(uuid.uuid4())
+    return {**config, "configurable": {**config["configurable"], "thread_id": st.session_state.thread_id}}
+
+
+def artifact_count():
+    """Number of generated files; each rerun reads only the index entries added since the last one."""
+    count, cursor = st.session_state.get("artifact_count", (0, 0))
+    if artifacts.cursor() < cursor:  # index was removed or rotated
+        count, cursor = 0, 0
+    new_records, cursor = artifacts.since(cursor)
+    st.session_state.artifact_count = (count + len(new_records), cursor)
+    return count + len(new_records)
+
+
 def display_tool_categories(tools):
     """Display available tools by category"""
     categories = {
@@ -101,9 +121,9 @@ def display_tool_categories(tools):
     for tool in tools:
         if tool.name == "retrieve":
             categories["📚 Document Retrieval"].append(tool.name)
-        elif tool.name in ["calculate", "percentage_change", "statistics_summary", "currency_convert", "compare_values"]:
+        elif tool.name in ["calculate", "calculate_batch", "percentage_change", "statistics_summary", "currency_convert", "convert_many", "set_exchange_rate", "compare_values"]:
             categories["🧮 Calculator"].append(tool.name)
-        elif tool.name in ["execute_python", "create_visualization", "analyze_data", "read_csv", "save_to_csv"]:
+        elif tool.name in ["execute_python", "list_variables", "reset_session", "create_visualization", "create_dashboard", "analyze_data", "read_csv", "save_to_csv", "load_dataset", "list_datasets", "drop_dataset", "query_sql", "export_data"]:
             categories["💻 Code Executor"].append(tool.name)
         elif tool.name == "tavily_search_results_json":
             categories["🔍 Web Search"].append(tool.name)
@@ -159,6 +179,7 @@ def main():
     # Initialize agent
     try:
         agent, config, tools = initialize_agent()
+        config = session_config(config)
         st.success(f"✅ Agent initialized with {len(tools)} tools!")
     except Exception as e:
         st.error(f"❌ Failed to initialize agent: {str(e)}")
@@ -175,13 +196,12 @@ def main():
 
         st.markdown("---")
 
-        # Output directory info
-        output_dir = os.path.join(PROJECT_ROOT, "output")
-        if os.path.exists(output_dir):
-            files = [f for f in os.listdir(output_dir) if f.endswith(('.png', '.csv', '.jpg'))]
-            st.markdown(f"### 📁 Generated Files ({len(files)})")
-            for file in sorted(files)[:10]:  # Show max 10 files
-                st.text(f"• {file}")
+        # Output directory info (most recent entries of the artifact index)
+        recent_files = artifacts.recent(10)
+        if recent_files:
+            st.markdown(f"### 📁 Generated Files ({artifact_count()})")
+            for record in recent_files:  # Show max 10 files
+                st.text(f"• {record['filename']}")
 
     # Main content area
     col1, col2 = st.columns([3, 1])
@@ -216,80 +236,58 @@ def main():
     with col2:
         st.markdown("### 📊 Stats")
         st.metric("Total Tools", len(tools))
-        st.metric("Thread ID", config.get("thread_id", 1))
+        st.metric("Thread ID", config["configurable"]["thread_id"][:8])
 
-        if os.path.exists(os.path.join(PROJECT_ROOT, "output")):
-            file_count = len([f for f in os.listdir(os.path.join(PROJECT_ROOT, "output"))])
-            st.metric("Files Generated", file_count)
+        st.metric("Files Generated", artifact_count())
 
     # Execute query
     if submit_button and user_query.strip():
         st.markdown("---")
 
         try:
-            # Capture existing files BEFORE execution
-            output_dir = os.path.join(PROJECT_ROOT, "output")
-            existing_files = set()
-            if os.path.exists(output_dir):
-                existing_files = set(os.listdir(output_dir))
-
-            # Record start time
-            start_time = time.time()
+            # Remember the end of the artifact index BEFORE execution
+            cursor = artifacts.cursor()
 
             # Run async function with beautiful UI
+            # (imported on first query - langchain is loaded by then, not at page load)
+            from utils_streamlit import display_agent_response_streamlit
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
             success = loop.run_until_complete(display_agent_response_streamlit(agent, config, user_query))
             loop.close()
 
             if success:
-                # Find NEW files generated during this query
-                if os.path.exists(output_dir):
-                    current_files = set(os.listdir(output_dir))
-                    new_files = current_files - existing_files
-
-                    # Filter for image files created after start_time
-                    new_images = []
-                    for f in new_files:
-                        if f.endswith(('.png', '.jpg', '.jpeg')):
-                            filepath = os.path.join(output_dir, f)
-                            if os.path.getmtime(filepath) >= start_time:
-                                new_images.append(f)
-
-                    # Also check existing files that were modified after start_time
-                    for f in existing_files:
-                        if f.endswith(('.png', '.jpg', '.jpeg')):
-                            filepath = os.path.join(output_dir, f)
-                            if os.path.exists(filepath) and os.path.getmtime(filepath) >= start_time:
-                                if f not in new_images:
-                                    new_images.append(f)
-
-                    if new_images:
-                        st.markdown("---")
-                        st.markdown("### 📊 Generated Visualizations")
-                        st.info(f"🎨 {len(new_images)} image(s) created during this query")
-
-                        # Sort by creation time (newest first)
-                        sorted_images = sorted(
-                            new_images,
-                            key=lambda f: os.path.getmtime(os.path.join(output_dir, f)),
-                            reverse=True
-                        )
-
-                        # Display all new images (with cache busting)
-                        for img_file in sorted_images:
-                            img_path = os.path.join(output_dir, img_file)
-
-                            # Add timestamp to bust cache
-                            mtime = os.path.getmtime(img_path)
-
-                            # Read image file and display
-                            # This prevents browser caching issues
-                            img = Image.open(img_path)
-                            st.image(img, caption=f"📊 {img_file} (created: {time.strftime('%H:%M:%S', time.localtime(mtime))})", use_container_width=True)
-                    else:
-                        # No new images, but show info
-                        st.info("ℹ️ No new visualizations were created during this query.")
+                # Files registered by the tools during this query
+                new_records, _ = artifacts.since(cursor)
+                output_dir = artifacts.output_dir
+                new_images = [
+                    r for r in new_records
+                    if r["mime"].startswith("image/") and os.path.exists(os.path.join(output_dir, r["filename"]))
+                ]
+
+                if new_images:
+                    st.markdown("---")
+                    st.markdown("### 📊 Generated Visualizations")
+                    st.info(f"🎨 {len(new_images)} image(s) created during this query")
+
+                    # Display all new images (newest first)
+                    for record in reversed(new_images):
+                        img_path = os.path.join(output_dir, record["filename"])
+
+                        created = time.strftime('%H:%M:%S', time.localtime(record["created"]))
+                        if record["mime"] == "image/svg+xml":
+                            with open(img_path, encoding="utf-8") as f:
+                                st.image(f.read(), caption=f"📊 {record['filename']} (created: {created})", use_container_width=True)
+                            continue
+
+                        # Read image file and display
+                        # This prevents browser caching issues
+                        from PIL import Image
+                        img = Image.open(img_path)
+                        st.image(img, caption=f"📊 {record['filename']} (created: {created})", use_container_width=True)
+                else:
+                    # No new images, but show info
+                    st.info("ℹ️ No new visualizations were created during this query.")
 
         except Exception as e:
             st.error(f"❌ Error: {str(e)}")
@@ -0,0 +1,380 @@
+"""
+Worker Pool - 격리된 워커 프로세스에서 도구 작업 실행
+
+MCP 서버의 무거운 작업을 이벤트 루프 밖, 미리 띄워 둔(pre-forked) 워커 프로세스에서 실행합니다:
+1. 작업별 CPU 시간 제한 (RLIMIT_CPU) + wall-clock 타임아웃 (초과 시 워커 강제 종료)
+2. 워커별 메모리 제한 (RLIMIT_AS)
+3. N개 작업 처리 후 또는 메모리 사용량 초과 시 워커 자동 교체
+
+사용 예:
+    pool = WorkerPool(size=2, memory_limit_mb=1024)
+    pool.start()  # 서버 시작 전에 워커를 미리 생성
+    result = await pool.submit(func, arg, timeout=10, cpu_time=5)
+
+제출하는 함수(func)는 모듈 최상위에 정의된 함수여야 합니다 (pickle 가능).
+"""
+
+import asyncio
+import contextlib
+import logging
+import math
+import multiprocessing
+import os
+import signal
+import sys
+import traceback
+
+try:
+    import resource
+except ImportError:  # Windows: CPU/memory rlimits are not available
+    resource = None
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a new worker to finish its initializer
+WORKER_STARTUP_TIMEOUT = 120
+
+# Environment of worker processes (variables the user already set are kept): one
+# BLAS/OpenMP thread per worker - the pool provides the parallelism, and fewer
+# thread stacks keep the address space (RLIMIT_AS) predictable
+WORKER_ENV = {"OPENBLAS_NUM_THREADS": "1", "OMP_NUM_THREADS": "1", "MKL_NUM_THREADS": "1"}
+
+# Modules imported once in the fork server and inherited by every worker. The fork
+# server is shared by all pools and reads this list once, when the first worker
+# starts: create every pool before starting any of them
+_preload_modules = set()
+_forkserver_started = False
+
+
+@contextlib.contextmanager
+def _worker_environment():
+    """Sets WORKER_ENV while a worker (or the fork server it is forked from) starts."""
+    added = {name: value for name, value in WORKER_ENV.items() if name not in os.environ}
+    os.environ.update(added)
+    try:
+        yield
+    finally:
+        for name in added:
+            os.environ.pop(name, None)
+
+
+class WorkerTimeout(Exception):
+    """Raised when a task exceeds its CPU-time or wall-clock budget."""
+
+    def __init__(self, limit: float, kind: str):
+        self.limit = limit
+        self.kind = kind
+        super().__init__(f"{kind} limit exceeded ({limit:g}s)")
+
+
+class WorkerCrashed(Exception):
+    """Raised when a worker process dies while running a task."""
+
+
+class TaskError(Exception):
+    """Exception raised by the task inside the worker process."""
+
+    def __init__(self, name: str, message: str, remote_traceback: str = ""):
+        self.name = name
+        self.remote_traceback = remote_traceback
+        super().__init__(message)
+
+
+class _CPUTimeExceeded(BaseException):
+    """Raised inside the worker by the SIGXCPU handler."""
+
+
+def _on_sigxcpu(signum, frame):
+    raise _CPUTimeExceeded()
+
+
+def _cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _rss_mb() -> float:
+    """Current resident memory of this process in MB (peak RSS if unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        if resource is None:
+            return 0.0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in KB on Linux
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _worker_main(conn, memory_limit_mb, initializer):
+    """Worker process loop: receive (func, args, kwargs, cpu_time), send back the result."""
+    if resource is not None:
+        if memory_limit_mb:
+            limit = int(memory_limit_mb * 2**20)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        signal.signal(signal.SIGXCPU, _on_sigxcpu)
+
+    # The parent handles Ctrl+C and shuts workers down itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # stdout may be the parent's MCP stdio channel - stray writes would corrupt it
+    try:
+        sys.stdout.flush()
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    except (AttributeError, OSError, ValueError):
+        pass
+
+    if initializer is not None:
+        initializer()
+    conn.send(("ready", None, _rss_mb()))
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+
+        func, args, kwargs, cpu_time = task
+        if cpu_time and resource is not None:
+            hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+            soft = math.ceil(_cpu_seconds() + cpu_time)
+            if hard != resource.RLIM_INFINITY:
+                soft = min(soft, hard)
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+        try:
+            reply = ("ok", func(*args, **kwargs))
+        except _CPUTimeExceeded:
+            reply = ("cpu_timeout", cpu_time)
+        except MemoryError:
+            reply = ("error", ("MemoryError", f"Memory limit exceeded ({memory_limit_mb} MB)", ""))
+        except Exception as e:
+            reply = ("error", (type(e).__name__, str(e), traceback.format_exc()))
+        finally:
+            if cpu_time and resource is not None:
+                hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+                resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+
+        try:
+            conn.send((*reply, _rss_mb()))
+        except Exception as e:
+            # e.g. the result could not be pickled
+            conn.send(("error", (type(e).__name__, str(e), traceback.format_exc()), _rss_mb()))
+
+
+def set_memory_limit(memory_limit_mb: float):
+    """
+    Lowers the address-space limit of the current worker (submit it as a task).
+
+    Useful for workers taken out of a pool with checkout() that need a
+    different memory budget from the rest of the pool.
+    """
+    if resource is not None:
+        limit = int(memory_limit_mb * 2**20)
+        hard = resource.getrlimit(resource.RLIMIT_AS)[1]
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+class Worker:
+    """A single worker process connected to the parent by a pipe."""
+
+    def __init__(self, ctx, memory_limit_mb=None, initializer=None):
+        self._conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, memory_limit_mb, initializer),
+            daemon=True,
+        )
+        # Started processes copy the environment; the parent's is restored right after
+        with _worker_environment():
+            self.process.start()
+        child_conn.close()
+
+        self.ready = False
+        self.jobs = 0
+        self.rss_mb = 0.0
+
+    @property
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def _receive(self, timeout):
+        if not self._conn.poll(timeout):
+            raise TimeoutError()
+        return self._conn.recv()
+
+    def _call(self, task, timeout):
+        """Blocking round trip, run in a thread so the event loop stays free."""
+        if not self.ready:
+            self._receive(WORKER_STARTUP_TIMEOUT)
+            self.ready = True
+        self._conn.send(task)
+        return self._receive(timeout)
+
+    async def run(self, func, *args, timeout=None, cpu_time=None, **kwargs):
+        """
+        Runs func(*args, **kwargs) in this worker.
+
+        Raises:
+            WorkerTimeout: CPU-time or wall-clock budget exceeded (the worker is killed
+                on wall-clock timeout; on CPU timeout the worker survives)
+            WorkerCrashed: The worker process died (e.g. killed by the OS)
+            TaskError: The task raised an exception
+        """
+        try:
+            status, payload, rss = await asyncio.to_thread(
+                self._call, (func, args, kwargs, cpu_time), timeout
+            )
+        except TimeoutError:
+            self.kill()
+            raise WorkerTimeout(timeout, "Wall-clock time")
+        except (EOFError, OSError):
+            self.kill()
+            raise WorkerCrashed(f"Worker process exited unexpectedly (exit code {self.process.exitcode})")
+        except asyncio.CancelledError:
+            # The caller gave up; the task may still be running, so discard the worker
+            self.kill()
+            raise
+
+        self.jobs += 1
+        self.rss_mb = rss
+
+        if status == "ok":
+            return payload
+        if status == "cpu_timeout":
+            raise WorkerTimeout(payload, "CPU time")
+        raise TaskError(*payload)
+
+    def stop(self):
+        """Asks an idle worker to exit."""
+        try:
+            self._conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.kill()
+        self._conn.close()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+        self._conn.close()
+
+
+class WorkerPool:
+    """
+    Small pool of pre-started worker processes.
+
+    Args:
+        size: Maximum number of tasks running at the same time
+        max_tasks_per_worker: Replace a worker after it has run this many tasks
+        max_rss_mb: Replace a worker when its resident memory exceeds this (MB)
+        memory_limit_mb: Address-space limit for each worker (MB), enforced with RLIMIT_AS
+        initializer: Function run once in each new worker (e.g. warm up imports)
+        preload: Module names imported once in the fork server and shared by all workers
+            (only pools created before the first worker starts are preloaded)
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_tasks_per_worker: int = 100,
+        max_rss_mb: float = None,
+        memory_limit_mb: float = None,
+        initializer=None,
+        preload=(),
+    ):
+        methods = multiprocessing.get_all_start_methods()
+        self._ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        if preload and "forkserver" in methods:
+            missing = set(preload) - _preload_modules
+            if missing and _forkserver_started:
+                logger.warning(
+                    "Worker pool created after the fork server started: %s will be imported "
+                    "by each worker instead of preloaded", ", ".join(sorted(missing))
+                )
+            _preload_modules.update(preload)
+            self._ctx.set_forkserver_preload(sorted(_preload_modules))
+
+        self.size = size
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.max_rss_mb = max_rss_mb
+        self.memory_limit_mb = memory_limit_mb
+        self.initializer = initializer
+
+        self._idle = []
+        self._slots = asyncio.Semaphore(size)
+        self._started = False
+
+    def _spawn(self) -> Worker:
+        global _forkserver_started
+        _forkserver_started = _forkserver_started or self._ctx.get_start_method() == "forkserver"
+        return Worker(self._ctx, self.memory_limit_mb, self.initializer)
+
+    def start(self):
+        """Pre-starts all workers so the first tasks don't pay process startup."""
+        if not self._started:
+            self._started = True
+            self._idle.extend(self._spawn() for _ in range(self.size - len(self._idle)))
+
+    def _needs_recycle(self, worker: Worker) -> bool:
+        if not worker.alive:
+            return True
+        if self.max_tasks_per_worker and worker.jobs >= self.max_tasks_per_worker:
+            return True
+        return bool(self.max_rss_mb and worker.rss_mb > self.max_rss_mb)
+
+    def checkout(self) -> Worker:
+        """
+        Removes a worker from the pool for exclusive use (e.g. a stateful session).
+
+        The pool starts a replacement if it is below `size`; the caller must stop()
+        or kill() the worker.
+        """
+        self.start()
+        worker = self._idle.pop() if self._idle else self._spawn()
+        if len(self._idle) < self.size:
+            self._idle.append(self._spawn())
+        return worker
+
+    async def submit(self, func, *args, timeout=None, cpu_time=None, **kwargs):
+        """
+        Runs func(*args, **kwargs) on an idle worker and returns its result.
+
+        Args:
+            timeout: Wall-clock seconds before the worker is killed (None = no limit)
+            cpu_time: CPU seconds the task may use (None = no limit)
+
+        Raises:
+            WorkerTimeout, WorkerCrashed, TaskError: See Worker.run
+        """
+        self.start()
+        async with self._slots:
+            worker = self._idle.pop() if self._idle else self._spawn()
+            try:
+                return await worker.run(func, *args, timeout=timeout, cpu_time=cpu_time, **kwargs)
+            finally:
+                if self._needs_recycle(worker):
+                    if worker.alive:
+                        worker.stop()
+                    # Start the replacement now so the next task finds a warm worker
+                    if len(self._idle) < self.size:
+                        self._idle.append(self._spawn())
+                elif len(self._idle) >= self.size:
+                    # checkout() replaced this worker while it was busy
+                    worker.stop()
+                else:
+                    self._idle.append(worker)
+
+    def shutdown(self):
+        """Stops all idle workers (busy workers exit with the parent process)."""
+        while self._idle:
+            self._idle.pop().stop()
+        self._started = False